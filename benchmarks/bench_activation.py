@@ -0,0 +1,40 @@
+"""Sigmoid forward/backward: composed neg/exp/add/div graph versus the fused op."""
+import time
+import tracemalloc
+
+import numpy as np
+
+import minitorch.autograd.functional as F
+from minitorch import Tensor
+
+
+def composed_sigmoid(input):
+    return 1 / (1 + F.exp(-input))
+
+
+def measure(sigmoid, size, repeat=5):
+    grad = Tensor(np.ones(size))
+    best = float("inf")
+    for _ in range(repeat):
+        x = Tensor(np.random.randn(size), requires_grad=True)
+        start = time.perf_counter()
+        sigmoid(x).backward(grad)
+        best = min(best, time.perf_counter() - start)
+    x = Tensor(np.random.randn(size), requires_grad=True)
+    tracemalloc.start()
+    output = sigmoid(x)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del output
+    return best, peak
+
+
+def main():
+    for size in (10 ** 3, 10 ** 5, 10 ** 7):
+        for name, sigmoid in (("composed", composed_sigmoid), ("fused", F.sigmoid)):
+            seconds, peak = measure(sigmoid, size)
+            print(f"size {size:9d} {name:8s}: {seconds * 1e3:8.2f} ms, forward peak {peak / 2 ** 20:7.1f} MiB")
+
+
+if __name__ == '__main__':
+    main()
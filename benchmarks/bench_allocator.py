@@ -0,0 +1,72 @@
+"""Allocator churn of a training step on a large batch.
+
+Times the forward, backward and SGD step of an MLP and counts the minor page
+faults per step, with and without the caching allocator.
+
+    python benchmarks/bench_allocator.py [batch] [width] [depth] [steps]
+"""
+import resource
+import sys
+import time
+
+import numpy as np
+
+from minitorch import Tensor
+from minitorch.autograd import allocator
+import minitorch.nn as nn
+import minitorch.optim as optim
+
+
+def make_model(width, depth):
+    np.random.seed(0)
+    layers = []
+    for _ in range(depth):
+        linear = nn.Linear(width, width)
+        linear.weight.data *= 0.5
+        layers += [linear, nn.Tanh()]
+    return nn.Sequential(*layers)
+
+
+def run(batch, width, depth, steps):
+    model = make_model(width, depth)
+    optimizer = optim.SGD(model.parameters(), lr=1e-3)
+    mse_loss = nn.MSELoss()
+    x = Tensor(np.random.randn(batch, width).astype(np.float32))
+    y = Tensor(np.random.randn(batch, width).astype(np.float32))
+    for p in model.parameters():
+        p.data = p.data.astype(np.float32)
+
+    def step():
+        optimizer.zero_grad()
+        loss = mse_loss(model(x), y)
+        loss.backward()
+        optimizer.step()
+        return float(loss.data)
+
+    step()
+    faults = resource.getrusage(resource.RUSAGE_SELF).ru_minflt
+    start = time.perf_counter()
+    for _ in range(steps):
+        loss = step()
+    elapsed = (time.perf_counter() - start) / steps
+    faults = (resource.getrusage(resource.RUSAGE_SELF).ru_minflt - faults) / steps
+    return elapsed, faults, loss
+
+
+def main():
+    batch = int(sys.argv[1]) if len(sys.argv) > 1 else 4096
+    width = int(sys.argv[2]) if len(sys.argv) > 2 else 512
+    depth = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+    steps = int(sys.argv[4]) if len(sys.argv) > 4 else 20
+    print(f"batch {batch}, width {width}, depth {depth}, float32")
+    elapsed, faults, loss = run(batch, width, depth, steps)
+    print(f"numpy allocations: {elapsed * 1e3:8.2f} ms/step, {faults:8.0f} page faults/step, loss {loss:.6f}")
+    allocator.enable_caching_allocator()
+    elapsed, faults, loss = run(batch, width, depth, steps)
+    print(f"caching allocator: {elapsed * 1e3:8.2f} ms/step, {faults:8.0f} page faults/step, loss {loss:.6f}")
+    print(allocator.caching_allocator_info())
+    allocator.disable_caching_allocator()
+
+
+if __name__ == '__main__':
+    main()
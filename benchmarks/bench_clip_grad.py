@@ -0,0 +1,56 @@
+"""Per-step cost of clip_grad_norm_ on models with many small layers.
+
+Compares a naive per-gradient loop with clip_grad_norm_, with per-parameter
+gradients and with Module.flatten_parameters().
+
+    python benchmarks/bench_clip_grad.py [layers] [width] [steps]
+"""
+import sys
+import time
+
+import numpy as np
+
+from minitorch import Tensor
+import minitorch.nn as nn
+
+
+def naive_clip_grad_norm_(parameters, max_norm):
+    grads = [p.grad for p in parameters if p.grad is not None]
+    total_norm = float(np.sqrt(sum(np.sum(g.data ** 2) for g in grads)))
+    clip_coef = max_norm / (total_norm + 1e-6)
+    if clip_coef < 1:
+        for g in grads:
+            g.data = g.data * clip_coef
+    return total_norm
+
+
+def measure(clip, layers, width, steps, flatten):
+    np.random.seed(0)
+    model = nn.Sequential(*[nn.Linear(width, width) for _ in range(layers)])
+    if flatten:
+        model.flatten_parameters()
+    for p in model.parameters():
+        if p.grad is None:
+            p.grad = Tensor(np.random.randn(*p.shape))
+        else:
+            p.grad.data[...] = np.random.randn(*p.shape)
+    params = list(model.parameters())
+    start = time.perf_counter()
+    for _ in range(steps):
+        clip(params, 1e9)
+    return (time.perf_counter() - start) / steps
+
+
+def main():
+    layers = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    width = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    steps = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+    print(f"{layers} x Linear({width}, {width}), {2 * layers} parameters")
+    for flatten in (False, True):
+        naive = measure(naive_clip_grad_norm_, layers, width, steps, flatten)
+        clip = measure(nn.utils.clip_grad_norm_, layers, width, steps, flatten)
+        print(f"flatten={flatten!s:5}: naive {naive * 1e3:7.3f} ms, clip_grad_norm_ {clip * 1e3:7.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
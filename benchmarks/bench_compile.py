@@ -0,0 +1,72 @@
+"""Step time of the examples/train.py model, eager and with minitorch.compile.
+
+Times forward + backward alone and the full training step (zero_grad,
+forward, backward, SGD step).
+
+    python benchmarks/bench_compile.py [batch] [steps]
+"""
+import sys
+import time
+
+import numpy as np
+
+import minitorch
+from minitorch import Tensor
+import minitorch.nn as nn
+import minitorch.optim as optim
+
+
+class Model(nn.Module):
+
+    def __init__(self, in_features=3):
+        super().__init__()
+        self.linear1 = nn.Linear(in_features, 5, bias=True)
+        self.relu1 = nn.ReLU()
+        self.linear2 = nn.Linear(5, 1, bias=True)
+
+    def forward(self, input):
+        return self.linear2(self.relu1(self.linear1(input)))
+
+
+def measure(compiled, batch, steps):
+    np.random.seed(0)
+    model = Model()
+    optimizer = optim.SGD(model.parameters(), lr=0.1)
+    mse_loss = nn.MSELoss()
+
+    def loss_fn(input, target):
+        return mse_loss(model(input), target)
+
+    if compiled:
+        loss_fn = minitorch.compile(loss_fn)
+    x = Tensor(np.random.rand(batch, 3))
+    y = Tensor(np.random.rand(batch, 1))
+    loss_fn(x, y).backward()
+    start = time.perf_counter()
+    for _ in range(steps):
+        loss_fn(x, y).backward()
+    forward_backward = (time.perf_counter() - start) / steps
+    start = time.perf_counter()
+    for _ in range(steps):
+        model.zero_grad()
+        loss = loss_fn(x, y)
+        loss.backward()
+        optimizer.step()
+    return forward_backward, (time.perf_counter() - start) / steps, float(loss.data)
+
+
+def main():
+    batch = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    steps = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    eager = measure(False, batch, steps)
+    compiled = measure(True, batch, steps)
+    print(f"batch {batch}")
+    print(f"forward+backward: eager {eager[0] * 1e6:7.1f} us, compiled {compiled[0] * 1e6:7.1f} us, "
+          f"{eager[0] / compiled[0]:4.1f}x")
+    print(f"training step   : eager {eager[1] * 1e6:7.1f} us, compiled {compiled[1] * 1e6:7.1f} us, "
+          f"{eager[1] / compiled[1]:4.1f}x")
+    print(f"final loss      : eager {eager[2]:.6f}, compiled {compiled[2]:.6f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""Training step time of an MLP in one process and with DataParallel.
+
+Set OMP_NUM_THREADS/OPENBLAS_NUM_THREADS=1 so that the single-process run
+does not get its speedup from multithreaded BLAS instead.
+
+    python benchmarks/bench_data_parallel.py [workers ...]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+from minitorch import Tensor
+import minitorch.nn as nn
+import minitorch.optim as optim
+from minitorch.parallel import DataParallel
+
+WIDTH, DEPTH, BATCH, STEPS = 512, 4, 1024, 10
+
+
+def make_model():
+    np.random.seed(0)
+    layers = []
+    for _ in range(DEPTH):
+        layers += [nn.Linear(WIDTH, WIDTH), nn.ReLU()]
+    layers.append(nn.Linear(WIDTH, 1))
+    model = nn.Sequential(*layers)
+    for p in model.parameters():
+        p.data *= 0.5 * WIDTH ** -0.5
+    return model
+
+
+def measure(train_step, optimizer, x, y):
+    train_step(x, y)
+    optimizer.step()
+    start = time.perf_counter()
+    for _ in range(STEPS):
+        optimizer.zero_grad()
+        train_step(x, y)
+        optimizer.step()
+    return (time.perf_counter() - start) / STEPS
+
+
+def main():
+    workers = [int(arg) for arg in sys.argv[1:]] or [1, 2, os.cpu_count()]
+    x = Tensor(np.random.randn(BATCH, WIDTH))
+    y = Tensor(np.random.randn(BATCH, 1))
+    print(f"MLP {DEPTH} x {WIDTH}, batch {BATCH}, {os.cpu_count()} CPUs")
+
+    model = make_model()
+    optimizer = optim.SGD(model.parameters(), lr=1e-4)
+
+    def train_step(x, y):
+        loss = nn.MSELoss()(model(x), y)
+        loss.backward()
+        return loss
+
+    single = measure(train_step, optimizer, x, y)
+    print(f"single process : {single * 1e3:8.2f} ms/step")
+    for num_workers in workers:
+        with DataParallel(make_model(), nn.MSELoss(), num_workers=num_workers) as parallel:
+            optimizer = optim.SGD(parallel.parameters(), lr=1e-4)
+            step = measure(parallel.train_step, optimizer, x, y)
+        print(f"{num_workers:2d} workers     : {step * 1e3:8.2f} ms/step, {single / step:5.2f}x")
+
+
+if __name__ == '__main__':
+    main()
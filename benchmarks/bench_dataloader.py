@@ -0,0 +1,55 @@
+"""Mini-batch training throughput with and without background prefetching.
+
+Runs the same float32 MLP step over a shuffled in-memory dataset, loading
+batches in the main thread or in workers, and with or without the ring of
+reusable batch buffers. The "load only" column times the loader alone.
+
+    python benchmarks/bench_dataloader.py [samples] [features] [batch_size]
+"""
+import sys
+import time
+
+import numpy as np
+
+import minitorch.nn as nn
+import minitorch.optim as optim
+from minitorch.utils.data import DataLoader, TensorDataset
+
+
+def run(loader, model=None):
+    start = time.perf_counter()
+    if model is None:
+        for _ in loader:
+            pass
+        return time.perf_counter() - start
+    optimizer = optim.SGD(model.parameters(), lr=1e-3)
+    mse_loss = nn.MSELoss()
+    for input, target in loader:
+        model.zero_grad()
+        mse_loss(model(input), target).backward()
+        optimizer.step()
+    return time.perf_counter() - start
+
+
+def main():
+    samples = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    features = int(sys.argv[2]) if len(sys.argv) > 2 else 512
+    batch_size = int(sys.argv[3]) if len(sys.argv) > 3 else 256
+    x = np.random.rand(samples, features).astype(np.float32)
+    y = np.random.rand(samples, 1).astype(np.float32)
+    dataset = TensorDataset(x, y)
+    model = nn.Sequential(nn.Linear(features, 512, dtype=np.float32), nn.ReLU(),
+                          nn.Linear(512, 1, dtype=np.float32))
+    print(f"{samples}x{features} float32, batch {batch_size}, one epoch")
+    for num_workers in (0, 2):
+        for reuse_buffers in (False, True):
+            loader = DataLoader(dataset, batch_size=batch_size, shuffle=True,
+                                num_workers=num_workers, reuse_buffers=reuse_buffers)
+            load = run(loader)
+            train = run(loader, model)
+            print(f"num_workers={num_workers} reuse_buffers={reuse_buffers!s:5}: load only {load * 1e3:7.1f} ms, "
+                  f"train {train * 1e3:7.1f} ms, {samples / train:9.0f} samples/s")
+
+
+if __name__ == '__main__':
+    main()
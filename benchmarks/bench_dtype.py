@@ -0,0 +1,59 @@
+"""Training step time of an examples/train.py-style MLP per dtype.
+
+float16 stores parameters and activations in half precision and
+accumulates matmul/sum/mean in float32.
+
+    python benchmarks/bench_dtype.py [batch] [features] [hidden] [steps]
+"""
+import sys
+import time
+
+import numpy as np
+
+from minitorch import Tensor
+import minitorch.nn as nn
+import minitorch.optim as optim
+
+
+def make_model(features, hidden, dtype):
+    model = nn.Sequential(nn.Linear(features, hidden, dtype=dtype), nn.ReLU(),
+                          nn.Linear(hidden, hidden, dtype=dtype), nn.ReLU(),
+                          nn.Linear(hidden, 1, dtype=dtype))
+    # Parameter draws from a unit normal, scale it to keep activations in range
+    for layer in model:
+        if isinstance(layer, nn.Linear):
+            layer.weight.data *= layer.in_features ** -0.5
+    return model
+
+
+def measure(x, y, features, hidden, steps, dtype):
+    np.random.seed(0)
+    model = make_model(features, hidden, dtype)
+    optimizer = optim.SGD(model.parameters(), lr=1e-3)
+    mse_loss = nn.MSELoss()
+    x = Tensor(x.astype(dtype))
+    y = Tensor(y.astype(dtype))
+    start = time.perf_counter()
+    for _ in range(steps):
+        model.zero_grad()
+        loss = mse_loss(model(x), y)
+        loss.backward()
+        optimizer.step()
+    return (time.perf_counter() - start) / steps, float(loss.data)
+
+
+def main():
+    batch = int(sys.argv[1]) if len(sys.argv) > 1 else 1024
+    features = int(sys.argv[2]) if len(sys.argv) > 2 else 256
+    hidden = int(sys.argv[3]) if len(sys.argv) > 3 else 1024
+    steps = int(sys.argv[4]) if len(sys.argv) > 4 else 10
+    x = np.random.rand(batch, features)
+    y = x @ np.random.rand(features, 1) / features + 1
+    print(f"MLP {features}-{hidden}-{hidden}-1, batch {batch}")
+    for dtype in (np.float64, np.float32, np.float16):
+        seconds, loss = measure(x, y, features, hidden, steps, dtype)
+        print(f"{np.dtype(dtype).name:8s}: {seconds * 1e3:8.2f} ms/step, final loss {loss:.4g}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""Attention-style batched contraction, forward and backward.
+
+Compares one batched einsum / matmul against a Python loop over the batch
+of 2-D matmuls.
+
+    python benchmarks/bench_einsum.py [batch] [seq] [dim]
+"""
+import sys
+import time
+
+import numpy as np
+
+import minitorch
+from minitorch import Tensor
+
+
+def looped(q, k):
+    return [q_i @ k_i.t() for q_i, k_i in zip(q, k)]
+
+
+def measure(fn, repeat=5):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    batch = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    seq = int(sys.argv[2]) if len(sys.argv) > 2 else 128
+    dim = int(sys.argv[3]) if len(sys.argv) > 3 else 64
+    q_data = np.random.randn(batch, seq, dim)
+    k_data = np.random.randn(batch, seq, dim)
+
+    def einsum():
+        q = Tensor(q_data, requires_grad=True)
+        k = Tensor(k_data, requires_grad=True)
+        minitorch.einsum('bqd,bkd->bqk', q, k).sum().backward()
+
+    def matmul():
+        q = Tensor(q_data, requires_grad=True)
+        k = Tensor(np.swapaxes(k_data, 1, 2), requires_grad=True)
+        (q @ k).sum().backward()
+
+    def loop():
+        qs = [Tensor(q_i, requires_grad=True) for q_i in q_data]
+        ks = [Tensor(k_i, requires_grad=True) for k_i in k_data]
+        for scores in looped(qs, ks):
+            scores.sum().backward()
+
+    print(f"scores of {batch} x ({seq}x{dim} @ {dim}x{seq}), forward+backward")
+    for name, fn in (("einsum", einsum), ("matmul", matmul), ("loop", loop)):
+        print(f"{name:7s}: {measure(fn) * 1e3:8.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
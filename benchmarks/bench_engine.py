@@ -0,0 +1,55 @@
+"""Backward time of graphs with heavy fan-in/fan-out.
+
+Each residual block `x = x + x * w` fans its input out to two consumers, so a
+graph of depth d has 2 ** d paths from the loss to the input. The backward
+time of a visited-once engine grows linearly with d.
+"""
+import time
+
+import numpy as np
+
+from minitorch import Tensor
+from minitorch.autograd.engine import Engine
+
+
+def residual_graph(depth, width):
+    x = Tensor(np.random.randn(width), requires_grad=True)
+    w = Tensor(np.random.randn(width) * 0.01, requires_grad=True)
+    out = x
+    for _ in range(depth):
+        out = out + out * w
+    return out.sum()
+
+
+def fan_graph(branches, width):
+    x = Tensor(np.random.randn(width), requires_grad=True)
+    out = x * x
+    for _ in range(branches):
+        out = out + x.exp()
+    return out.sum()
+
+
+def timeit(build, *args, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        loss = build(*args)
+        start = time.perf_counter()
+        Engine().execute(loss, Tensor(1.0))
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    print("residual blocks (2 ** depth paths)")
+    for depth in (25, 50, 100, 200, 400):
+        seconds = timeit(residual_graph, depth, 1024)
+        print(f"  depth {depth:4d}: {seconds * 1e3:8.2f} ms, {seconds / depth * 1e6:6.1f} us/block")
+
+    print("fan-in/fan-out on a shared input")
+    for branches in (100, 1000, 4000):
+        seconds = timeit(fan_graph, branches, 1024)
+        print(f"  branches {branches:5d}: {seconds * 1e3:8.2f} ms, {seconds / branches * 1e6:6.1f} us/branch")
+
+
+if __name__ == '__main__':
+    main()
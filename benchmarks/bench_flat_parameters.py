@@ -0,0 +1,52 @@
+"""Optimizer overhead of models with many small layers.
+
+Times zero_grad + SGD.step, and a full training step, with per-parameter
+arrays and with Module.flatten_parameters().
+
+    python benchmarks/bench_flat_parameters.py [layers] [width] [steps]
+"""
+import sys
+import time
+
+import numpy as np
+
+from minitorch import Tensor
+import minitorch.nn as nn
+import minitorch.optim as optim
+
+
+def measure(layers, width, steps, flatten):
+    np.random.seed(0)
+    model = nn.Sequential(*[nn.Linear(width, width) for _ in range(layers)])
+    for layer in model:
+        layer.weight.data *= 0.5 * width ** -0.5
+        layer.bias.data[...] = 0
+    if flatten:
+        model.flatten_parameters()
+    optimizer = optim.SGD(model.parameters(), lr=1e-6)
+    x = Tensor(np.random.randn(4, width))
+    model(x).sum().backward()
+    update = 0.0
+    start = time.perf_counter()
+    for _ in range(steps):
+        model.zero_grad()
+        model(x).sum().backward()
+        begin = time.perf_counter()
+        optimizer.step()
+        model.zero_grad()
+        update += time.perf_counter() - begin
+    return update / steps, (time.perf_counter() - start) / steps
+
+
+def main():
+    layers = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    width = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    steps = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+    print(f"{layers} x Linear({width}, {width}), {2 * layers} parameters")
+    for flatten in (False, True):
+        update, step = measure(layers, width, steps, flatten)
+        print(f"flatten={flatten!s:5}: step+zero_grad {update * 1e3:7.3f} ms, training step {step * 1e3:7.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""Optimizer step time against parameter count, per parameter and foreach.
+
+Models are stacks of small Linear layers whose gradients are filled once;
+only optimizer.step is timed.
+
+    python benchmarks/bench_foreach.py [width] [steps]
+"""
+import sys
+import time
+
+import numpy as np
+
+from minitorch import Tensor
+import minitorch.nn as nn
+import minitorch.optim as optim
+
+
+def measure(cls, kwargs, layers, width, steps, foreach):
+    np.random.seed(0)
+    model = nn.Sequential(*[nn.Linear(width, width) for _ in range(layers)])
+    for p in model.parameters():
+        p.data *= 1e-3
+        p.grad = Tensor(np.random.randn(*p.shape))
+    optimizer = cls(model.parameters(), foreach=foreach, **kwargs)
+    optimizer.step()
+    start = time.perf_counter()
+    for _ in range(steps):
+        optimizer.step()
+    return (time.perf_counter() - start) / steps
+
+
+def main():
+    width = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    steps = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    configs = [
+        ('SGD', optim.SGD, dict(lr=1e-3)),
+        ('SGD momentum', optim.SGD, dict(lr=1e-3, momentum=0.9)),
+        ('Adam', optim.Adam, dict(lr=1e-3)),
+    ]
+    for layers in (10, 100, 1000):
+        print(f"{layers} x Linear({width}, {width}), {2 * layers} parameters")
+        for name, cls, kwargs in configs:
+            loop = measure(cls, kwargs, layers, width, steps, False)
+            foreach = measure(cls, kwargs, layers, width, steps, True)
+            print(f"  {name:13}: per parameter {loop * 1e3:8.3f} ms, foreach {foreach * 1e3:7.3f} ms, "
+                  f"{loop / foreach:5.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""Sigmoid + MSELoss forward/backward, eager versus fused lazy expressions.
+
+Reports wall-clock time, peak traced memory and the number of backward nodes.
+Pass --no-numexpr to measure the NumPy out= fallback.
+"""
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+import minitorch
+from minitorch import Tensor
+from minitorch.autograd import lazy
+from minitorch.autograd.engine import collect_graph
+import minitorch.nn as nn
+
+
+def step(x, target):
+    output = nn.Sigmoid()(x)
+    loss = nn.MSELoss()(output, target)
+    loss.backward()
+    return loss
+
+
+def measure(context, size, repeat=5):
+    target = Tensor(np.random.rand(size))
+    best = float("inf")
+    for _ in range(repeat):
+        x = Tensor(np.random.randn(size), requires_grad=True)
+        with context():
+            start = time.perf_counter()
+            loss = step(x, target)
+            best = min(best, time.perf_counter() - start)
+    nodes = len(collect_graph(loss.grad_fn)[0])
+    x = Tensor(np.random.randn(size), requires_grad=True)
+    tracemalloc.start()
+    with context():
+        step(x, target)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, nodes
+
+
+def main():
+    if "--no-numexpr" in sys.argv:
+        lazy.numexpr = None
+    print(f"numexpr: {'yes' if lazy.numexpr is not None else 'no'}")
+    for size in (10 ** 4, 10 ** 6, 10 ** 7):
+        for name, context in (("eager", minitorch.enable_grad), ("lazy", minitorch.lazy_mode)):
+            seconds, peak, nodes = measure(context, size)
+            print(f"size {size:9d} {name:5s}: {seconds * 1e3:8.2f} ms, peak {peak / 2 ** 20:8.1f} MiB, "
+                  f"{nodes:2d} nodes")
+
+
+if __name__ == '__main__':
+    main()
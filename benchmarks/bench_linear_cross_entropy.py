@@ -0,0 +1,54 @@
+"""Output layer plus loss for a large vocabulary.
+
+Compares LinearCrossEntropy, which never materializes the (rows, vocab)
+logits, with Linear followed by CrossEntropyLoss. Peak memory excludes the
+parameters, the input and their gradients.
+
+    python benchmarks/bench_linear_cross_entropy.py [rows] [features] [vocab] [chunk_size]
+"""
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from minitorch import Tensor
+import minitorch.nn as nn
+
+
+def measure(forward, input, target, parameters):
+    tracemalloc.start()
+    start = time.perf_counter()
+    forward(input, target).backward()
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    grads = sum(p.grad.data.nbytes for p in parameters) + input.grad.data.nbytes
+    return seconds, peak - grads
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 512
+    features = int(sys.argv[2]) if len(sys.argv) > 2 else 256
+    vocab = int(sys.argv[3]) if len(sys.argv) > 3 else 32000
+    chunk_size = int(sys.argv[4]) if len(sys.argv) > 4 else 4096
+    x = np.random.randn(rows, features).astype(np.float32)
+    target = np.random.randint(0, vocab, size=rows)
+    fused = nn.LinearCrossEntropy(features, vocab, chunk_size=chunk_size)
+    fused.weight.data = fused.weight.data.astype(np.float32) * 0.05
+    fused.bias.data = fused.bias.data.astype(np.float32)
+    linear = nn.Linear(features, vocab)
+    linear.weight.data = fused.weight.data
+    linear.bias.data = fused.bias.data
+    loss = nn.CrossEntropyLoss()
+    print(f"input {rows}x{features}, vocab {vocab}, float32 logits would take "
+          f"{rows * vocab * 4 / 2 ** 20:.0f} MiB")
+    cases = (("fused", fused, list(fused.parameters())),
+             ("composed", lambda input, target: loss(linear(input), target), list(linear.parameters())))
+    for name, forward, parameters in cases:
+        seconds, peak = measure(forward, Tensor(x, requires_grad=True), target, parameters)
+        print(f"{name:8s}: {seconds * 1e3:8.1f} ms forward+backward, extra peak {peak / 2 ** 20:7.1f} MiB")
+
+
+if __name__ == '__main__':
+    main()
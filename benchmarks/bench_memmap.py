@@ -0,0 +1,71 @@
+"""Read throughput of a MemmapDataset on a multi-GB file.
+
+Writes a float32 dataset of the given size, then reads batches in
+sequential, block-shuffled and fully shuffled order through a DataLoader.
+The page cache of the files is dropped before every pattern with
+posix_fadvise, where available, so the reads hit the disk.
+
+    python benchmarks/bench_memmap.py [path] [gib] [features] [batch_size] [block_size] [batches]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from minitorch.utils.data import (BlockShuffleSampler, DataLoader, MemmapDataset, RandomSampler,
+                                  SequentialSampler)
+
+
+def drop_cache(dataset):
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    for name in dataset.names:
+        fd = os.open(os.path.join(dataset.path, f'{name}.bin'), os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else None
+    gib = float(sys.argv[2]) if len(sys.argv) > 2 else 2.0
+    features = int(sys.argv[3]) if len(sys.argv) > 3 else 512
+    batch_size = int(sys.argv[4]) if len(sys.argv) > 4 else 256
+    block_size = int(sys.argv[5]) if len(sys.argv) > 5 else 4096
+    batches = int(sys.argv[6]) if len(sys.argv) > 6 else 1000
+    with tempfile.TemporaryDirectory(dir=path) as directory:
+        samples = int(gib * 2 ** 30) // (features * 4)
+        start = time.perf_counter()
+        dataset = MemmapDataset.create(directory, samples, x=((features,), np.float32), y=((), np.int64))
+        x, y = dataset.arrays
+        chunk = 1 << 16
+        for i in range(0, samples, chunk):
+            x[i:i + chunk] = np.random.rand(min(chunk, samples - i), features)
+            y[i:i + chunk] = np.arange(i, min(i + chunk, samples))
+        dataset.flush()
+        del dataset, x, y
+        print(f"wrote {samples}x{features} float32 ({gib:.1f} GiB) in {time.perf_counter() - start:.1f} s")
+
+        dataset = MemmapDataset(directory)
+        samplers = (("sequential", SequentialSampler(dataset)),
+                    (f"block-shuffled ({block_size})", BlockShuffleSampler(dataset, block_size)),
+                    ("shuffled", RandomSampler(dataset)))
+        for name, sampler in samplers:
+            drop_cache(dataset)
+            loader = DataLoader(dataset, batch_size=batch_size, sampler=sampler, reuse_buffers=True)
+            start = time.perf_counter()
+            read = 0
+            for step, (batch, _) in enumerate(loader):
+                read += batch.data.nbytes
+                if step + 1 == batches:
+                    break
+            seconds = time.perf_counter() - start
+            print(f"{name:22s}: {read / seconds / 2 ** 20:8.1f} MiB/s, {read / batch_size / seconds:9.0f} samples/s")
+        del dataset, loader
+
+
+if __name__ == '__main__':
+    main()
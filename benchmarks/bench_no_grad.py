@@ -0,0 +1,60 @@
+"""Forward latency and memory of a Linear/ReLU stack with and without autograd.
+
+Peak memory is measured with tracemalloc, which NumPy reports its buffers to,
+and covers everything alive while the output is held, including what the
+graph keeps for backward.
+"""
+import time
+import tracemalloc
+
+import minitorch
+import minitorch.nn as nn
+
+
+class MLP(nn.Module):
+
+    def __init__(self, depth, width):
+        super().__init__()
+        self.depth = depth
+        for i in range(depth):
+            setattr(self, f"linear{i}", nn.Linear(width, width))
+        self.relu = nn.ReLU()
+
+    def forward(self, input):
+        output = input
+        for i in range(self.depth):
+            output = self.relu(getattr(self, f"linear{i}")(output))
+        return output
+
+
+def measure(model, input, context, repeat=10):
+    best = float("inf")
+    for _ in range(repeat):
+        with context():
+            start = time.perf_counter()
+            output = model(input)
+            best = min(best, time.perf_counter() - start)
+        del output
+    tracemalloc.start()
+    with context():
+        output = model(input)
+        _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def main():
+    model = MLP(depth=16, width=512)
+    input = minitorch.rand(256, 512)
+    modes = [
+        ("grad", minitorch.enable_grad),
+        ("no_grad", minitorch.no_grad),
+        ("inference_mode", minitorch.inference_mode),
+    ]
+    for name, context in modes:
+        seconds, peak = measure(model, input, context)
+        print(f"{name:15s}: {seconds * 1e3:7.2f} ms, peak {peak / 2 ** 20:7.1f} MiB")
+
+
+if __name__ == '__main__':
+    main()
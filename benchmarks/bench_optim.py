@@ -0,0 +1,64 @@
+"""Cost of an optimizer step: time and heap allocations per step.
+
+Compares the in-place SGD/Adam/AdamW updates with a reference written with
+ordinary NumPy expressions, which allocate a temporary per operation.
+
+    python benchmarks/bench_optim.py [numel] [steps]
+"""
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from minitorch import Tensor
+import minitorch.optim as optim
+
+
+def naive_adam(param, grad, state, lr=1e-3, betas=(0.9, 0.999), eps=1e-8):
+    state['step'] = state.get('step', 0) + 1
+    state['m'] = betas[0] * state.get('m', 0) + (1 - betas[0]) * grad
+    state['v'] = betas[1] * state.get('v', 0) + (1 - betas[1]) * grad * grad
+    m_hat = state['m'] / (1 - betas[0] ** state['step'])
+    v_hat = state['v'] / (1 - betas[1] ** state['step'])
+    param -= lr * m_hat / (np.sqrt(v_hat) + eps)
+
+
+def measure(step, steps):
+    step()
+    tracemalloc.start()
+    start = time.perf_counter()
+    for _ in range(steps):
+        step()
+    elapsed = (time.perf_counter() - start) / steps
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    numel = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    steps = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    np.random.seed(0)
+    print(f"{numel} parameters, {numel * 8 / 2 ** 20:.1f} MiB")
+    param = np.random.randn(numel)
+    grad = np.random.randn(numel)
+    state = {}
+    elapsed, peak = measure(lambda: naive_adam(param, grad, state), steps)
+    print(f"{'naive Adam':28}: {elapsed * 1e3:7.2f} ms/step, peak {peak / 2 ** 20:7.2f} MiB")
+    configs = [
+        ('SGD', optim.SGD, dict(lr=1e-3)),
+        ('SGD nesterov + decay', optim.SGD, dict(lr=1e-3, momentum=0.9, nesterov=True, weight_decay=1e-4)),
+        ('Adam', optim.Adam, dict()),
+        ('AdamW amsgrad', optim.AdamW, dict(amsgrad=True)),
+    ]
+    for name, cls, kwargs in configs:
+        p = Tensor(np.random.randn(numel), requires_grad=True)
+        p.grad = Tensor(grad)
+        optimizer = cls([p], **kwargs)
+        elapsed, peak = measure(optimizer.step, steps)
+        print(f"{name:28}: {elapsed * 1e3:7.2f} ms/step, peak {peak / 2 ** 20:7.2f} MiB")
+
+
+if __name__ == '__main__':
+    main()
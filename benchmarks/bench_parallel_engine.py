@@ -0,0 +1,50 @@
+"""Backward wall-clock of a multi-branch model, serial and threaded engine.
+
+Each of the parallel heads is a large matmul, during which NumPy releases
+the GIL. Pin BLAS to one thread (OMP_NUM_THREADS=1) so the speedup comes
+from running the branches concurrently, not from a threaded BLAS.
+
+    python benchmarks/bench_parallel_engine.py [heads] [width] [steps]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+from minitorch import Tensor
+from minitorch.autograd.engine import Engine
+
+
+def measure(num_threads, heads, width, steps):
+    np.random.seed(0)
+    x = Tensor(np.random.randn(width, width) / width, requires_grad=True)
+    weights = [Tensor(np.random.randn(width, width) / width, requires_grad=True) for _ in range(heads)]
+    engine = Engine(num_threads=num_threads)
+    elapsed = 0.0
+    for _ in range(steps):
+        out = None
+        for w in weights:
+            head = (x @ w).relu() @ w
+            out = head if out is None else out + head
+        loss = out.sum()
+        start = time.perf_counter()
+        engine.execute(loss, Tensor(1.0))
+        elapsed += time.perf_counter() - start
+    return elapsed / steps
+
+
+def main():
+    heads = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    width = int(sys.argv[2]) if len(sys.argv) > 2 else 1024
+    steps = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+    print(f"{heads} heads of {width} x {width} matmuls, {os.cpu_count()} CPUs")
+    serial = measure(1, heads, width, steps)
+    print(f"serial    : {serial * 1e3:8.2f} ms")
+    for num_threads in (2, 4):
+        threaded = measure(num_threads, heads, width, steps)
+        print(f"{num_threads} threads : {threaded * 1e3:8.2f} ms, {serial / threaded:5.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Cost of the backward of reductions and broadcasts on a large activation.
+
+Reports the time and the peak of traced allocations per iteration for the
+gradient of a full mean, an MSE loss, and a bias broadcast over a batch.
+
+    python benchmarks/bench_reduction.py [rows] [cols] [steps]
+"""
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from minitorch import Tensor
+import minitorch.nn as nn
+
+
+def measure(fn, steps):
+    fn()
+    tracemalloc.start()
+    start = time.perf_counter()
+    for _ in range(steps):
+        fn()
+    elapsed = (time.perf_counter() - start) / steps
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 4096
+    cols = int(sys.argv[2]) if len(sys.argv) > 2 else 1024
+    steps = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+    x = Tensor(np.random.randn(rows, cols).astype(np.float32), requires_grad=True)
+    y = Tensor(np.random.randn(rows, cols).astype(np.float32))
+    bias = Tensor(np.random.randn(cols).astype(np.float32), requires_grad=True)
+    mse_loss = nn.MSELoss()
+
+    def mean_backward():
+        x.mean().grad_fn(Tensor(np.ones((), dtype=np.float32)))
+
+    def mse():
+        x.grad = None
+        mse_loss(x, y).backward()
+
+    def bias_add():
+        bias.grad = None
+        (x + bias).sum().backward()
+
+    print(f"float32 activation of shape ({rows}, {cols}), {x.data.nbytes / 2 ** 20:.1f} MiB")
+    for name, fn in [('mean, backward node', mean_backward), ('mse loss, fwd+bwd', mse),
+                     ('bias add + sum, fwd+bwd', bias_add)]:
+        elapsed, peak = measure(fn, steps)
+        print(f"{name:24s} {elapsed * 1e3:8.2f} ms, peak {peak / 2 ** 20:7.1f} MiB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Memory pinned by logged loss tensors, with and without retain_graph.
+
+A training loop keeps every loss tensor for logging. When the graph is
+retained, each of them pins the activations of its step.
+"""
+import tracemalloc
+
+import minitorch
+import minitorch.nn as nn
+import minitorch.optim as optim
+from minitorch.autograd.memory import saved_tensors_report
+
+
+class MLP(nn.Module):
+
+    def __init__(self, width):
+        super().__init__()
+        self.linear1 = nn.Linear(width, width)
+        self.linear2 = nn.Linear(width, width)
+        self.linear3 = nn.Linear(width, 1)
+        self.relu = nn.ReLU()
+
+    def forward(self, input):
+        output = self.relu(self.linear1(input))
+        output = self.relu(self.linear2(output))
+        return self.linear3(output)
+
+
+def train(retain_graph, steps=5, batch_size=512, width=1024):
+    model = MLP(width)
+    optimizer = optim.SGD(model.parameters(), lr=1e-9)
+    mse_loss = nn.MSELoss()
+    x = minitorch.rand(batch_size, width)
+    y = minitorch.rand(batch_size, 1)
+    losses = []
+    tracemalloc.start()
+    for _ in range(steps):
+        model.zero_grad()
+        loss = mse_loss(model(x), y)
+        loss.backward(retain_graph=retain_graph)
+        optimizer.step()
+        losses.append(loss)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, peak, saved_tensors_report(losses[-1])
+
+
+def main():
+    for retain_graph in (True, False):
+        current, peak, report = train(retain_graph)
+        held = sum(report.values())
+        print(f"retain_graph={retain_graph!s:5s}: held after 5 steps {current / 2 ** 20:7.1f} MiB, "
+              f"peak {peak / 2 ** 20:7.1f} MiB, saved by last loss {held / 2 ** 20:6.1f} MiB")
+        for name, nbytes in report.items():
+            if nbytes:
+                print(f"    {name:16s} {nbytes / 2 ** 20:6.1f} MiB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""Checkpoint save/load time of a large model.
+
+Compares minitorch.save/load (eager and memory-mapped) with pickling the
+state dict arrays, both synced to disk, and measures how long an asynchronous save stalls the
+caller. The page cache is dropped before the loads where posix_fadvise is
+available.
+
+    python benchmarks/bench_serialization.py [layers] [width] [path]
+"""
+import os
+import pickle
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+import minitorch
+import minitorch.nn as nn
+
+
+def drop_cache(path):
+    if hasattr(os, 'posix_fadvise'):
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    layers = int(sys.argv[1]) if len(sys.argv) > 1 else 24
+    width = int(sys.argv[2]) if len(sys.argv) > 2 else 2048
+    directory = sys.argv[3] if len(sys.argv) > 3 else None
+    minitorch.set_default_dtype(np.float32)
+    model = nn.Sequential(*[nn.Linear(width, width) for _ in range(layers)])
+    state_dict = model.state_dict()
+    nbytes = sum(t.data.nbytes for t in state_dict.values())
+    print(f"{layers} x Linear({width}, {width}) float32, {nbytes / 2 ** 20:.0f} MiB")
+    with tempfile.TemporaryDirectory(dir=directory) as path:
+        pickle_path = os.path.join(path, 'model.pkl')
+        path = os.path.join(path, 'model.mt')
+        arrays = {name: t.data for name, t in state_dict.items()}
+
+        def pickle_save():
+            with open(pickle_path, 'wb') as f:
+                pickle.dump(arrays, f, protocol=pickle.HIGHEST_PROTOCOL)
+                f.flush()
+                os.fsync(f.fileno())
+
+        seconds, _ = timed(pickle_save)
+        print(f"pickle save      : {seconds * 1e3:8.1f} ms")
+        seconds, _ = timed(lambda: minitorch.save(state_dict, path))
+        print(f"save             : {seconds * 1e3:8.1f} ms")
+        seconds, future = timed(lambda: minitorch.save(state_dict, path, async_save=True))
+        total, _ = timed(future.result)
+        print(f"async save       : {seconds * 1e3:8.1f} ms stall, {(seconds + total) * 1e3:.1f} ms until written")
+
+        drop_cache(pickle_path)
+        seconds, _ = timed(lambda: pickle.load(open(pickle_path, 'rb')))
+        print(f"pickle load      : {seconds * 1e3:8.1f} ms")
+        drop_cache(path)
+        seconds, _ = timed(lambda: model.load_state_dict(minitorch.load(path)))
+        print(f"load             : {seconds * 1e3:8.1f} ms")
+        drop_cache(path)
+        seconds, _ = timed(lambda: model.load_state_dict(minitorch.load(path, mmap=True), assign=True))
+        touch, _ = timed(lambda: [float(p.data.sum()) for p in model.parameters()])
+        print(f"load mmap        : {seconds * 1e3:8.1f} ms, then {touch * 1e3:.1f} ms to read every parameter")
+
+
+if __name__ == '__main__':
+    main()
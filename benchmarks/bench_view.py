@@ -0,0 +1,40 @@
+"""Gradient of a row gather (embedding lookup / batch sampling).
+
+Compares the backward of t[indices], which sums repeated rows with one
+bincount, against scattering the same gradient with np.add.at.
+
+    python benchmarks/bench_view.py [rows] [dim] [lookups]
+"""
+import sys
+import time
+
+import numpy as np
+
+from minitorch import Tensor
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    dim = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+    lookups = int(sys.argv[3]) if len(sys.argv) > 3 else 200000
+    table = Tensor(np.random.randn(rows, dim), requires_grad=True)
+    indices = np.random.randint(0, rows, size=lookups)
+    grad = np.random.randn(lookups, dim)
+
+    start = time.perf_counter()
+    table[indices].backward(Tensor(grad))
+    gather = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = np.zeros((rows, dim))
+    np.add.at(expected, indices, grad)
+    add_at = time.perf_counter() - start
+
+    np.testing.assert_allclose(table.grad.data, expected, atol=1e-9)
+    print(f"{lookups} lookups into {rows}x{dim}")
+    print(f"t[indices] forward+backward: {gather * 1e3:8.1f} ms")
+    print(f"np.add.at scatter alone:     {add_at * 1e3:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,6 +3,7 @@ import numpy as np
 from minitorch import Tensor
 import minitorch.nn as nn
 import minitorch.optim as optim
+from minitorch.utils.data import DataLoader, TensorDataset
 
 
 class Model(nn.Module):
@@ -23,13 +24,15 @@ class Model(nn.Module):
 def train(model, x, y, epoch=30):  # TODO
     optimizer = optim.SGD(model.parameters(), lr=0.1)
     mse_loss = nn.MSELoss()
+    loader = DataLoader(TensorDataset(x, y), batch_size=20, shuffle=True, num_workers=1)
     for i in range(1, epoch + 1):
-        model.zero_grad()
-        output = model(x)
-        loss = mse_loss(output, y)
+        for input, target in loader:
+            model.zero_grad()
+            output = model(input)
+            loss = mse_loss(output, target)
+            loss.backward()
+            optimizer.step()
         print(f"train: epoch {i}, loss {loss}")
-        loss.backward()
-        optimizer.step()
 
 
 def test(model, x, y):
@@ -42,9 +45,9 @@ def test(model, x, y):
 def main():
     coef = Tensor(np.array([1, 3, 2]))
     x_train = Tensor(np.random.rand(100, 3))
-    y_train = x_train @ coef + 5
+    y_train = (x_train @ coef + 5).unsqueeze(-1)
     x_test = Tensor(np.random.rand(20, 3))
-    y_test = x_test @ coef + 5
+    y_test = (x_test @ coef + 5).unsqueeze(-1)
     model = Model()
     train(model, x_train, y_train)
     test(model, x_test, y_test)
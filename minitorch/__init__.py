@@ -1,2 +1,6 @@
-from .tensor import Tensor, rand
+from .tensor import Tensor, rand, set_default_dtype, get_default_dtype
+from .autograd.grad_mode import no_grad, enable_grad, inference_mode, is_grad_enabled, set_grad_enabled
+from .autograd.lazy import lazy_mode
 from .autograd.functional import *
+from .serialization import save, load
+from .autograd.compile import compile
@@ -0,0 +1,220 @@
+"""Caching allocator for the output buffers of ops and backward nodes.
+
+A training loop allocates arrays of the same few sizes every step and frees
+them once the graph is gone. Large arrays come straight from mmap, so each of
+them costs a system call and a page fault per page touched. The allocator
+keeps those blocks instead: ops take their outputs from it, and a block comes
+back as soon as no array views it anymore, which it tells from the reference
+count of the block, since every view of a NumPy array refers to the array
+owning the memory.
+"""
+
+import math
+import sys
+import threading
+from collections import OrderedDict, deque
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+
+def _round_size(nbytes: int) -> int:
+    """Size of the block serving nbytes: multiples of 512 bytes up to 1 MiB,
+    then eighths of a power of two, wasting at most 12.5%."""
+    if nbytes <= 1 << 20:
+        step = 512
+    else:
+        step = 1 << (nbytes.bit_length() - 4)
+    return -(-nbytes // step) * step
+
+
+def _broadcast_shape(*shapes: Tuple[int, ...]) -> Tuple[int, ...]:
+    # np.broadcast_shapes costs more than most ops on small arrays; the ufunc
+    # given the buffer still reports shapes that do not broadcast
+    first = shapes[0]
+    if all(shape == first for shape in shapes):
+        return first
+    result = [1] * max(map(len, shapes))
+    for shape in shapes:
+        for i, size in enumerate(shape, len(result) - len(shape)):
+            if size != 1:
+                result[i] = size
+    return tuple(result)
+
+
+class CachingAllocator:
+    """Size-bucketed pool of memory blocks.
+
+    Blocks handed out are tracked per size. When no cached block of the size
+    is left, the oldest blocks of that size are checked for views still
+    alive, and reused if there are none. The allocator holds at most
+    max_bytes: when a new block would exceed it, every dead block is moved to
+    the cache and the least recently used sizes are evicted. Arrays below
+    min_bytes are cheap to allocate and are left to NumPy.
+    """
+
+    # blocks of a size checked for views when its cache is empty
+    scan = 2
+
+    def __init__(self, max_bytes: int = 1 << 30, min_bytes: int = 1 << 16):
+        if max_bytes <= 0:
+            raise ValueError("max_bytes should be positive, rather than {}".format(max_bytes))
+        self.max_bytes = max_bytes
+        self.min_bytes = min_bytes
+        # free blocks per size, least recently used size first
+        self.cached: Dict[int, list] = OrderedDict()
+        self.lent: Dict[int, deque] = {}
+        self.bytes_cached = 0
+        self.bytes_lent = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # misses left before the next sweep, after a sweep found no dead block
+        self.sweep_backoff = 0
+        self.lock = threading.Lock()
+
+    def empty(self, shape: Tuple[int, ...], dtype: np.dtype) -> np.ndarray:
+        dtype = np.dtype(dtype)
+        nbytes = math.prod(shape) * dtype.itemsize
+        if nbytes < self.min_bytes:
+            return np.empty(shape, dtype=dtype)
+        size = _round_size(nbytes)
+        with self.lock:
+            block = self._take(size)
+        if block is None:
+            return np.empty(shape, dtype=dtype)
+        return block[:nbytes].view(dtype).reshape(shape)
+
+    def _take(self, size: int) -> Optional[np.ndarray]:
+        lent = self.lent.setdefault(size, deque())
+        blocks = self.cached.get(size)
+        if blocks:
+            block = blocks.pop()
+            if blocks:
+                self.cached.move_to_end(size)
+            else:
+                del self.cached[size]
+            self.bytes_cached -= size
+            self.bytes_lent += size
+            self.hits += 1
+        else:
+            block = self._reclaim(lent)
+            if block is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+                if self.bytes_cached + self.bytes_lent + size > self.max_bytes and not self._make_room(size):
+                    # the live blocks fill the pool, this one is not tracked
+                    return None
+                block = np.empty(size, dtype=np.uint8)
+                self.bytes_lent += size
+        lent.append(block)
+        return block
+
+    def _reclaim(self, lent: deque) -> Optional[np.ndarray]:
+        """A block of lent that no array views anymore, if one of the oldest is."""
+        for _ in range(min(self.scan, len(lent))):
+            block = lent.popleft()
+            # the local name and the argument of getrefcount
+            if sys.getrefcount(block) == 2:
+                return block
+            lent.append(block)
+        return None
+
+    def _make_room(self, size: int) -> bool:
+        if self.sweep_backoff > 0:
+            self.sweep_backoff -= 1
+        elif not self._sweep():
+            self.sweep_backoff = sum(map(len, self.lent.values()))
+        while self.cached and self.bytes_cached + self.bytes_lent + size > self.max_bytes:
+            lru, blocks = next(iter(self.cached.items()))
+            self.bytes_cached -= len(blocks.pop())
+            self.evictions += 1
+            if not blocks:
+                del self.cached[lru]
+        return self.bytes_cached + self.bytes_lent + size <= self.max_bytes
+
+    def _sweep(self) -> bool:
+        """Move every block no array views anymore to the cache."""
+        found = False
+        for size, lent in self.lent.items():
+            for _ in range(len(lent)):
+                block = lent.popleft()
+                if sys.getrefcount(block) == 2:
+                    self.cached.setdefault(size, []).append(block)
+                    self.bytes_lent -= size
+                    self.bytes_cached += size
+                    found = True
+                else:
+                    lent.append(block)
+        return found
+
+    def empty_cache(self) -> None:
+        """Free the blocks no array views anymore."""
+        with self.lock:
+            self._sweep()
+            self.cached.clear()
+            self.bytes_cached = 0
+
+    def info(self) -> dict:
+        return dict(hits=self.hits, misses=self.misses, evictions=self.evictions,
+                    bytes_cached=self.bytes_cached, bytes_lent=self.bytes_lent, max_bytes=self.max_bytes)
+
+
+_allocator = None
+
+
+def enable_caching_allocator(max_bytes: int = 1 << 30, min_bytes: int = 1 << 16) -> None:
+    """Draw the outputs of ops and backward nodes from a caching allocator.
+
+    Pays off when the same large shapes are allocated step after step, as in
+    a training loop with a fixed batch size.
+    """
+    global _allocator
+    _allocator = CachingAllocator(max_bytes, min_bytes)
+
+
+def disable_caching_allocator() -> None:
+    global _allocator
+    _allocator = None
+
+
+def caching_allocator_info() -> dict:
+    if _allocator is None:
+        return dict(hits=0, misses=0, evictions=0, bytes_cached=0, bytes_lent=0, max_bytes=0)
+    return _allocator.info()
+
+
+def empty_cache() -> None:
+    if _allocator is not None:
+        _allocator.empty_cache()
+
+
+def empty(shape: Tuple[int, ...], dtype: np.dtype) -> np.ndarray:
+    if _allocator is None:
+        return np.empty(shape, dtype=dtype)
+    return _allocator.empty(shape, dtype)
+
+
+def elementwise_out(*operands) -> Optional[np.ndarray]:
+    """Buffer for the out argument of a ufunc over operands with a floating
+    point result, or None to let NumPy allocate it."""
+    # results broadcast from small operands only are left to NumPy, which
+    # spares the small ops the cost of working out the result
+    if _allocator is None or max(getattr(x, 'nbytes', 0) for x in operands) < _allocator.min_bytes:
+        return None
+    dtype = np.result_type(*operands)
+    if dtype.kind != 'f':
+        return None
+    return _allocator.empty(_broadcast_shape(*map(np.shape, operands)), dtype)
+
+
+def matmul_out(a: np.ndarray, b: np.ndarray) -> Optional[np.ndarray]:
+    """Buffer for the out argument of np.matmul over matrices or stacks of them."""
+    if _allocator is None or a.ndim < 2 or b.ndim < 2:
+        return None
+    dtype = np.result_type(a, b)
+    if dtype.kind != 'f':
+        return None
+    shape = _broadcast_shape(a.shape[:-2], b.shape[:-2]) + (a.shape[-2], b.shape[-1])
+    return _allocator.empty(shape, dtype)
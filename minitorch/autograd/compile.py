@@ -0,0 +1,699 @@
+"""Capture and replay of fixed-shape computations.
+
+``compile(fn)`` runs fn eagerly the first time it sees a combination of
+argument shapes, recording every op of ``functional`` it calls. The record
+is turned into a flat list of NumPy calls writing into buffers allocated
+once, plus the matching list for the backward pass. Later calls with the
+same shapes replay those lists: no Tensor, Node or Edge is created per op,
+and the whole computation is a single CompiledBackward node in the graph.
+
+Replays see the current data of the tensors fn captured, e.g. parameters
+updated by an optimizer, but only the ops recorded the first time: control
+flow must depend on nothing but the argument shapes and the non-tensor
+arguments. Ops without a replay kernel, tensors fn makes from raw arrays,
+reads of the data of the tensors of the trace, Python numbers that are not
+constants written in the code (e.g. ``x * self.scale``), float16 data and
+calls made under lazy_mode fall back to eager execution. One thread traces
+at a time; the others run eagerly meanwhile.
+"""
+
+import functools
+import inspect
+import numbers
+import sys
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+import minitorch
+from minitorch import Tensor
+from minitorch import tensor as tensor_module
+from . import functional, kernels
+from .grad_mode import is_grad_enabled
+from .lazy import is_lazy_mode_enabled
+from .node import AccumulateGrad, Node, collect_next_edges
+
+__all__ = ['compile']
+
+# frames whose constants are the library's own, not those of fn
+_INTERNAL_FILES = {__file__, tensor_module.__file__}
+
+_state = threading.local()
+# one trace at a time: the patches below are seen by every thread, which the
+# wrappers route to the eager ops unless the thread is the one tracing
+_trace_lock = threading.Lock()
+_originals: Dict[str, Callable] = {}
+_watched_classes: Dict[type, type] = {}
+
+
+class Unsupported(Exception):
+    """Raised while building a replay the trace cannot be turned into."""
+
+
+############## tracing ##################
+
+class Trace:
+    """Ops recorded while running a function: (name, bound arguments, output)."""
+
+    def __init__(self, fn_shapes: List[tuple]):
+        self.ops: List[Tuple[str, inspect.BoundArguments, Tensor]] = []
+        self.depth = 0
+        self.unsupported: Optional[str] = None
+        # ids of the tensors created while tracing, and of those among them
+        # that only hold a Python scalar of fn
+        self.created = set()
+        self.scalars = set()
+        # tensors whose class was swapped for a watched one, with their class
+        self.watched: Dict[int, Tuple[Tensor, type]] = {}
+        # sizes an int may take without being a constant of fn
+        self.dims = {size for shape in fn_shapes for size in shape}
+
+    def watch(self, t: Tensor) -> None:
+        cls = type(t)
+        if id(t) in self.watched or isinstance(inspect.getattr_static(cls, 'data', None), property):
+            return
+        if cls not in _watched_classes:
+            _watched_classes[cls] = type(cls.__name__, (_Watched, cls), {'__module__': cls.__module__})
+        self.watched[id(t)] = (t, cls)
+        t.__class__ = _watched_classes[cls]
+
+    def unwatch(self) -> None:
+        for t, cls in self.watched.values():
+            t.__class__ = cls
+        self.watched.clear()
+
+    def check_constant(self, value, what: str) -> None:
+        """Mark the trace unsupported unless the numbers in value are
+        constants of the code between fn and the op, or sizes of the tensors."""
+        if isinstance(value, (tuple, list)):
+            for v in value:
+                self.check_constant(v, what)
+            return
+        if not isinstance(value, numbers.Number) or isinstance(value, bool):
+            return
+        if isinstance(value, int) and (value in self.dims or value == -1):
+            return
+        frame = sys._getframe(1)
+        while frame is not None and frame.f_code is not _run_traced.__code__:
+            if frame.f_code.co_filename not in _INTERNAL_FILES and any(
+                    type(c) is type(value) and c == value for c in frame.f_code.co_consts):
+                return
+            frame = frame.f_back
+        # e.g. an attribute or a closure variable, which may change before the next call
+        self.unsupported = self.unsupported or f"{what} {value!r} not written in the code"
+
+
+class _Watched:
+    """Mixin of the tensors of a trace, noting the reads of their data by fn:
+    the replay would not see the control flow depending on it."""
+
+    @property
+    def data(self) -> np.ndarray:
+        trace = getattr(_state, 'trace', None)
+        if trace is not None and not trace.depth:
+            trace.unsupported = trace.unsupported or "a read of tensor data"
+        return self.__dict__['data']
+
+    @data.setter
+    def data(self, value: np.ndarray) -> None:
+        self.__dict__['data'] = value
+
+    @property
+    def shape(self):
+        return self.__dict__['data'].shape
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.__dict__['data'].dtype
+
+
+def _recording(name: str, op: Callable) -> Callable:
+    signature = inspect.signature(op)
+
+    @functools.wraps(op)
+    def wrapper(*args, **kwargs):
+        trace = getattr(_state, 'trace', None)
+        if trace is None or trace.depth:
+            return op(*args, **kwargs)
+        # ops calling other ops are recorded as one
+        trace.depth += 1
+        try:
+            output = op(*args, **kwargs)
+        finally:
+            trace.depth -= 1
+        if name not in _KERNELS:
+            trace.unsupported = trace.unsupported or name
+        else:
+            bound = signature.bind(*args, **kwargs)
+            for key, value in bound.arguments.items():
+                if isinstance(value, Tensor):
+                    trace.dims.update(value.shape)
+                    trace.watch(value)
+                else:
+                    trace.check_constant(value, f"the {key} of {name}")
+            bound.apply_defaults()
+            trace.ops.append((name, bound, output))
+            if isinstance(output, Tensor):
+                trace.watch(output)
+        return output
+    return wrapper
+
+
+def _tracing_init(init: Callable) -> Callable:
+    @functools.wraps(init)
+    def wrapper(self, *args, **kwargs):
+        init(self, *args, **kwargs)
+        trace = getattr(_state, 'trace', None)
+        if trace is not None:
+            trace.created.add(id(self))
+    return wrapper
+
+
+def _tracing_ensure_tensor(ensure_tensor: Callable) -> Callable:
+    @functools.wraps(ensure_tensor)
+    def wrapper(data, *args, **kwargs):
+        t = ensure_tensor(data, *args, **kwargs)
+        trace = getattr(_state, 'trace', None)
+        if trace is not None and isinstance(data, (int, float)):
+            trace.scalars.add(id(t))
+            if not trace.depth:
+                trace.check_constant(data, "the operand")
+        return t
+    return wrapper
+
+
+def _patch() -> None:
+    # the ops are also re-exported by the minitorch package
+    # tensors made inside fn without an op must not be captured as constants
+    Tensor.__init__ = _tracing_init(Tensor.__init__)
+    tensor_module.ensure_tensor = _tracing_ensure_tensor(tensor_module.ensure_tensor)
+    for name, op in list(vars(functional).items()):
+        if inspect.isfunction(op) and op.__module__ == functional.__name__ and not name.startswith('_'):
+            _originals[name] = op
+    for module in (functional, minitorch):
+        for name, op in _originals.items():
+            if getattr(module, name, None) is op:
+                setattr(module, name, _recording(name, op))
+
+
+def _unpatch() -> None:
+    Tensor.__init__ = Tensor.__init__.__wrapped__
+    tensor_module.ensure_tensor = tensor_module.ensure_tensor.__wrapped__
+    for module in (functional, minitorch):
+        for name, op in _originals.items():
+            if getattr(getattr(module, name, None), '__wrapped__', None) is op:
+                setattr(module, name, op)
+    _originals.clear()
+
+
+def _run_traced(fn: Callable, args: tuple, kwargs: dict) -> Tuple[Trace, object]:
+    """Run fn recording its ops; the caller holds _trace_lock."""
+    tensor_args = [v for v in list(args) + list(kwargs.values()) if isinstance(v, Tensor)]
+    trace = Trace([t.shape for t in tensor_args])
+    _patch()
+    _state.trace = trace
+    try:
+        for t in tensor_args:
+            trace.watch(t)
+        output = fn(*args, **kwargs)
+    finally:
+        _state.trace = None
+        trace.unwatch()
+        _unpatch()
+    return trace, output
+
+
+############## replay kernels ##################
+# each kernel builds the forward step of an op and, if needed, its backward
+# step, both closing over buffers allocated once
+
+def _unbroadcast(shape: tuple, grad_shape: tuple, dtype: np.dtype):
+    """A function summing a gradient of grad_shape down to shape into a
+    preallocated buffer, or None when no reduction is needed."""
+    if tuple(shape) == tuple(grad_shape):
+        return None
+    ndims_added = len(grad_shape) - len(shape)
+    axes = tuple(range(ndims_added)) + tuple(
+        ndims_added + i for i, dim in enumerate(shape) if dim == 1 and grad_shape[ndims_added + i] != 1)
+    keep_shape = tuple(1 if i in axes else dim for i, dim in enumerate(grad_shape))
+    buffer = np.empty(keep_shape, dtype=dtype)
+    result = buffer.reshape(shape)
+
+    def reduce(grad: np.ndarray) -> np.ndarray:
+        np.sum(grad, axis=axes, keepdims=True, out=buffer)
+        return result
+    return reduce
+
+
+class OpSpec:
+    """An op of the trace with the slots of its inputs and output."""
+
+    def __init__(self, name: str, inputs: List[int], output: int, attrs: dict,
+                 in_shapes: List[tuple], out_shape: tuple, dtype: np.dtype, needs_grad: List[bool]):
+        self.name = name
+        self.inputs = inputs
+        self.output = output
+        self.attrs = attrs
+        self.in_shapes = in_shapes
+        self.out_shape = out_shape
+        self.dtype = dtype
+        self.needs_grad = needs_grad
+
+
+def _elementwise_binary(spec: OpSpec, values: list):
+    a, b, y = spec.inputs[0], spec.inputs[1], spec.output
+    out = np.empty(spec.out_shape, dtype=spec.dtype)
+    values[y] = out
+    ufunc = {'add': np.add, 'sub': np.subtract, 'mul': np.multiply, 'div': np.true_divide}[spec.name]
+
+    def forward():
+        ufunc(values[a], values[b], out=out)
+
+    reduce_a, reduce_b = (_unbroadcast(shape, spec.out_shape, spec.dtype) for shape in spec.in_shapes)
+    scratch_a, scratch_b = (np.empty(spec.out_shape, dtype=spec.dtype) for _ in range(2))
+    needs_a, needs_b = spec.needs_grad
+
+    if spec.name in ('add', 'sub'):
+        def grad_a(g):
+            return g
+    elif spec.name == 'mul':
+        def grad_a(g):
+            return np.multiply(g, values[b], out=scratch_a)
+    else:
+        def grad_a(g):
+            return np.true_divide(g, values[b], out=scratch_a)
+
+    if spec.name == 'add':
+        def grad_b(g):
+            return g
+    elif spec.name == 'sub':
+        def grad_b(g):
+            return np.negative(g, out=scratch_b)
+    elif spec.name == 'mul':
+        def grad_b(g):
+            return np.multiply(g, values[a], out=scratch_b)
+    else:
+        def grad_b(g):
+            # d(a / b)/db = -g * (a / b) / b
+            np.multiply(g, out, out=scratch_b)
+            np.true_divide(scratch_b, values[b], out=scratch_b)
+            return np.negative(scratch_b, out=scratch_b)
+
+    def backward(g: np.ndarray) -> list:
+        ga = gb = None
+        if needs_a:
+            ga = grad_a(g)
+            ga = ga if reduce_a is None else reduce_a(ga)
+        if needs_b:
+            gb = grad_b(g)
+            gb = gb if reduce_b is None else reduce_b(gb)
+        return [ga, gb]
+    return forward, backward
+
+
+def _elementwise_unary(spec: OpSpec, values: list):
+    x, y = spec.inputs[0], spec.output
+    out = np.empty(spec.out_shape, dtype=spec.dtype)
+    values[y] = out
+    grad = np.empty(spec.in_shapes[0], dtype=spec.dtype)
+    name = spec.name
+
+    if name == 'neg':
+        def forward():
+            np.negative(values[x], out=out)
+
+        def backward(g):
+            return [np.negative(g, out=grad)]
+    elif name == 'relu':
+        mask = np.empty(spec.in_shapes[0], dtype=bool)
+
+        def forward():
+            np.maximum(values[x], 0, out=out)
+
+        def backward(g):
+            np.greater_equal(values[x], 0, out=mask)
+            return [np.multiply(g, mask, out=grad)]
+    elif name == 'exp':
+        def forward():
+            np.exp(values[x], out=out)
+
+        def backward(g):
+            return [np.multiply(g, out, out=grad)]
+    elif name == 'sigmoid':
+        def forward():
+            kernels.sigmoid(values[x], out=out)
+
+        def backward(g):
+            np.subtract(1, out, out=grad)
+            np.multiply(grad, out, out=grad)
+            return [np.multiply(grad, g, out=grad)]
+    elif name == 'tanh':
+        def forward():
+            np.tanh(values[x], out=out)
+
+        def backward(g):
+            np.multiply(out, out, out=grad)
+            np.subtract(1, grad, out=grad)
+            return [np.multiply(grad, g, out=grad)]
+    else:
+        exponent = spec.attrs['t2']
+        if not isinstance(exponent, (int, float)):
+            raise Unsupported("pow with a non-scalar exponent")
+
+        def forward():
+            np.power(values[x], exponent, out=out)
+
+        def backward(g):
+            np.power(values[x], exponent - 1, out=grad)
+            np.multiply(grad, exponent, out=grad)
+            return [np.multiply(grad, g, out=grad)]
+    return forward, backward
+
+
+def _reduction(spec: OpSpec, values: list):
+    x, y = spec.inputs[0], spec.output
+    axis = spec.attrs['axis']
+    in_shape = spec.in_shapes[0]
+    out = np.empty(spec.out_shape, dtype=spec.dtype)
+    values[y] = out
+    count = max(int(np.prod(in_shape)), 1) // max(out.size, 1)
+
+    if spec.name == 'sum':
+        def forward():
+            np.sum(values[x], axis=axis, out=out)
+    else:
+        def forward():
+            np.sum(values[x], axis=axis, out=out)
+            np.true_divide(out, count, out=out)
+
+    axes = range(len(in_shape)) if axis is None else \
+        [a % len(in_shape) for a in ((axis,) if isinstance(axis, int) else axis)]
+    keep_shape = tuple(1 if i in axes else dim for i, dim in enumerate(in_shape))
+    scale = out.size / max(int(np.prod(in_shape)), 1)
+    grad = np.empty(in_shape, dtype=spec.dtype)
+
+    def backward(g: np.ndarray) -> list:
+        if spec.name == 'sum':
+            np.copyto(grad, g.reshape(keep_shape))
+        else:
+            np.multiply(g.reshape(keep_shape), scale, out=grad)
+        return [grad]
+    return forward, backward
+
+
+def _matmul(spec: OpSpec, values: list):
+    a, b, y = spec.inputs[0], spec.inputs[1], spec.output
+    if len(spec.in_shapes[0]) != 2 or len(spec.in_shapes[1]) != 2:
+        raise Unsupported("matmul of operands other than matrices")
+    out = np.empty(spec.out_shape, dtype=spec.dtype)
+    values[y] = out
+    grad_a = np.empty(spec.in_shapes[0], dtype=spec.dtype)
+    grad_b = np.empty(spec.in_shapes[1], dtype=spec.dtype)
+
+    def forward():
+        np.matmul(values[a], values[b], out=out)
+
+    def backward(g: np.ndarray) -> list:
+        grads = [None, None]
+        if spec.needs_grad[0]:
+            grads[0] = np.matmul(g, values[b].T, out=grad_a)
+        if spec.needs_grad[1]:
+            grads[1] = np.matmul(values[a].T, g, out=grad_b)
+        return grads
+    return forward, backward
+
+
+def _view(spec: OpSpec, values: list):
+    # views are recomputed each call, since their input may be an argument
+    x, y = spec.inputs[0], spec.output
+    in_shape, out_shape = spec.in_shapes[0], spec.out_shape
+    if spec.name in ('t', 'permute', 'transpose'):
+        if spec.name == 't':
+            dims = tuple(reversed(range(len(in_shape))))
+        elif spec.name == 'permute':
+            dims = tuple(d % len(in_shape) for d in spec.attrs['dims'])
+        else:
+            dims = list(range(len(in_shape)))
+            dim0, dim1 = spec.attrs['dim0'], spec.attrs['dim1']
+            dims[dim0], dims[dim1] = dims[dim1], dims[dim0]
+            dims = tuple(dims)
+        inverse = tuple(np.argsort(dims))
+
+        def forward():
+            values[y] = np.transpose(values[x], dims)
+
+        def backward(g: np.ndarray) -> list:
+            return [np.transpose(g, inverse)]
+    elif spec.name == 'expand':
+        reduce = _unbroadcast(in_shape, out_shape, spec.dtype)
+
+        def forward():
+            values[y] = np.broadcast_to(values[x], out_shape)
+
+        def backward(g: np.ndarray) -> list:
+            return [g if reduce is None else reduce(g)]
+    else:
+        def forward():
+            values[y] = np.reshape(values[x], out_shape)
+
+        def backward(g: np.ndarray) -> list:
+            return [np.reshape(g, in_shape)]
+    return forward, backward
+
+
+_KERNELS = {
+    'add': _elementwise_binary, 'sub': _elementwise_binary,
+    'mul': _elementwise_binary, 'div': _elementwise_binary,
+    'neg': _elementwise_unary, 'relu': _elementwise_unary, 'exp': _elementwise_unary,
+    'sigmoid': _elementwise_unary, 'tanh': _elementwise_unary, 'pow': _elementwise_unary,
+    'sum': _reduction, 'mean': _reduction,
+    'matmul': _matmul,
+    't': _view, 'permute': _view, 'transpose': _view, 'expand': _view,
+    'reshape': _view, 'view': _view, 'squeeze': _view, 'unsqueeze': _view,
+}
+
+
+############## replay ##################
+
+class CompiledBackward(Node):
+    """Backward of a whole replayed computation."""
+
+    def __init__(self, program: 'Program', generation: int):
+        self.program = program
+        self.generation = generation
+
+    def apply(self, grad_output: Tensor) -> list:
+        if self.program.generation != self.generation:
+            raise RuntimeError("the compiled function ran again since this output was computed, "
+                               "which overwrote the buffers its backward needs")
+        return [None if grad is None else Tensor(data=grad) for grad in self.program.backward(grad_output.data)]
+
+
+class Program:
+    """The replayable form of a trace.
+
+    Slots number every array of the computation: the tensor arguments first,
+    then the tensors fn captured, then the op outputs. values holds the
+    current array of every slot.
+    """
+
+    def __init__(self, trace: Trace, tensor_args: List[Tensor], output: Tensor):
+        slots: Dict[int, int] = {}
+        for t in tensor_args:
+            slots.setdefault(id(t), len(slots))
+        self.num_args = len(tensor_args)
+        self.arg_slots = [slots[id(t)] for t in tensor_args]
+        self.captured: List[Tensor] = []
+        specs = []
+        produced = set()
+        # only the ops the output depends on are replayed
+        live = {id(output)}
+        ops = []
+        for name, bound, result in reversed(trace.ops):
+            if id(result) not in live:
+                continue
+            ops.append((name, bound, result))
+            live.update(id(t) for t in bound.arguments.values() if isinstance(t, Tensor))
+        ops.reverse()
+        requires_grad: Dict[int, bool] = {}
+        for name, bound, result in ops:
+            inputs = []
+            for t in bound.arguments.values():
+                if not isinstance(t, Tensor):
+                    continue
+                if id(t) not in slots:
+                    if t.grad_fn is not None and not isinstance(t.grad_fn, AccumulateGrad):
+                        # computed without going through a recorded op
+                        raise Unsupported(f"{name} takes a tensor computed outside of the trace")
+                    if id(t) in trace.created and id(t) not in trace.scalars:
+                        # made inside fn from data that may differ on the next call
+                        raise Unsupported(f"{name} takes a tensor created by fn without a recorded op")
+                    slots[id(t)] = len(slots)
+                    self.captured.append(t)
+                inputs.append(t)
+            if not isinstance(result, Tensor) or id(result) in slots:
+                raise Unsupported(f"{name} did not return a new tensor")
+            slots[id(result)] = len(slots)
+            produced.add(id(result))
+            if result.dtype not in (np.float32, np.float64):
+                raise Unsupported(f"{name} computes in {result.dtype}")
+            attrs = {k: v for k, v in bound.arguments.items() if not isinstance(v, Tensor)}
+            needs_grad = [t.requires_grad and result.requires_grad for t in inputs]
+            specs.append(OpSpec(name, [slots[id(t)] for t in inputs], slots[id(result)], attrs,
+                                [t.shape for t in inputs], result.shape, result.dtype, needs_grad))
+            requires_grad[slots[id(result)]] = result.requires_grad
+        if id(output) not in produced:
+            raise Unsupported("the output is not computed by a recorded op")
+        self.captured_slots = [slots[id(t)] for t in self.captured]
+        self.captured_shapes = [(t.shape, t.dtype, t.requires_grad) for t in self.captured]
+        self.output = slots[id(output)]
+        self.output_shape = output.shape
+        self.requires_grad = output.requires_grad
+
+        self.values: list = [None] * len(slots)
+        self.forward_steps = []
+        self.backward_steps = []
+        for spec in specs:
+            forward, backward = _KERNELS[spec.name](spec, self.values)
+            self.forward_steps.append(forward)
+            if any(spec.needs_grad):
+                self.backward_steps.append((spec, backward))
+        self.backward_steps.reverse()
+
+        # leaves of the backward: the arguments and captured tensors needing a gradient
+        inputs = list(tensor_args) + self.captured
+        input_slots = self.arg_slots + self.captured_slots
+        self.grad_inputs = [(i, slot) for i, (t, slot) in enumerate(zip(inputs, input_slots))
+                            if t.requires_grad and any(slot in spec.inputs for spec, _ in self.backward_steps)]
+        self.no_grads = [None] * len(slots)
+        self.not_owned = [False] * len(slots)
+        self.grads: list = list(self.no_grads)
+        self.owned = list(self.not_owned)
+        self.grad_buffers: Dict[int, np.ndarray] = {}
+        for spec, _ in self.backward_steps:
+            for slot, shape, needs in zip(spec.inputs, spec.in_shapes, spec.needs_grad):
+                if needs and slot not in self.grad_buffers:
+                    self.grad_buffers[slot] = np.empty(shape, dtype=spec.dtype)
+        self.generation = 0
+
+    def guard(self) -> bool:
+        """Tell whether the captured tensors still have the traced shapes."""
+        return all((t.shape, t.dtype, t.requires_grad) == expected for t, expected in zip(self.captured, self.captured_shapes))
+
+    def run(self, tensor_args: List[Tensor]) -> Tensor:
+        values = self.values
+        for slot, t in zip(self.arg_slots, tensor_args):
+            values[slot] = t.data
+        for slot, t in zip(self.captured_slots, self.captured):
+            values[slot] = t.data
+        for step in self.forward_steps:
+            step()
+        self.generation += 1
+        # the output buffer is overwritten by the next run, unlike the result
+        output = values[self.output].copy()
+        if not (self.requires_grad and is_grad_enabled()):
+            return Tensor(data=output)
+        inputs = list(tensor_args) + self.captured
+        node = CompiledBackward(self, self.generation)
+        node.set_next_edges(collect_next_edges(*(inputs[i] for i, _ in self.grad_inputs)))
+        return Tensor(data=output, requires_grad=True, grad_fn=node)
+
+    def _accumulate(self, slot: int, grad: np.ndarray) -> None:
+        # the first gradient is borrowed, later ones summed into the slot's own buffer
+        current = self.grads[slot]
+        if current is None:
+            self.grads[slot] = grad
+        elif self.owned[slot]:
+            np.add(current, grad, out=current)
+        else:
+            self.grads[slot] = np.add(current, grad, out=self.grad_buffers[slot])
+            self.owned[slot] = True
+
+    def backward(self, grad_output: np.ndarray) -> List[Optional[np.ndarray]]:
+        grads = self.grads
+        grads[:] = self.no_grads
+        self.owned[:] = self.not_owned
+        if grad_output.shape != self.output_shape:
+            grad_output = np.broadcast_to(grad_output, self.output_shape)
+        grads[self.output] = grad_output
+        for spec, backward in self.backward_steps:
+            g = grads[spec.output]
+            if g is None:
+                continue
+            for slot, grad in zip(spec.inputs, backward(g)):
+                if grad is not None:
+                    self._accumulate(slot, grad)
+        return [grads[slot] for _, slot in self.grad_inputs]
+
+
+class CompiledFunction:
+    """A function replaying its recorded ops for the argument shapes it saw.
+
+    The intermediate results its backward needs live in buffers that the next
+    call overwrites: run backward before calling it again.
+    """
+
+    def __init__(self, fn: Callable, max_traces: int = 8):
+        functools.update_wrapper(self, fn)
+        self.fn = fn
+        self.max_traces = max_traces
+        # None marks keys that run eagerly
+        self.programs: Dict[tuple, Optional[Program]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, args: tuple, kwargs: dict) -> Optional[tuple]:
+        def describe(value):
+            if isinstance(value, Tensor):
+                return Tensor, value.shape, value.dtype, value.requires_grad
+            return value
+        key = (is_grad_enabled(), tuple(map(describe, args)),
+               tuple((name, describe(value)) for name, value in sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def __call__(self, *args, **kwargs):
+        if is_lazy_mode_enabled() or getattr(_state, 'trace', None) is not None:
+            return self.fn(*args, **kwargs)
+        key = self._key(args, kwargs)
+        if key is None:
+            return self.fn(*args, **kwargs)
+        tensor_args = [v for v in list(args) + list(kwargs.values()) if isinstance(v, Tensor)]
+        if key in self.programs:
+            program = self.programs[key]
+            if program is None:
+                return self.fn(*args, **kwargs)
+            if program.guard():
+                self.hits += 1
+                return program.run(tensor_args)
+            del self.programs[key]
+        if not _trace_lock.acquire(blocking=False):
+            # another thread is tracing, fn is traced on a later call
+            return self.fn(*args, **kwargs)
+        try:
+            trace, output = _run_traced(self.fn, args, kwargs)
+        finally:
+            _trace_lock.release()
+        self.misses += 1
+        if len(self.programs) >= self.max_traces:
+            return output
+        program = None
+        if trace.unsupported is None and isinstance(output, Tensor):
+            try:
+                program = Program(trace, tensor_args, output)
+            except Unsupported:
+                program = None
+        self.programs[key] = program
+        return output
+
+
+def compile(fn: Callable = None, max_traces: int = 8):
+    """Compile fn, a function of tensors returning a tensor, into a
+    CompiledFunction. Usable as a decorator, with or without arguments."""
+    if fn is None:
+        return functools.partial(compile, max_traces=max_traces)
+    return CompiledFunction(fn, max_traces=max_traces)
@@ -3,51 +3,203 @@
 Topological Sorting
 """
 
-from collections import defaultdict, deque
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import List, Tuple
+
+import numpy as np
 
 from minitorch import Tensor
+from . import allocator
 from .node import Node
 
 
 class NodeTask:
+    """Gradient buffer of a node waiting to be executed.
+
+    The first incoming gradient is borrowed as is. When a second one arrives
+    (fan-in), the task allocates its own accumulation buffer once and every
+    further gradient is summed into it in place, so the arrays handed over by
+    upstream nodes are never mutated.
+    """
+
     def __init__(self, node: Node, grad_input: Tensor):
         self.node = node
         self.grad_input = grad_input
+        self.owned = False
 
     def update_grad_input(self, grad_input: Tensor):
-        self.grad_input += grad_input
+        if self.owned:
+            np.add(self.grad_input.data, grad_input.data, out=self.grad_input.data)
+        else:
+            out = allocator.elementwise_out(self.grad_input.data, grad_input.data)
+            self.grad_input = Tensor(data=np.add(self.grad_input.data, grad_input.data, out=out))
+            self.owned = True
+
+
+_num_threads = 1
+_executors = {}
+# set in the threads of the pools, whose nested backward passes run serially
+_worker = threading.local()
+
+
+def set_num_threads(num_threads: int) -> None:
+    """Default number of threads of the backward engine.
+
+    With more than one, independent branches of the graph run concurrently.
+    NumPy releases the GIL inside large kernels, so this pays off for graphs
+    with wide branches of big matmuls, not for small ops.
+    """
+    global _num_threads
+    if num_threads <= 0:
+        raise ValueError("num_threads should be positive, rather than {}".format(num_threads))
+    _num_threads = num_threads
+
+
+def get_num_threads() -> int:
+    return _num_threads
+
+
+def _executor(num_threads: int) -> ThreadPoolExecutor:
+    executor = _executors.get(num_threads)
+    if executor is None:
+        executor = _executors[num_threads] = ThreadPoolExecutor(
+            num_threads, thread_name_prefix='minitorch-backward', initializer=setattr,
+            initargs=(_worker, 'active', True))
+    return executor
+
+
+def collect_graph(root: Node) -> Tuple[List[Node], List[Tuple[int, ...]]]:
+    """Number every node reachable from root in discovery order, visiting each
+    node exactly once, and describe the edges by those numbers."""
+    index = {root: 0}
+    nodes = [root]
+    next_indices = []
+    i = 0
+    while i < len(nodes):
+        targets = []
+        for edge in getattr(nodes[i], "next_edges", None) or ():
+            j = index.get(edge.node)
+            if j is None:
+                j = index[edge.node] = len(nodes)
+                nodes.append(edge.node)
+            targets.append(j)
+        next_indices.append(tuple(targets))
+        i += 1
+    return nodes, next_indices
 
 
 class Engine:
+    """Runs the backward pass of a graph.
 
-    def execute(self, tensor, grad_input):
-        dependencies = self._compute_dependencies(tensor.grad_fn)
-        not_ready_dict = {}
-        ready_queue = deque([NodeTask(tensor.grad_fn, grad_input)])
-        while ready_queue:
-            node_task = ready_queue.popleft()
+    With num_threads > 1, nodes whose gradients are complete are dispatched
+    to a thread pool. All bookkeeping stays on the calling thread: it counts
+    down the dependencies of each node, which needs no locks, and sums the
+    gradients flowing into a node in the order the serial schedule would, so
+    the results do not depend on which thread finishes first.
+    """
+
+    def __init__(self, num_threads: int = None):
+        self.num_threads = num_threads if num_threads is not None else _num_threads
+        if self.num_threads <= 0:
+            raise ValueError("num_threads should be positive, rather than {}".format(self.num_threads))
+
+    def execute(self, tensor, grad_input, retain_graph: bool = False):
+        nodes, next_indices = collect_graph(tensor.grad_fn)
+        order = self._topological_order(next_indices)
+        if self.num_threads > 1 and len(nodes) > 1 and not getattr(_worker, 'active', False):
+            self._execute_parallel(nodes, next_indices, order, grad_input, retain_graph)
+            return
+        node_tasks = [None] * len(nodes)
+        node_tasks[0] = NodeTask(nodes[0], grad_input)
+        for i in order:
+            node_task = node_tasks[i]
+            if node_task is None:
+                # no gradient reaches the node, it would keep its saved tensors otherwise
+                if not retain_graph:
+                    nodes[i].release_saved_tensors()
+                continue
+            node_tasks[i] = None
             grad_outputs = node_task.node(node_task.grad_input)
+            if not retain_graph:
+                node_task.node.release_saved_tensors()
             if grad_outputs is None:
                 continue
-            for grad_output, edge in zip(grad_outputs, node_task.node.next_edges):
-                next_node = edge.node
-                dependencies[next_node] -= 1
-                if next_node not in not_ready_dict:
-                    not_ready_dict[next_node] = NodeTask(next_node, grad_output)
+            for grad_output, j in zip(grad_outputs, next_indices[i]):
+                if grad_output is None:
+                    continue
+                if node_tasks[j] is None:
+                    node_tasks[j] = NodeTask(nodes[j], grad_output)
                 else:
-                    not_ready_dict[next_node].update_grad_input(grad_output)
-                if dependencies[next_node] == 0:
-                    ready_queue.append(not_ready_dict[next_node])
-
-    def _compute_dependencies(self, root: Node):
-        dependencies = defaultdict(int)
-        dependencies[root] = 0
-        queue = deque([root])
-        while queue:
-            node = queue.pop()
-            if hasattr(node, "next_edges"):
-                for edge in node.next_edges:
-                    next_node = edge.node
-                    dependencies[next_node] += 1
-                    queue.append(next_node)
+                    node_tasks[j].update_grad_input(grad_output)
+
+    def _execute_parallel(self, nodes: List[Node], next_indices: List[Tuple[int, ...]], order: List[int],
+                          grad_input: Tensor, retain_graph: bool) -> None:
+        rank = [0] * len(nodes)
+        for position, i in enumerate(order):
+            rank[i] = position
+        dependencies = self._compute_dependencies(next_indices)
+        # gradients flowing into every node, as (rank of the producer, gradient)
+        incoming = [[] for _ in nodes]
+
+        def run(node: Node, grad: Tensor):
+            grad_outputs = node(grad)
+            if not retain_graph:
+                node.release_saved_tensors()
+            return grad_outputs
+
+        executor = _executor(self.num_threads)
+        running = {executor.submit(run, nodes[0], grad_input): 0}
+        try:
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                # nodes finished together are handled in schedule order
+                finished = deque(sorted(((running.pop(future), future.result()) for future in done),
+                                        key=lambda item: rank[item[0]]))
+                while finished:
+                    i, grad_outputs = finished.popleft()
+                    grad_outputs = grad_outputs if grad_outputs is not None else ()
+                    for k, j in enumerate(next_indices[i]):
+                        grad_output = grad_outputs[k] if k < len(grad_outputs) else None
+                        if grad_output is not None:
+                            incoming[j].append((rank[i], grad_output))
+                        dependencies[j] -= 1
+                        if dependencies[j] > 0:
+                            continue
+                        if not incoming[j]:
+                            # no gradient reaches the node: skip it, releasing its consumers
+                            if not retain_graph:
+                                nodes[j].release_saved_tensors()
+                            finished.append((j, None))
+                            continue
+                        grads = sorted(incoming[j], key=lambda item: item[0])
+                        incoming[j] = None
+                        node_task = NodeTask(nodes[j], grads[0][1])
+                        for _, grad in grads[1:]:
+                            node_task.update_grad_input(grad)
+                        running[executor.submit(run, nodes[j], node_task.grad_input)] = j
+        finally:
+            wait(running)
+
+    def _compute_dependencies(self, next_indices: List[Tuple[int, ...]]) -> List[int]:
+        """Count the incoming edges of every node."""
+        dependencies = [0] * len(next_indices)
+        for targets in next_indices:
+            for j in targets:
+                dependencies[j] += 1
         return dependencies
+
+    def _topological_order(self, next_indices: List[Tuple[int, ...]]) -> List[int]:
+        """Kahn's algorithm: a node is scheduled once all of its consumers ran."""
+        dependencies = self._compute_dependencies(next_indices)
+        order = []
+        ready_queue = deque([0])
+        while ready_queue:
+            i = ready_queue.popleft()
+            order.append(i)
+            for j in next_indices[i]:
+                dependencies[j] -= 1
+                if dependencies[j] == 0:
+                    ready_queue.append(j)
+        return order
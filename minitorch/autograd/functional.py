@@ -1,8 +1,12 @@
-from typing import Union, Tuple
+import string
+from typing import List, Union, Tuple
 
 import numpy as np
 
 from minitorch import Tensor
+from . import allocator, kernels
+from .grad_mode import is_grad_enabled
+from .lazy import is_lazy_mode_enabled, lazy_op
 from .node import collect_next_edges
 from .node import *
 
@@ -10,8 +14,8 @@ from .node import *
 ############## reduce operator ##################
 
 def sum(t: Tensor, axis: Union[int, Tuple[int]] = None) -> Tensor:
-    data = t.data.sum(axis=axis)
-    requires_grad = t.requires_grad
+    data = kernels.sum(t.data, axis=axis)
+    requires_grad = t.requires_grad and is_grad_enabled()
     if requires_grad:
         sum_bw = SumBackward()
         sum_bw.set_next_edges(collect_next_edges(t))
@@ -25,8 +29,8 @@ def sum(t: Tensor, axis: Union[int, Tuple[int]] = None) -> Tensor:
 
 
 def mean(t: Tensor, axis: Union[int, Tuple[int]] = None) -> Tensor:
-    data = t.data.mean(axis=axis)
-    requires_grad = t.requires_grad
+    data = kernels.mean(t.data, axis=axis)
+    requires_grad = t.requires_grad and is_grad_enabled()
     if requires_grad:
         mean_bw = MeanBackward()
         mean_bw.set_next_edges(collect_next_edges(t))
@@ -41,8 +45,10 @@ def mean(t: Tensor, axis: Union[int, Tuple[int]] = None) -> Tensor:
 ############## unary operator ##################
 
 def neg(t: Tensor) -> Tensor:
-    data = -t.data
-    requires_grad = t.requires_grad
+    if is_lazy_mode_enabled():
+        return lazy_op('neg', t)
+    data = np.negative(t.data, out=allocator.elementwise_out(t.data))
+    requires_grad = t.requires_grad and is_grad_enabled()
     if requires_grad:
         neg_bw = NegBackward()
         neg_bw.set_next_edges(collect_next_edges(t))
@@ -56,7 +62,7 @@ def neg(t: Tensor) -> Tensor:
 def t(t: Tensor) -> Tensor:
     # transpose
     data = t.data.T
-    requires_grad = t.requires_grad
+    requires_grad = t.requires_grad and is_grad_enabled()
     if requires_grad:
         t_bw = TBackward()
         t_bw.set_next_edges(collect_next_edges(t))
@@ -67,9 +73,25 @@ def t(t: Tensor) -> Tensor:
         return Tensor(data=data)
 
 
+def astype(t: Tensor, dtype) -> Tensor:
+    data = t.data.astype(dtype, copy=False)
+    requires_grad = t.requires_grad and is_grad_enabled()
+    if requires_grad:
+        astype_bw = AstypeBackward()
+        astype_bw.set_next_edges(collect_next_edges(t))
+        astype_bw.dtype = t.dtype
+        return Tensor(data=data,
+                      requires_grad=True,
+                      grad_fn=astype_bw)
+    else:
+        return Tensor(data=data)
+
+
 def relu(t: Tensor) -> Tensor:
-    data = np.maximum(t.data, 0)
-    requires_grad = t.requires_grad
+    if is_lazy_mode_enabled():
+        return lazy_op('relu', t)
+    data = np.maximum(t.data, 0, out=allocator.elementwise_out(t.data))
+    requires_grad = t.requires_grad and is_grad_enabled()
     if requires_grad:
         relu_bw = ReluBackward()
         relu_bw.set_next_edges(collect_next_edges(t))
@@ -82,8 +104,10 @@ def relu(t: Tensor) -> Tensor:
 
 
 def exp(t: Tensor) -> Tensor:
-    data = np.exp(t.data)
-    requires_grad = t.requires_grad
+    if is_lazy_mode_enabled():
+        return lazy_op('exp', t)
+    data = np.exp(t.data, out=allocator.elementwise_out(t.data))
+    requires_grad = t.requires_grad and is_grad_enabled()
     if requires_grad:
         exp_bw = ExpBackward()
         exp_bw.set_next_edges(collect_next_edges(t))
@@ -94,10 +118,189 @@ def exp(t: Tensor) -> Tensor:
     else:
         return Tensor(data=data)
 
+############## view operator ##################
+# the results share memory with their input, and the backward nodes only keep
+# shapes and indices
+
+def _normalize_index(index) -> Tuple[tuple, bool]:
+    """Turn an index into a tuple of basic items and arrays, telling whether
+    an integer array may hit the same element twice."""
+    if not isinstance(index, tuple):
+        index = (index,)
+    items = []
+    accumulate = False
+    for item in index:
+        if isinstance(item, Tensor):
+            item = item.data
+        if isinstance(item, (list, np.ndarray)):
+            item = np.asarray(item)
+            if item.dtype.kind in 'iu':
+                accumulate = True
+        items.append(item)
+    return tuple(items), accumulate
+
+
+def getitem(t: Tensor, index) -> Tensor:
+    index, accumulate = _normalize_index(index)
+    data = t.data[index]
+    requires_grad = t.requires_grad and is_grad_enabled()
+    if requires_grad:
+        index_bw = IndexBackward()
+        index_bw.set_next_edges(collect_next_edges(t))
+        index_bw.index = index
+        index_bw.shape = t.shape
+        index_bw.accumulate = accumulate
+        return Tensor(data=data,
+                      requires_grad=True,
+                      grad_fn=index_bw)
+    else:
+        return Tensor(data=data)
+
+
+def _reshaped(t: Tensor, data: np.ndarray) -> Tensor:
+    requires_grad = t.requires_grad and is_grad_enabled()
+    if requires_grad:
+        reshape_bw = ReshapeBackward()
+        reshape_bw.set_next_edges(collect_next_edges(t))
+        reshape_bw.shape = t.shape
+        return Tensor(data=data,
+                      requires_grad=True,
+                      grad_fn=reshape_bw)
+    else:
+        return Tensor(data=data)
+
+
+def reshape(t: Tensor, shape: Tuple[int, ...]) -> Tensor:
+    """Returns a view when the memory layout allows it, a copy otherwise."""
+    return _reshaped(t, t.data.reshape(shape))
+
+
+def view(t: Tensor, shape: Tuple[int, ...]) -> Tensor:
+    """Like reshape, but never copies."""
+    data = t.data.view()
+    try:
+        # setting the shape fails instead of copying, unlike reshape
+        data.shape = shape
+    except AttributeError:
+        raise RuntimeError(f"view of shape {shape} is not compatible with the strides of the input, "
+                           "use reshape instead") from None
+    return _reshaped(t, data)
+
+
+def squeeze(t: Tensor, axis: Union[int, Tuple[int]] = None) -> Tensor:
+    return _reshaped(t, np.squeeze(t.data, axis=axis))
+
+
+def unsqueeze(t: Tensor, axis: int) -> Tensor:
+    return _reshaped(t, np.expand_dims(t.data, axis))
+
+
+def permute(t: Tensor, dims: Tuple[int, ...]) -> Tensor:
+    dims = tuple(d % t.data.ndim for d in dims)
+    data = np.transpose(t.data, dims)
+    requires_grad = t.requires_grad and is_grad_enabled()
+    if requires_grad:
+        permute_bw = PermuteBackward()
+        permute_bw.set_next_edges(collect_next_edges(t))
+        permute_bw.dims = dims
+        return Tensor(data=data,
+                      requires_grad=True,
+                      grad_fn=permute_bw)
+    else:
+        return Tensor(data=data)
+
+
+def transpose(t: Tensor, dim0: int, dim1: int) -> Tensor:
+    dims = list(range(t.data.ndim))
+    dims[dim0], dims[dim1] = dims[dim1], dims[dim0]
+    return permute(t, dims)
+
+
+def expand(t: Tensor, shape: Tuple[int, ...]) -> Tensor:
+    """Broadcast to shape without copying, -1 keeps a dimension."""
+    offset = len(shape) - t.data.ndim
+    shape = tuple(t.shape[i - offset] if size == -1 else size for i, size in enumerate(shape))
+    data = np.broadcast_to(t.data, shape)
+    requires_grad = t.requires_grad and is_grad_enabled()
+    if requires_grad:
+        expand_bw = ExpandBackward()
+        expand_bw.set_next_edges(collect_next_edges(t))
+        expand_bw.shape = t.shape
+        return Tensor(data=data,
+                      requires_grad=True,
+                      grad_fn=expand_bw)
+    else:
+        return Tensor(data=data)
+
+############## activation operator ##################
+
+def sigmoid(t: Tensor) -> Tensor:
+    if is_lazy_mode_enabled():
+        return lazy_op('sigmoid', t)
+    data = kernels.sigmoid(t.data, out=allocator.elementwise_out(t.data))
+    requires_grad = t.requires_grad and is_grad_enabled()
+    if requires_grad:
+        sigmoid_bw = SigmoidBackward()
+        sigmoid_bw.set_next_edges(collect_next_edges(t))
+        sigmoid_bw.output = Tensor(data=data)
+        return Tensor(data=data,
+                      requires_grad=True,
+                      grad_fn=sigmoid_bw)
+    else:
+        return Tensor(data=data)
+
+
+def tanh(t: Tensor) -> Tensor:
+    if is_lazy_mode_enabled():
+        return lazy_op('tanh', t)
+    data = np.tanh(t.data, out=allocator.elementwise_out(t.data))
+    requires_grad = t.requires_grad and is_grad_enabled()
+    if requires_grad:
+        tanh_bw = TanhBackward()
+        tanh_bw.set_next_edges(collect_next_edges(t))
+        tanh_bw.output = Tensor(data=data)
+        return Tensor(data=data,
+                      requires_grad=True,
+                      grad_fn=tanh_bw)
+    else:
+        return Tensor(data=data)
+
+
+def softmax(t: Tensor, axis: int = -1) -> Tensor:
+    data = kernels.softmax(t.data, axis=axis)
+    requires_grad = t.requires_grad and is_grad_enabled()
+    if requires_grad:
+        softmax_bw = SoftmaxBackward()
+        softmax_bw.set_next_edges(collect_next_edges(t))
+        softmax_bw.output = Tensor(data=data)
+        softmax_bw.axis = axis
+        return Tensor(data=data,
+                      requires_grad=True,
+                      grad_fn=softmax_bw)
+    else:
+        return Tensor(data=data)
+
+
+def log_softmax(t: Tensor, axis: int = -1) -> Tensor:
+    data = kernels.log_softmax(t.data, axis=axis)
+    requires_grad = t.requires_grad and is_grad_enabled()
+    if requires_grad:
+        log_softmax_bw = LogSoftmaxBackward()
+        log_softmax_bw.set_next_edges(collect_next_edges(t))
+        log_softmax_bw.output = Tensor(data=data)
+        log_softmax_bw.axis = axis
+        return Tensor(data=data,
+                      requires_grad=True,
+                      grad_fn=log_softmax_bw)
+    else:
+        return Tensor(data=data)
+
 ############## binary operator ##################
 def add(t1: Tensor, t2: Tensor) -> Tensor:
-    data = t1.data + t2.data
-    requires_grad = t1.requires_grad or t2.requires_grad
+    if is_lazy_mode_enabled():
+        return lazy_op('add', t1, t2)
+    data = np.add(t1.data, t2.data, out=allocator.elementwise_out(t1.data, t2.data))
+    requires_grad = (t1.requires_grad or t2.requires_grad) and is_grad_enabled()
     if requires_grad:
         add_bw = AddBackward()
         add_bw.set_next_edges(collect_next_edges(t1, t2))
@@ -113,8 +316,10 @@ def add(t1: Tensor, t2: Tensor) -> Tensor:
 
 
 def sub(t1: Tensor, t2: Tensor) -> Tensor:
-    data = t1.data - t2.data
-    requires_grad = t1.requires_grad or t2.requires_grad
+    if is_lazy_mode_enabled():
+        return lazy_op('sub', t1, t2)
+    data = np.subtract(t1.data, t2.data, out=allocator.elementwise_out(t1.data, t2.data))
+    requires_grad = (t1.requires_grad or t2.requires_grad) and is_grad_enabled()
     if requires_grad:
         sub_bw = SubBackward()
         sub_bw.set_next_edges(collect_next_edges(t1, t2))
@@ -130,11 +335,13 @@ def sub(t1: Tensor, t2: Tensor) -> Tensor:
 
 
 def mul(t1: Tensor, t2: Tensor) -> Tensor:
-    data = t1.data * t2.data
-    requires_grad = t1.requires_grad or t2.requires_grad
+    if is_lazy_mode_enabled():
+        return lazy_op('mul', t1, t2)
+    data = np.multiply(t1.data, t2.data, out=allocator.elementwise_out(t1.data, t2.data))
+    requires_grad = (t1.requires_grad or t2.requires_grad) and is_grad_enabled()
     if requires_grad:
         mul_bw = MulBackward()
-        mul_bw.set_next_edges(collect_next_edges(t1, t2))
+        mul_bw.set_next_edges(collect_next_edges(t1, t2, saved=True))
         if t1.requires_grad:
             mul_bw.t2 = Tensor(data=t2.data)
             mul_bw.t1_shape = t1.shape
@@ -149,11 +356,13 @@ def mul(t1: Tensor, t2: Tensor) -> Tensor:
 
 
 def div(t1: Tensor, t2: Tensor) -> Tensor:
-    data = t1.data / t2.data
-    requires_grad = t1.requires_grad or t2.requires_grad
+    if is_lazy_mode_enabled():
+        return lazy_op('div', t1, t2)
+    data = np.true_divide(t1.data, t2.data, out=allocator.elementwise_out(t1.data, t2.data))
+    requires_grad = (t1.requires_grad or t2.requires_grad) and is_grad_enabled()
     if requires_grad:
         div_bw = DivBackward()
-        div_bw.set_next_edges(collect_next_edges(t1, t2))
+        div_bw.set_next_edges(collect_next_edges(t1, t2, saved=True))
         if t1.requires_grad:
             div_bw.t2 = Tensor(data=t2.data)
             div_bw.t1_shape = t1.shape
@@ -169,11 +378,13 @@ def div(t1: Tensor, t2: Tensor) -> Tensor:
 
 
 def matmul(t1: Tensor, t2: Tensor) -> Tensor:
-    data = t1.data @ t2.data
-    requires_grad = t1.requires_grad or t2.requires_grad
+    data = kernels.matmul(t1.data, t2.data, out=allocator.matmul_out(t1.data, t2.data))
+    requires_grad = (t1.requires_grad or t2.requires_grad) and is_grad_enabled()
     if requires_grad:
         matmul_bw = MatMulBackward()
-        matmul_bw.set_next_edges(collect_next_edges(t1, t2))
+        matmul_bw.set_next_edges(collect_next_edges(t1, t2, saved=True))
+        matmul_bw.t1_shape = t1.shape
+        matmul_bw.t2_shape = t2.shape
         if t1.requires_grad:
             matmul_bw.t2 = t2
         if t2.requires_grad:
@@ -185,9 +396,67 @@ def matmul(t1: Tensor, t2: Tensor) -> Tensor:
         return Tensor(data=data)
 
 
+def _parse_einsum(subscripts: str, ndims: List[int]) -> Tuple[List[str], str]:
+    """Spell out the ellipses and the implicit output of einsum subscripts with
+    explicit labels, so the backward can rearrange them freely."""
+    subscripts = subscripts.replace(' ', '')
+    inputs, arrow, output = subscripts.partition('->')
+    terms = inputs.split(',')
+    if len(terms) != len(ndims):
+        raise ValueError(f"einsum subscripts describe {len(terms)} operands, but {len(ndims)} were given")
+    free = [c for c in string.ascii_letters if c not in subscripts]
+    ellipsis_ndims = []
+    for term, ndim in zip(terms, ndims):
+        letters = term.replace('...', '')
+        if (letters and not letters.isalpha()) or term.count('...') > 1:
+            raise ValueError(f"invalid einsum subscripts {subscripts}")
+        num_labels = len(letters)
+        if ('...' in term and num_labels > ndim) or ('...' not in term and num_labels != ndim):
+            raise ValueError(f"einsum subscripts {term} do not match an operand with {ndim} dimensions")
+        ellipsis_ndims.append(ndim - num_labels)
+    broadcast_labels = ''.join(free[:max(ellipsis_ndims)])
+    input_labels = [term.replace('...', broadcast_labels[len(broadcast_labels) - n:])
+                    for term, n in zip(terms, ellipsis_ndims)]
+    if arrow:
+        output_labels = output.replace('...', broadcast_labels)
+    else:
+        labels = ''.join(terms).replace('...', '')
+        output_labels = broadcast_labels + ''.join(sorted(c for c in set(labels) if labels.count(c) == 1))
+    return input_labels, output_labels
+
+
+def einsum(subscripts: str, *operands: Tensor) -> Tensor:
+    """Einstein summation over tensors, e.g. einsum('bij,bjk->bik', q, k).
+
+    Supports ellipses and broadcasting like np.einsum. The contraction order
+    is optimized and cached per subscripts and operand shapes.
+    """
+    input_labels, output_labels = _parse_einsum(subscripts, [t.data.ndim for t in operands])
+    data = kernels.einsum(','.join(input_labels) + '->' + output_labels, *(t.data for t in operands))
+    requires_grad = any(t.requires_grad for t in operands) and is_grad_enabled()
+    if requires_grad:
+        for t, labels in zip(operands, input_labels):
+            if t.requires_grad and len(set(labels)) != len(labels):
+                raise NotImplementedError("einsum backward does not support repeated subscripts "
+                                          f"within an operand, such as {labels}")
+        einsum_bw = EinsumBackward()
+        einsum_bw.set_next_edges(collect_next_edges(*operands, saved=True))
+        einsum_bw.operands = list(operands)
+        einsum_bw.input_labels = input_labels
+        einsum_bw.output_labels = output_labels
+        einsum_bw.needs_input_grad = [t.requires_grad for t in operands]
+        return Tensor(data=data,
+                      requires_grad=True,
+                      grad_fn=einsum_bw)
+    else:
+        return Tensor(data=data)
+
+
 def pow(t1: Tensor, t2: float) -> Tensor:
-    data = t1.data ** t2
-    requires_grad = t1.requires_grad
+    if is_lazy_mode_enabled():
+        return lazy_op('pow', t1, attr=t2)
+    data = np.power(t1.data, t2, out=allocator.elementwise_out(t1.data, t2))
+    requires_grad = t1.requires_grad and is_grad_enabled()
     if requires_grad:
         pow_bw = PowBackward()
         pow_bw.set_next_edges(collect_next_edges(t1))
@@ -198,3 +467,112 @@ def pow(t1: Tensor, t2: float) -> Tensor:
                       grad_fn=pow_bw)
     else:
         return Tensor(data=data)
+
+
+############## loss operator ##################
+
+def cross_entropy(input: Tensor,
+                  target: Union[Tensor, np.ndarray],
+                  weight: Tensor = None,
+                  ignore_index: int = -100,
+                  reduction: str = 'mean',
+                  label_smoothing: float = 0.0,
+                  chunk_size: int = None) -> Tensor:
+    """Fused log-softmax and negative log likelihood of logits (N, C) against
+    integer class targets (N,), computed chunk by chunk over the rows."""
+    if input.data.ndim != 2:
+        raise ValueError(f"input should be of shape (N, C), rather than {input.shape}")
+    if reduction not in ('none', 'mean', 'sum'):
+        raise ValueError("reduction should be one of the 'none,mean,sum', "
+                         f"rather than {reduction}")
+    if not 0.0 <= label_smoothing <= 1.0:
+        raise ValueError(f"label_smoothing should be in [0, 1], rather than {label_smoothing}")
+    target = np.asarray(target.data if isinstance(target, Tensor) else target)
+    if target.shape != input.shape[:1] or target.dtype.kind not in 'iu':
+        raise ValueError(f"target should hold integer class indices of shape {input.shape[:1]}, "
+                         f"rather than {target.dtype} {target.shape}")
+    weight_data = None if weight is None else np.asarray(weight.data if isinstance(weight, Tensor) else weight,
+                                                         dtype=np.result_type(input.data, np.float16))
+    losses, target_weight, lse = kernels.cross_entropy_forward(
+        input.data, target, weight_data, ignore_index, label_smoothing, chunk_size)
+    if reduction == 'none':
+        data = losses
+    elif reduction == 'sum':
+        data = losses.sum()
+    else:
+        data = losses.sum() / target_weight.sum()
+    requires_grad = input.requires_grad and is_grad_enabled()
+    if requires_grad:
+        cross_entropy_bw = CrossEntropyBackward()
+        cross_entropy_bw.set_next_edges(collect_next_edges(input))
+        cross_entropy_bw.input = input
+        cross_entropy_bw.lse = Tensor(data=lse)
+        cross_entropy_bw.target = target
+        cross_entropy_bw.weight = weight_data
+        cross_entropy_bw.ignore_index = ignore_index
+        cross_entropy_bw.label_smoothing = label_smoothing
+        cross_entropy_bw.reduction = reduction
+        cross_entropy_bw.total_weight = target_weight.sum()
+        cross_entropy_bw.chunk_size = chunk_size
+        return Tensor(data=data,
+                      requires_grad=True,
+                      grad_fn=cross_entropy_bw)
+    else:
+        return Tensor(data=data)
+
+
+def linear_cross_entropy(input: Tensor,
+                         weight: Tensor,
+                         bias: Tensor,
+                         target: Union[Tensor, np.ndarray],
+                         ignore_index: int = -100,
+                         reduction: str = 'mean',
+                         label_smoothing: float = 0.0,
+                         chunk_size: int = None) -> Tensor:
+    """Cross entropy of the logits input @ weight.t() + bias against integer
+    class targets (N,), computed over blocks of chunk_size classes so the
+    (N, V) logits are never materialized in forward or backward."""
+    if input.data.ndim != 2 or weight.data.ndim != 2 or input.shape[1] != weight.shape[1]:
+        raise ValueError(f"input (N, D) and weight (V, D) do not match: {input.shape} and {weight.shape}")
+    if bias is not None and bias.shape != weight.shape[:1]:
+        raise ValueError(f"bias should be of shape {weight.shape[:1]}, rather than {bias.shape}")
+    if reduction not in ('none', 'mean', 'sum'):
+        raise ValueError("reduction should be one of the 'none,mean,sum', "
+                         f"rather than {reduction}")
+    if not 0.0 <= label_smoothing <= 1.0:
+        raise ValueError(f"label_smoothing should be in [0, 1], rather than {label_smoothing}")
+    target = np.asarray(target.data if isinstance(target, Tensor) else target)
+    if target.shape != input.shape[:1] or target.dtype.kind not in 'iu':
+        raise ValueError(f"target should hold integer class indices of shape {input.shape[:1]}, "
+                         f"rather than {target.dtype} {target.shape}")
+    bias_data = None if bias is None else bias.data
+    losses, valid, lse = kernels.linear_cross_entropy_forward(
+        input.data, weight.data, bias_data, target, ignore_index, label_smoothing, chunk_size)
+    if reduction == 'none':
+        data = losses
+    elif reduction == 'sum':
+        data = losses.sum()
+    else:
+        data = losses.sum() / valid.sum()
+    tensors = [t for t in (input, weight, bias) if t is not None]
+    requires_grad = any(t.requires_grad for t in tensors) and is_grad_enabled()
+    if requires_grad:
+        linear_cross_entropy_bw = LinearCrossEntropyBackward()
+        linear_cross_entropy_bw.set_next_edges(collect_next_edges(*tensors, saved=True))
+        linear_cross_entropy_bw.input = input
+        linear_cross_entropy_bw.weight = weight
+        linear_cross_entropy_bw.bias = bias
+        linear_cross_entropy_bw.lse = Tensor(data=lse)
+        linear_cross_entropy_bw.target = target
+        linear_cross_entropy_bw.ignore_index = ignore_index
+        linear_cross_entropy_bw.label_smoothing = label_smoothing
+        linear_cross_entropy_bw.reduction = reduction
+        linear_cross_entropy_bw.num_valid = valid.sum()
+        linear_cross_entropy_bw.chunk_size = chunk_size
+        linear_cross_entropy_bw.needs_input_grad = (
+            input.requires_grad, weight.requires_grad, bias is not None and bias.requires_grad)
+        return Tensor(data=data,
+                      requires_grad=True,
+                      grad_fn=linear_cross_entropy_bw)
+    else:
+        return Tensor(data=data)
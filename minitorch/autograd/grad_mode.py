@@ -0,0 +1,93 @@
+"""Thread-local switches deciding whether ops record the autograd graph."""
+
+import functools
+import threading
+from abc import ABCMeta, abstractmethod
+
+
+_state = threading.local()
+
+
+def is_grad_enabled() -> bool:
+    return getattr(_state, "grad_enabled", True)
+
+
+def set_grad_enabled(mode: bool) -> None:
+    _state.grad_enabled = bool(mode)
+
+
+def is_inference_mode_enabled() -> bool:
+    return getattr(_state, "inference_mode", False)
+
+
+class _GradModeContext(metaclass=ABCMeta):
+    """Base class of the grad mode context managers, which can also be used as
+    decorators: ``@no_grad()``."""
+
+    @abstractmethod
+    def __enter__(self):
+        pass
+
+    @abstractmethod
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+    def __call__(self, fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with self.clone():
+                return fn(*args, **kwargs)
+        return wrapper
+
+    def clone(self):
+        return self.__class__()
+
+
+class no_grad(_GradModeContext):
+    """Context manager that disables graph construction.
+
+    Ops run under it return plain tensors: no backward nodes, no edges, no
+    saved activations, and leaf tensors are left untouched.
+    """
+
+    def __enter__(self):
+        self.prev = is_grad_enabled()
+        set_grad_enabled(False)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        set_grad_enabled(self.prev)
+
+
+class enable_grad(_GradModeContext):
+    """Context manager that enables graph construction inside no_grad."""
+
+    def __enter__(self):
+        self.prev = is_grad_enabled()
+        set_grad_enabled(True)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        set_grad_enabled(self.prev)
+
+
+class inference_mode(_GradModeContext):
+    """Stricter no_grad for serving.
+
+    Besides disabling graph construction, every tensor created under it is an
+    inference tensor, which can never be recorded into a graph afterwards.
+    """
+
+    def __init__(self, mode: bool = True):
+        self.mode = mode
+
+    def __enter__(self):
+        self.prev = (is_grad_enabled(), is_inference_mode_enabled())
+        if self.mode:
+            set_grad_enabled(False)
+        _state.inference_mode = self.mode
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        set_grad_enabled(self.prev[0])
+        _state.inference_mode = self.prev[1]
+
+    def clone(self):
+        return self.__class__(self.mode)
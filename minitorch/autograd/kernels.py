@@ -0,0 +1,253 @@
+"""Numerically stable NumPy kernels shared by ops and their backward nodes."""
+
+from functools import lru_cache
+from typing import Tuple
+
+import numpy as np
+
+
+# float16 is a storage format: reductions and products accumulate in float32
+_ACCUMULATE_DTYPES = {np.dtype(np.float16): np.dtype(np.float32)}
+
+
+def accumulate_dtype(dtype: np.dtype) -> np.dtype:
+    return _ACCUMULATE_DTYPES.get(np.dtype(dtype), np.dtype(dtype))
+
+
+def sum(x: np.ndarray, axis=None, keepdims: bool = False) -> np.ndarray:
+    dtype = accumulate_dtype(x.dtype) if x.dtype.kind == 'f' else None
+    return np.asarray(np.sum(x, axis=axis, dtype=dtype, keepdims=keepdims)).astype(x.dtype, copy=False)
+
+
+def mean(x: np.ndarray, axis=None, keepdims: bool = False) -> np.ndarray:
+    if x.dtype.kind != 'f':
+        return np.asarray(np.mean(x, axis=axis, keepdims=keepdims))
+    dtype = accumulate_dtype(x.dtype)
+    return np.asarray(np.mean(x, axis=axis, dtype=dtype, keepdims=keepdims)).astype(x.dtype, copy=False)
+
+
+def matmul(a: np.ndarray, b: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    dtype = np.result_type(a, b)
+    compute_dtype = accumulate_dtype(dtype)
+    if compute_dtype == dtype:
+        return np.matmul(a, b, out=out)
+    return np.matmul(a.astype(compute_dtype), b.astype(compute_dtype)).astype(dtype)
+
+
+def sigmoid(x: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    if out is None:
+        out = np.empty(np.shape(x), dtype=np.result_type(x, np.float16))
+    # exp(-x) overflows to inf for very negative x, and 1 / (1 + inf) = 0 is
+    # the correctly rounded result, so the overflow is harmless
+    with np.errstate(over='ignore'):
+        np.negative(x, out=out)
+        np.exp(out, out=out)
+    np.add(out, 1, out=out)
+    np.reciprocal(out, out=out)
+    return out
+
+
+def logsumexp(x: np.ndarray, axis: int = -1, keepdims: bool = False) -> np.ndarray:
+    x_max = np.max(x, axis=axis, keepdims=True)
+    x_max[~np.isfinite(x_max)] = 0
+    shifted = np.subtract(x, x_max)
+    np.exp(shifted, out=shifted)
+    result = np.log(np.sum(shifted, axis=axis, keepdims=True)) + x_max
+    return result if keepdims else np.squeeze(result, axis=axis)
+
+
+def log_softmax(x: np.ndarray, axis: int = -1) -> np.ndarray:
+    return x - logsumexp(x, axis=axis, keepdims=True)
+
+
+def softmax(x: np.ndarray, axis: int = -1) -> np.ndarray:
+    e = np.exp(x - np.max(x, axis=axis, keepdims=True))
+    e /= np.sum(e, axis=axis, keepdims=True)
+    return e
+
+
+def _chunk_rows(num_classes: int, chunk_size: int = None) -> int:
+    if chunk_size is None:
+        # keep the per-chunk temporaries around one million elements
+        chunk_size = (1 << 20) // max(num_classes, 1)
+    return max(int(chunk_size), 1)
+
+
+def cross_entropy_forward(x: np.ndarray, target: np.ndarray, weight: np.ndarray = None,
+                          ignore_index: int = -100, label_smoothing: float = 0.0,
+                          chunk_size: int = None):
+    """Per-row cross entropy of logits x (N, C) and integer targets (N,).
+
+    The rows are processed in chunks so the only temporary of size C is one
+    chunk of exponentials. Returns the per-row losses (0 for ignored rows),
+    the per-row weights of the targets and the log-sum-exp of every row.
+    """
+    num_rows, num_classes = x.shape
+    valid = target != ignore_index
+    safe_target = np.where(valid, target, 0)
+    rows = np.arange(num_rows)
+    lse = np.empty(num_rows, dtype=np.result_type(x, np.float16))
+    chunk = _chunk_rows(num_classes, chunk_size)
+    buffer = np.empty((min(chunk, num_rows), num_classes), dtype=lse.dtype)
+    for start in range(0, num_rows, chunk):
+        end = min(start + chunk, num_rows)
+        x_chunk = x[start:end]
+        x_max = x_chunk.max(axis=1, keepdims=True)
+        shifted = buffer[:end - start]
+        np.subtract(x_chunk, x_max, out=shifted)
+        np.exp(shifted, out=shifted)
+        lse[start:end] = np.log(shifted.sum(axis=1)) + x_max[:, 0]
+    target_weight = valid.astype(lse.dtype) if weight is None else np.where(valid, weight[safe_target], 0)
+    losses = (lse - x[rows, safe_target]) * target_weight
+    if label_smoothing > 0:
+        # -sum_c w_c * log_softmax(x)_c = lse * sum(w) - x @ w
+        if weight is None:
+            smooth = lse * num_classes - x.sum(axis=1)
+        else:
+            smooth = lse * weight.sum() - x @ weight
+        losses *= 1 - label_smoothing
+        losses += np.where(valid, smooth, 0) * (label_smoothing / num_classes)
+    return losses, target_weight, lse
+
+
+def cross_entropy_backward(x: np.ndarray, target: np.ndarray, lse: np.ndarray, row_grad: np.ndarray,
+                           weight: np.ndarray = None, ignore_index: int = -100,
+                           label_smoothing: float = 0.0, chunk_size: int = None) -> np.ndarray:
+    """Gradient of sum_i row_grad_i * loss_i w.r.t. the logits, written chunk
+    by chunk straight into the result without a one-hot matrix:
+
+        (1 - eps) * w_y * (softmax(x) - onehot(y)) + eps / C * (softmax(x) * sum(w) - w)
+    """
+    num_rows, num_classes = x.shape
+    valid = target != ignore_index
+    safe_target = np.where(valid, target, 0)
+    row_grad = np.where(valid, row_grad, 0).astype(lse.dtype)
+    target_weight = 1.0 if weight is None else weight[safe_target]
+    total_weight = num_classes if weight is None else weight.sum()
+    nll_scale = row_grad * (1 - label_smoothing) * target_weight
+    softmax_scale = nll_scale + row_grad * (label_smoothing * total_weight / num_classes)
+    grad = np.empty(x.shape, dtype=lse.dtype)
+    chunk = _chunk_rows(num_classes, chunk_size)
+    for start in range(0, num_rows, chunk):
+        end = min(start + chunk, num_rows)
+        grad_chunk = grad[start:end]
+        np.subtract(x[start:end], lse[start:end, None], out=grad_chunk)
+        np.exp(grad_chunk, out=grad_chunk)
+        grad_chunk *= softmax_scale[start:end, None]
+        if label_smoothing > 0:
+            smooth = row_grad[start:end, None] * (label_smoothing / num_classes)
+            grad_chunk -= smooth if weight is None else smooth * weight
+    grad[np.arange(num_rows), safe_target] -= nll_scale
+    return grad
+
+
+def _chunk_columns(num_rows: int, chunk_size: int = None) -> int:
+    if chunk_size is None:
+        # keep each (rows, chunk) block of logits around one million elements
+        chunk_size = (1 << 20) // max(num_rows, 1)
+    return max(int(chunk_size), 1)
+
+
+def linear_cross_entropy_forward(x: np.ndarray, weight: np.ndarray, bias: np.ndarray, target: np.ndarray,
+                                 ignore_index: int = -100, label_smoothing: float = 0.0,
+                                 chunk_size: int = None):
+    """Per-row cross entropy of the logits x @ weight.T + bias (N, V) against
+    integer targets (N,), without ever holding more than one block of
+    chunk_size logit columns.
+
+    The log-sum-exp is accumulated online: every block rescales the running
+    sum to the new running maximum. Returns the per-row losses (0 for ignored
+    rows), the mask of valid rows and the log-sum-exp of every row.
+    """
+    num_rows = x.shape[0]
+    num_classes = weight.shape[0]
+    dtype = np.result_type(x, weight, np.float16)
+    valid = target != ignore_index
+    safe_target = np.where(valid, target, 0)
+    running_max = np.full(num_rows, -np.inf, dtype=dtype)
+    running_sum = np.zeros(num_rows, dtype=dtype)
+    chunk = _chunk_columns(num_rows, chunk_size)
+    for start in range(0, num_classes, chunk):
+        end = min(start + chunk, num_classes)
+        logits = x @ weight[start:end].T
+        if bias is not None:
+            logits += bias[start:end]
+        new_max = np.maximum(running_max, logits.max(axis=1))
+        running_sum *= np.exp(running_max - new_max)
+        logits -= new_max[:, None]
+        np.exp(logits, out=logits)
+        running_sum += logits.sum(axis=1)
+        running_max = new_max
+    lse = np.log(running_sum) + running_max
+    target_logit = np.einsum('nd,nd->n', x, weight[safe_target])
+    if bias is not None:
+        target_logit += bias[safe_target]
+    losses = lse - target_logit
+    if label_smoothing > 0:
+        # -mean_c log_softmax(z)_c = lse - mean_c z_c, and sum_c z_c is linear in x
+        logit_sum = x @ weight.sum(axis=0)
+        if bias is not None:
+            logit_sum += bias.sum()
+        losses *= 1 - label_smoothing
+        losses += (lse - logit_sum / num_classes) * label_smoothing
+    losses[~valid] = 0
+    return losses, valid, lse
+
+
+def linear_cross_entropy_backward(x: np.ndarray, weight: np.ndarray, bias: np.ndarray, target: np.ndarray,
+                                  lse: np.ndarray, row_grad: np.ndarray, ignore_index: int = -100,
+                                  label_smoothing: float = 0.0, chunk_size: int = None,
+                                  needs_input_grad: tuple = (True, True, True)):
+    """Gradients of sum_i row_grad_i * loss_i w.r.t. x, weight and bias.
+
+    The logits of every block are recomputed from x and weight and turned into
+    their gradient row_grad * (softmax - (1 - eps) * onehot - eps / V) in
+    place, which is then contracted with x and weight right away. Gradients
+    that are not needed are returned as None.
+    """
+    num_rows = x.shape[0]
+    num_classes = weight.shape[0]
+    dtype = np.result_type(x, weight, np.float16)
+    valid = target != ignore_index
+    row_grad = np.where(valid, row_grad, 0).astype(dtype)
+    nll_scale = row_grad * (1 - label_smoothing)
+    smooth = (row_grad * (label_smoothing / num_classes))[:, None]
+    grad_x = np.zeros(x.shape, dtype=dtype) if needs_input_grad[0] else None
+    grad_weight = np.empty(weight.shape, dtype=dtype) if needs_input_grad[1] else None
+    grad_bias = np.empty(num_classes, dtype=dtype) if needs_input_grad[2] and bias is not None else None
+    rows = np.flatnonzero(valid)
+    chunk = _chunk_columns(num_rows, chunk_size)
+    for start in range(0, num_classes, chunk):
+        end = min(start + chunk, num_classes)
+        logits = x @ weight[start:end].T
+        if bias is not None:
+            logits += bias[start:end]
+        logits -= lse[:, None]
+        np.exp(logits, out=logits)
+        logits *= row_grad[:, None]
+        if label_smoothing > 0:
+            logits -= smooth
+        in_chunk = rows[(target[rows] >= start) & (target[rows] < end)]
+        logits[in_chunk, target[in_chunk] - start] -= nll_scale[in_chunk]
+        if grad_x is not None:
+            grad_x += logits @ weight[start:end]
+        if grad_weight is not None:
+            np.matmul(logits.T, x, out=grad_weight[start:end])
+        if grad_bias is not None:
+            logits.sum(axis=0, out=grad_bias[start:end])
+    return grad_x, grad_weight, grad_bias
+
+
+@lru_cache(maxsize=256)
+def _einsum_path(subscripts: str, shapes: Tuple[tuple, ...]) -> list:
+    # einsum_path only looks at the shapes, so zero-strided dummies stand in
+    # for the operands
+    dummies = [np.broadcast_to(np.empty((), dtype=np.float32), shape) for shape in shapes]
+    return np.einsum_path(subscripts, *dummies, optimize=True)[0]
+
+
+def einsum(subscripts: str, *operands: np.ndarray) -> np.ndarray:
+    """np.einsum with its contraction order searched once per subscripts and
+    operand shapes."""
+    path = _einsum_path(subscripts, tuple(np.shape(x) for x in operands))
+    return np.einsum(subscripts, *operands, optimize=path)
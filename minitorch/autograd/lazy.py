@@ -0,0 +1,379 @@
+"""Lazy evaluation and fusion of elementwise ops.
+
+Under ``lazy_mode()`` the elementwise ops of ``functional`` do not compute
+anything. They return a LazyTensor holding a small expression DAG over
+concrete input tensors. The DAG is materialised when its data or grad_fn is
+needed, i.e. by a non-elementwise op, by ``.data`` access or by backward.
+It is then evaluated in one pass: a single numexpr kernel when numexpr is
+installed, otherwise NumPy ufuncs writing into recycled ``out=`` buffers.
+
+A materialised expression gets one FusedBackward node instead of one node
+per op. Its backward is generated symbolically from the DAG and evaluated in
+the same fused way, recomputing the forward intermediates it needs, so only
+the inputs of the expression are saved.
+"""
+
+import threading
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from minitorch import Tensor
+from . import kernels
+from .grad_mode import _GradModeContext, is_grad_enabled, is_inference_mode_enabled
+from .node import Node, collect_next_edges
+
+try:
+    import numexpr
+except ImportError:
+    numexpr = None
+
+
+# expressions are materialised once they grow beyond this many nodes
+MAX_FUSED_NODES = 64
+# numexpr only pays off for arrays of at least this many elements
+NUMEXPR_MIN_SIZE = 4096
+
+_state = threading.local()
+
+
+def is_lazy_mode_enabled() -> bool:
+    return getattr(_state, "lazy_mode", False)
+
+
+class lazy_mode(_GradModeContext):
+    """Context manager that makes elementwise ops build fused expressions."""
+
+    def __enter__(self):
+        self.prev = is_lazy_mode_enabled()
+        _state.lazy_mode = True
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _state.lazy_mode = self.prev
+
+
+def _broadcast_shape(shape1: tuple, shape2: tuple) -> tuple:
+    ndim = max(len(shape1), len(shape2))
+    shape1 = (1,) * (ndim - len(shape1)) + tuple(shape1)
+    shape2 = (1,) * (ndim - len(shape2)) + tuple(shape2)
+    shape = []
+    for dim1, dim2 in zip(shape1, shape2):
+        if dim1 != dim2 and dim1 != 1 and dim2 != 1:
+            raise ValueError(f"operands could not be broadcast together with shapes {shape1} {shape2}")
+        shape.append(dim1 if dim2 == 1 else dim2)
+    return tuple(shape)
+
+
+class Expr:
+    """A node of an expression DAG.
+
+    `input` nodes wrap a concrete tensor, every other node applies `op` to its
+    `args`. `attr` holds the scalar operand of `pow` and `scale`.
+    """
+    __slots__ = ('op', 'args', 'attr', 'tensor', 'shape', 'dtype', 'size', 'requires_grad')
+
+    def __init__(self, op: str, args: tuple = (), attr: float = None, tensor: Tensor = None):
+        self.op = op
+        self.args = args
+        self.attr = attr
+        self.tensor = tensor
+        if tensor is not None:
+            self.shape = tensor.shape
+            self.dtype = tensor.data.dtype
+            self.size = 1
+            self.requires_grad = tensor.requires_grad
+            return
+        shape = args[0].shape
+        for arg in args[1:]:
+            shape = _broadcast_shape(shape, arg.shape)
+        self.shape = shape
+        dtypes = [arg.dtype for arg in args]
+        if op in ('div', 'exp', 'sigmoid', 'tanh'):
+            dtypes.append(np.float16)
+        if op == 'pow':
+            dtypes.append(np.result_type(args[0].dtype, attr))
+        self.dtype = np.result_type(*dtypes)
+        self.size = 1 + sum(arg.size for arg in args)
+        self.requires_grad = any(arg.requires_grad for arg in args)
+
+
+def _topological_sort(outputs: List[Expr]) -> List[Expr]:
+    order = []
+    visited = set()
+    for output in outputs:
+        stack = [(output, False)]
+        while stack:
+            expr, expanded = stack.pop()
+            if id(expr) in visited:
+                continue
+            if expanded or expr.op == 'input':
+                visited.add(id(expr))
+                order.append(expr)
+                continue
+            stack.append((expr, True))
+            for arg in reversed(expr.args):
+                if id(arg) not in visited:
+                    stack.append((arg, False))
+    return order
+
+
+############## evaluation ##################
+
+_NUMPY_KERNELS = {
+    'add': lambda a, b, out: np.add(a, b, out=out),
+    'sub': lambda a, b, out: np.subtract(a, b, out=out),
+    'mul': lambda a, b, out: np.multiply(a, b, out=out),
+    'div': lambda a, b, out: np.true_divide(a, b, out=out),
+    'neg': lambda a, out: np.negative(a, out=out),
+    'exp': lambda a, out: np.exp(a, out=out),
+    'relu': lambda a, out: np.maximum(a, 0, out=out),
+    'relu_grad': lambda g, a, out: np.multiply(g, a >= 0, out=out),
+    'sigmoid': lambda a, out: kernels.sigmoid(a, out=out),
+    'sigmoid_grad': lambda g, y, out: np.multiply(g, y * (1 - y), out=out),
+    'tanh': lambda a, out: np.tanh(a, out=out),
+    'tanh_grad': lambda g, y, out: np.multiply(g, 1 - y * y, out=out),
+}
+
+_NUMEXPR_TEMPLATES = {
+    'add': '({} + {})',
+    'sub': '({} - {})',
+    'mul': '({} * {})',
+    'div': '({} / {})',
+    'neg': '(-{})',
+    'exp': 'exp({})',
+    'relu': 'where({0} > 0, {0}, 0)',
+    'relu_grad': 'where({1} >= 0, {0}, 0)',
+    # exp overflowing to inf still gives the right limit here
+    'sigmoid': '(1 / (1 + exp(-{})))',
+    'sigmoid_grad': '({0} * {1} * (1 - {1}))',
+    'tanh': 'tanh({})',
+    'tanh_grad': '({0} * (1 - {1} * {1}))',
+}
+
+_NUMEXPR_DTYPES = (np.dtype(np.bool_), np.dtype(np.int32), np.dtype(np.int64),
+                   np.dtype(np.float32), np.dtype(np.float64))
+
+
+def _evaluate_numpy(outputs: List[Expr]) -> List[np.ndarray]:
+    order = _topological_sort(outputs)
+    consumers: Dict[int, int] = {}
+    for expr in order:
+        for arg in expr.args:
+            consumers[id(arg)] = consumers.get(id(arg), 0) + 1
+    for output in outputs:
+        # results handed back to the caller are never recycled
+        consumers[id(output)] = consumers.get(id(output), 0) + len(order)
+    values: Dict[int, np.ndarray] = {}
+    free_buffers: Dict[Tuple[tuple, np.dtype], List[np.ndarray]] = {}
+    for expr in order:
+        if expr.op == 'input':
+            values[id(expr)] = expr.tensor.data
+            continue
+        buffers = free_buffers.get((expr.shape, expr.dtype))
+        out = buffers.pop() if buffers else None
+        args = [values[id(arg)] for arg in expr.args]
+        if expr.op == 'pow':
+            value = np.power(args[0], expr.attr, out=out)
+        elif expr.op == 'scale':
+            value = np.multiply(args[0], expr.attr, out=out)
+        else:
+            value = _NUMPY_KERNELS[expr.op](*args, out=out)
+        values[id(expr)] = value
+        for arg in expr.args:
+            consumers[id(arg)] -= 1
+            if consumers[id(arg)] == 0 and arg.op != 'input':
+                buffer = values.pop(id(arg))
+                if buffer.ndim:
+                    free_buffers.setdefault((arg.shape, arg.dtype), []).append(buffer)
+    return [values[id(output)] for output in outputs]
+
+
+def _evaluate_numexpr(output: Expr) -> np.ndarray:
+    names: Dict[int, str] = {}
+    local_dict: Dict[str, np.ndarray] = {}
+    strings: Dict[int, str] = {}
+    for expr in _topological_sort([output]):
+        if expr.op == 'input':
+            name = names.setdefault(id(expr.tensor), f"v{len(names)}")
+            local_dict[name] = expr.tensor.data
+            strings[id(expr)] = name
+        elif expr.op == 'pow':
+            strings[id(expr)] = f"({strings[id(expr.args[0])]} ** {float(expr.attr)!r})"
+        elif expr.op == 'scale':
+            strings[id(expr)] = f"({strings[id(expr.args[0])]} * {float(expr.attr)!r})"
+        else:
+            args = [strings[id(arg)] for arg in expr.args]
+            strings[id(expr)] = _NUMEXPR_TEMPLATES[expr.op].format(*args)
+    value = numexpr.evaluate(strings[id(output)], local_dict=local_dict)
+    return value.astype(output.dtype, copy=False)
+
+
+def _numexpr_supports(outputs: List[Expr]) -> bool:
+    if min(int(np.prod(output.shape)) for output in outputs) < NUMEXPR_MIN_SIZE:
+        return False
+    # numexpr has no half precision and no unsigned or small integer types
+    return all(expr.dtype in _NUMEXPR_DTYPES for expr in _topological_sort(outputs))
+
+
+def evaluate(outputs: List[Expr]) -> List[np.ndarray]:
+    if numexpr is not None and _numexpr_supports(outputs):
+        return [_evaluate_numexpr(output) for output in outputs]
+    return _evaluate_numpy(outputs)
+
+
+############## autograd ##################
+
+def _accumulate(grads: Dict[int, Expr], expr: Expr, grad: Expr) -> None:
+    if not expr.requires_grad:
+        return
+    previous = grads.get(id(expr))
+    grads[id(expr)] = grad if previous is None else Expr('add', (previous, grad))
+
+
+def _unbroadcast(data: np.ndarray, shape: tuple) -> np.ndarray:
+    if data.shape == shape:
+        return data
+    ndims_added = data.ndim - len(shape)
+    axes = tuple(range(ndims_added))
+    axes += tuple(ndims_added + i for i, dim in enumerate(shape) if dim == 1 and data.shape[ndims_added + i] != 1)
+    return data.sum(axis=axes, keepdims=True).reshape(shape)
+
+
+def gradient_exprs(output: Expr, grad_output: Expr) -> List[Tuple[Tensor, Expr]]:
+    """Build the expressions of the gradients of output w.r.t. its inputs that
+    require grad, one per distinct input tensor."""
+    grads = {id(output): grad_output}
+    leaves = {}
+    for expr in reversed(_topological_sort([output])):
+        grad = grads.pop(id(expr), None)
+        if grad is None:
+            continue
+        if expr.op == 'input':
+            previous = leaves.get(id(expr.tensor))
+            leaves[id(expr.tensor)] = (expr.tensor, grad if previous is None else Expr('add', (previous[1], grad)))
+            continue
+        a = expr.args[0]
+        b = expr.args[1] if len(expr.args) > 1 else None
+        if expr.op == 'add':
+            _accumulate(grads, a, grad)
+            _accumulate(grads, b, grad)
+        elif expr.op == 'sub':
+            _accumulate(grads, a, grad)
+            _accumulate(grads, b, Expr('neg', (grad,)))
+        elif expr.op == 'mul':
+            _accumulate(grads, a, Expr('mul', (grad, b)))
+            _accumulate(grads, b, Expr('mul', (grad, a)))
+        elif expr.op == 'div':
+            _accumulate(grads, a, Expr('div', (grad, b)))
+            _accumulate(grads, b, Expr('neg', (Expr('div', (Expr('mul', (grad, expr)), b)),)))
+        elif expr.op == 'neg':
+            _accumulate(grads, a, Expr('neg', (grad,)))
+        elif expr.op == 'exp':
+            _accumulate(grads, a, Expr('mul', (grad, expr)))
+        elif expr.op == 'pow':
+            derivative = Expr('scale', (Expr('pow', (a,), attr=expr.attr - 1),), attr=expr.attr)
+            _accumulate(grads, a, Expr('mul', (grad, derivative)))
+        elif expr.op == 'relu':
+            _accumulate(grads, a, Expr('relu_grad', (grad, a)))
+        elif expr.op == 'sigmoid':
+            _accumulate(grads, a, Expr('sigmoid_grad', (grad, expr)))
+        elif expr.op == 'tanh':
+            _accumulate(grads, a, Expr('tanh_grad', (grad, expr)))
+        else:
+            raise RuntimeError(f"no derivative for lazy op {expr.op}")
+    return list(leaves.values())
+
+
+class FusedBackward(Node):
+    saved_attrs = ('expr', 'inputs')
+
+    def __init__(self):
+        self.expr: Expr = None
+        self.inputs: List[Tensor] = None
+
+    def saved_tensors(self) -> List[Tensor]:
+        if self.expr is None:
+            return []
+        return [expr.tensor for expr in _topological_sort([self.expr]) if expr.op == 'input']
+
+    def apply(self, grad_output: Tensor) -> list:
+        grad_expr = Expr('input', tensor=grad_output)
+        grads = dict((id(t), g) for t, g in gradient_exprs(self.expr, grad_expr))
+        exprs = [grads[id(t)] for t in self.inputs]
+        values = evaluate(exprs)
+        return [Tensor(data=_unbroadcast(value, t.shape)) for value, t in zip(values, self.inputs)]
+
+
+class LazyTensor(Tensor):
+    """A tensor whose data is an unevaluated elementwise expression."""
+
+    def __init__(self, expr: Expr, requires_grad: bool = False):
+        self._data = None
+        self.expr = expr
+        self.requires_grad = requires_grad
+        self.grad = None
+        self._grad_fn = None
+        self.is_inference = is_inference_mode_enabled()
+
+    @property
+    def data(self) -> np.ndarray:
+        if self._data is None:
+            self._materialize()
+        return self._data
+
+    @data.setter
+    def data(self, value) -> None:
+        self._data = None if value is None else np.asarray(value)
+
+    @property
+    def grad_fn(self):
+        if self._data is None:
+            self._materialize()
+        return self._grad_fn
+
+    @grad_fn.setter
+    def grad_fn(self, value) -> None:
+        self._grad_fn = value
+
+    @property
+    def shape(self):
+        if self._data is None:
+            return self.expr.shape
+        return self._data.shape
+
+    @property
+    def dtype(self) -> np.dtype:
+        if self._data is None:
+            return self.expr.dtype
+        return self._data.dtype
+
+    def _materialize(self) -> None:
+        expr = self.expr
+        self._data = evaluate([expr])[0]
+        self.expr = None
+        if self.requires_grad:
+            inputs = []
+            seen = set()
+            for leaf in _topological_sort([expr]):
+                if leaf.op == 'input' and leaf.requires_grad and id(leaf.tensor) not in seen:
+                    seen.add(id(leaf.tensor))
+                    inputs.append(leaf.tensor)
+            fused_bw = FusedBackward()
+            fused_bw.set_next_edges(collect_next_edges(*inputs))
+            fused_bw.expr = expr
+            fused_bw.inputs = inputs
+            self._grad_fn = fused_bw
+
+
+def _as_expr(t: Tensor) -> Expr:
+    if isinstance(t, LazyTensor) and t.expr is not None:
+        if t.expr.size < MAX_FUSED_NODES:
+            return t.expr
+        t._materialize()
+    return Expr('input', tensor=t)
+
+
+def lazy_op(op: str, *tensors: Tensor, attr: float = None) -> LazyTensor:
+    expr = Expr(op, tuple(_as_expr(t) for t in tensors), attr=attr)
+    requires_grad = expr.requires_grad and is_grad_enabled()
+    return LazyTensor(expr, requires_grad=requires_grad)
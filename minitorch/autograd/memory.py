@@ -0,0 +1,22 @@
+from collections import OrderedDict
+from typing import Dict
+
+from minitorch import Tensor
+from .engine import collect_graph
+
+
+def saved_tensors_report(tensor: Tensor) -> Dict[str, int]:
+    """Bytes of saved tensors held by the graph of tensor, per node type.
+
+    An array saved by several nodes of the same type is counted once for that
+    type. The result is sorted with the largest holder first.
+    """
+    if tensor.grad_fn is None:
+        return OrderedDict()
+    seen = {}
+    for node in collect_graph(tensor.grad_fn)[0]:
+        arrays = seen.setdefault(type(node).__name__, {})
+        for saved in node.saved_tensors():
+            arrays[id(saved.data)] = saved.data.nbytes
+    report = [(name, sum(arrays.values())) for name, arrays in seen.items()]
+    return OrderedDict(sorted(report, key=lambda item: item[1], reverse=True))
@@ -1,17 +1,27 @@
+import math
 from abc import ABCMeta, abstractmethod
 
 import numpy as np
-from typing import List
+from typing import List, Tuple
 
 from minitorch import Tensor
+from . import allocator, kernels
 from .edge import Edge
 
 
-def collect_next_edges(*tensors) -> List[Edge]:
+def collect_next_edges(*tensors, saved: bool = False) -> List[Edge]:
+    """Edges to the tensors requiring grad. saved tells that the node keeps
+    every tensor for backward, which inference tensors do not allow."""
     next_edges = []
     for t in tensors:
         if not t.requires_grad:
+            if saved and t.is_inference:
+                raise RuntimeError("Inference tensors cannot be saved for backward. "
+                                   "Create them outside of inference_mode to use them in autograd.")
             continue
+        if t.is_inference:
+            raise RuntimeError("Inference tensors do not track gradients. "
+                               "Create them outside of inference_mode to use them in autograd.")
         if t.grad_fn is None:
             t.grad_fn = AccumulateGrad(t)
             next_edges.append(Edge(t.grad_fn))
@@ -31,25 +41,43 @@ def unbroadcast(grad_input: Tensor, input_shape: tuple) -> Tensor:
     """
     if grad_input.shape == input_shape:
         return grad_input
-    data = grad_input.data
     ndims_added = len(grad_input.shape) - len(input_shape)
-    for _ in range(ndims_added):
-        data = data.sum(axis=0)
-    for i, dim in enumerate(input_shape):
-        if dim == 1:
-            data = data.sum(axis=i, keepdims=True)
-
+    axes = tuple(range(ndims_added)) + tuple(ndims_added + i for i, dim in enumerate(input_shape) if dim == 1)
+    # one pass over the gradient, the leading dimensions are dropped by a view
+    data = grad_input.data.sum(axis=axes, keepdims=True).reshape(input_shape)
     return Tensor(data=data)
 
 
 class Node(metaclass=ABCMeta):
+    # names of the attributes holding tensors saved for backward
+    saved_attrs: Tuple[str, ...] = ()
+    released = False
 
     def __call__(self, *grad_outputs):
+        if self.released:
+            raise RuntimeError("Trying to backward through the graph a second time, but the saved "
+                               "tensors have already been freed. Specify retain_graph=True when "
+                               "calling backward the first time.")
         return self.apply(*grad_outputs)
 
     def set_next_edges(self, next_edges: List[Edge] = None):
         self.next_edges = next_edges
 
+    def release_saved_tensors(self) -> None:
+        if not self.saved_attrs:
+            return
+        for name in self.saved_attrs:
+            setattr(self, name, None)
+        self.released = True
+
+    def saved_tensors(self) -> List[Tensor]:
+        tensors = []
+        for name in self.saved_attrs:
+            value = getattr(self, name)
+            if isinstance(value, Tensor):
+                tensors.append(value)
+        return tensors
+
     @abstractmethod
     def apply(self, *grad_outputs):
         """You must implement the abstract method for custome Node"""
@@ -62,10 +90,22 @@ class AccumulateGrad(Node):
         self.leaf_tensor = leaf_tensor
 
     def apply(self, grad_output: Tensor):
+        # the incoming gradient may be shared with other nodes, so the leaf
+        # keeps its own copy and later passes accumulate into it in place
         if self.leaf_tensor.grad is None:
-            self.leaf_tensor.grad = grad_output
+            # a flattened parameter keeps its slot in the flat gradient buffer
+            buffer = getattr(self.leaf_tensor, '_grad_buffer', None)
+            if buffer is not None and buffer.shape == self.leaf_tensor.shape:
+                np.copyto(buffer, grad_output.data, casting='same_kind')
+                self.leaf_tensor.grad = Tensor(data=buffer)
+            else:
+                grad = allocator.empty(self.leaf_tensor.shape, self.leaf_tensor.dtype)
+                np.copyto(grad, grad_output.data, casting='unsafe')
+                self.leaf_tensor.grad = Tensor(data=grad)
         else:
             self.leaf_tensor.grad += grad_output
+        for hook in getattr(self.leaf_tensor, '_post_accumulate_grad_hooks', ()):
+            hook(self.leaf_tensor)
         return None
 
 
@@ -78,14 +118,9 @@ class SumBackward(Node):
         self.shape: tuple = None
 
     def apply(self, grad_output: Tensor) -> tuple:
-        if isinstance(self.axis, int):
-            self.axis = [self.axis]
-        if self.axis is None:
-            shape = [1] * len(self.shape)
-        else:
-            shape = [1 if i in self.axis else self.shape[i] for i in range(len(self.shape))]
-        data = grad_output.data.reshape(shape) + np.zeros(self.shape)
-        return Tensor(data=data),
+        # a read-only view: consumers never write into the gradients they get
+        data = grad_output.data.reshape(_keepdims_shape(self.shape, self.axis))
+        return Tensor(data=np.broadcast_to(data, self.shape)),
 
 
 class MeanBackward(Node):
@@ -95,15 +130,17 @@ class MeanBackward(Node):
         self.shape: tuple = None
 
     def apply(self, grad_output: Tensor) -> tuple:
-        if isinstance(self.axis, int):
-            self.axis = [self.axis]
-        if self.axis is None:
-            shape = [1] * len(self.shape)
-        else:
-            shape = [1 if i in self.axis else self.shape[i] for i in range(len(self.shape))]
-        scale = np.prod(grad_output.shape) / np.prod(self.shape)
-        data = scale * grad_output.data.reshape(shape) + np.zeros(self.shape)
-        return Tensor(data=data),
+        scale = grad_output.data.size / max(math.prod(self.shape), 1)
+        data = np.multiply(grad_output.data, scale).reshape(_keepdims_shape(self.shape, self.axis))
+        return Tensor(data=np.broadcast_to(data, self.shape)),
+
+
+def _keepdims_shape(shape: tuple, axis) -> tuple:
+    """Shape of the reduction of shape over axis with keepdims=True."""
+    if axis is None:
+        return (1,) * len(shape)
+    axes = {a % len(shape) for a in (axis if isinstance(axis, (tuple, list)) else (axis,))}
+    return tuple(1 if i in axes else size for i, size in enumerate(shape))
 
 
 ############## unary operator ##################
@@ -121,7 +158,17 @@ class TBackward(Node):
         return Tensor(data=grad_output.data.T),
 
 
+class AstypeBackward(Node):
+
+    def __init__(self):
+        self.dtype: np.dtype = None
+
+    def apply(self, grad_output: Tensor) -> tuple:
+        return Tensor(data=grad_output.data.astype(self.dtype, copy=False)),
+
+
 class ReluBackward(Node):
+    saved_attrs = ('input',)
 
     def __init__(self):
         self.input: Tensor = None
@@ -131,6 +178,7 @@ class ReluBackward(Node):
 
 
 class ExpBackward(Node):
+    saved_attrs = ('output',)
 
     def __init__(self):
         self.output: Tensor = None
@@ -138,6 +186,116 @@ class ExpBackward(Node):
     def apply(self, grad_output: Tensor) -> list:
         return grad_output * self.output,
 
+############## view operator ##################
+
+class IndexBackward(Node):
+
+    def __init__(self):
+        self.index: tuple = None
+        self.shape: tuple = None
+        self.accumulate: bool = False
+
+    def apply(self, grad_output: Tensor) -> tuple:
+        grad = grad_output.data
+        index = self.index
+        if self.accumulate and len(index) == 1 and index[0].ndim == 1 and grad.dtype.kind == 'f':
+            # gathering rows: sum the repeated rows with a single bincount over
+            # flat positions instead of the unbuffered np.add.at loop
+            rows = index[0] % self.shape[0]
+            inner = int(np.prod(self.shape[1:], dtype=np.int64))
+            positions = (rows[:, None] * inner + np.arange(inner)).ravel()
+            data = np.bincount(positions, weights=grad.reshape(-1), minlength=int(np.prod(self.shape)))
+            return Tensor(data=data.reshape(self.shape).astype(grad.dtype, copy=False)),
+        data = np.zeros(self.shape, dtype=grad.dtype)
+        if self.accumulate:
+            np.add.at(data, index, grad)
+        else:
+            data[index] = grad
+        return Tensor(data=data),
+
+
+class ReshapeBackward(Node):
+    """Reshape, view, squeeze and unsqueeze"""
+
+    def __init__(self):
+        self.shape: tuple = None
+
+    def apply(self, grad_output: Tensor) -> tuple:
+        return Tensor(data=grad_output.data.reshape(self.shape)),
+
+
+class PermuteBackward(Node):
+
+    def __init__(self):
+        self.dims: tuple = None
+
+    def apply(self, grad_output: Tensor) -> tuple:
+        return Tensor(data=np.transpose(grad_output.data, np.argsort(self.dims))),
+
+
+class ExpandBackward(Node):
+
+    def __init__(self):
+        self.shape: tuple = None
+
+    def apply(self, grad_output: Tensor) -> tuple:
+        return unbroadcast(grad_output, self.shape),
+
+############## activation operator ##################
+
+class SigmoidBackward(Node):
+    saved_attrs = ('output',)
+
+    def __init__(self):
+        self.output: Tensor = None
+
+    def apply(self, grad_output: Tensor) -> tuple:
+        output = self.output.data
+        grad = np.subtract(1, output, out=allocator.empty(output.shape, output.dtype))
+        grad *= output
+        grad *= grad_output.data
+        return Tensor(data=grad),
+
+
+class TanhBackward(Node):
+    saved_attrs = ('output',)
+
+    def __init__(self):
+        self.output: Tensor = None
+
+    def apply(self, grad_output: Tensor) -> tuple:
+        output = self.output.data
+        grad = np.multiply(output, output, out=allocator.empty(output.shape, output.dtype))
+        np.subtract(1, grad, out=grad)
+        grad *= grad_output.data
+        return Tensor(data=grad),
+
+
+class SoftmaxBackward(Node):
+    saved_attrs = ('output',)
+
+    def __init__(self):
+        self.output: Tensor = None
+        self.axis: int = -1
+
+    def apply(self, grad_output: Tensor) -> tuple:
+        output = self.output.data
+        grad = grad_output.data * output
+        grad -= output * grad.sum(axis=self.axis, keepdims=True)
+        return Tensor(data=grad),
+
+
+class LogSoftmaxBackward(Node):
+    saved_attrs = ('output',)
+
+    def __init__(self):
+        self.output: Tensor = None
+        self.axis: int = -1
+
+    def apply(self, grad_output: Tensor) -> tuple:
+        grad = grad_output.data
+        return Tensor(data=grad - np.exp(self.output.data) * grad.sum(axis=self.axis, keepdims=True)),
+
 ############## binary operator ##################
 
 class AddBackward(Node):
@@ -171,6 +329,7 @@ class SubBackward(Node):
 
 
 class MulBackward(Node):
+    saved_attrs = ('t1', 't2')
 
     def __init__(self):
         self.t1: Tensor = None
@@ -188,6 +347,7 @@ class MulBackward(Node):
 
 
 class DivBackward(Node):
+    saved_attrs = ('t1', 't2')
 
     def __init__(self):
         self.t1: Tensor = None
@@ -205,21 +365,74 @@ class DivBackward(Node):
 
 
 class MatMulBackward(Node):
+    saved_attrs = ('t1', 't2')
 
     def __init__(self):
         self.t1: Tensor = None
+        self.t1_shape: tuple = None
         self.t2: Tensor = None
+        self.t2_shape: tuple = None
 
     def apply(self, grad_output: Tensor) -> list:
+        # vectors take part as a row (t1) or a column (t2) whose axis is
+        # dropped from the result, so restore it on the gradient first
+        grad = grad_output.data
+        if len(self.t2_shape) == 1:
+            grad = np.expand_dims(grad, -1)
+        if len(self.t1_shape) == 1:
+            grad = np.expand_dims(grad, -2)
         grad_input = []
         if self.t2 is not None:
-            grad_input.append(grad_output @ Tensor(self.t2.data.T))
+            t2 = self.t2.data if self.t2.data.ndim > 1 else self.t2.data[:, None]
+            data = kernels.matmul(grad, np.swapaxes(t2, -1, -2))
+            if len(self.t1_shape) == 1:
+                data = data[..., 0, :]
+            grad_input.append(unbroadcast(Tensor(data=data), self.t1_shape))
         if self.t1 is not None:
-            grad_input.append(Tensor(self.t1.data.T) @ grad_output)
+            t1 = self.t1.data if self.t1.data.ndim > 1 else self.t1.data[None, :]
+            data = kernels.matmul(np.swapaxes(t1, -1, -2), grad)
+            if len(self.t2_shape) == 1:
+                data = data[..., 0]
+            grad_input.append(unbroadcast(Tensor(data=data), self.t2_shape))
+        return grad_input
+
+
+class EinsumBackward(Node):
+    saved_attrs = ('operands',)
+
+    def __init__(self):
+        self.operands: List[Tensor] = None
+        self.input_labels: List[str] = None
+        self.output_labels: str = None
+        self.needs_input_grad: List[bool] = None
+
+    def saved_tensors(self) -> List[Tensor]:
+        return list(self.operands) if self.operands is not None else []
+
+    def apply(self, grad_output: Tensor) -> list:
+        grad_input = []
+        for i, labels in enumerate(self.input_labels):
+            if not self.needs_input_grad[i]:
+                continue
+            others = [(l, t.data) for j, (l, t) in enumerate(zip(self.input_labels, self.operands)) if j != i]
+            available = set(self.output_labels).union(*(l for l, _ in others))
+            # labels summed over in this operand alone do not reach the other
+            # terms; the gradient is constant along them
+            kept = ''.join(c for c in labels if c in available)
+            subscripts = ','.join([self.output_labels] + [l for l, _ in others]) + '->' + kept
+            data = kernels.einsum(subscripts, grad_output.data, *(d for _, d in others))
+            shape = self.operands[i].shape
+            for axis, c in enumerate(labels):
+                if c not in available:
+                    data = np.expand_dims(data, axis)
+                elif shape[axis] == 1 and data.shape[axis] != 1:
+                    data = data.sum(axis=axis, keepdims=True)
+            grad_input.append(Tensor(data=np.broadcast_to(data, shape)))
         return grad_input
 
 
 class PowBackward(Node):
+    saved_attrs = ('t1',)
 
     def __init__(self):
         self.t1: Tensor = None
@@ -227,3 +440,58 @@ class PowBackward(Node):
 
     def apply(self, grad_output: Tensor) -> tuple:
         return grad_output * self.t2 * self.t1 ** (self.t2-1),
+
+
+############## loss operator ##################
+
+class CrossEntropyBackward(Node):
+    saved_attrs = ('input', 'lse')
+
+    def __init__(self):
+        self.input: Tensor = None
+        self.lse: Tensor = None
+        self.target: np.ndarray = None
+        self.weight: np.ndarray = None
+        self.ignore_index: int = -100
+        self.label_smoothing: float = 0.0
+        self.reduction: str = 'mean'
+        self.total_weight: float = None
+        self.chunk_size: int = None
+
+    def apply(self, grad_output: Tensor) -> tuple:
+        row_grad = grad_output.data
+        if self.reduction == 'mean':
+            row_grad = row_grad / self.total_weight
+        row_grad = np.broadcast_to(row_grad, self.target.shape)
+        grad = kernels.cross_entropy_backward(
+            self.input.data, self.target, self.lse.data, row_grad, self.weight,
+            self.ignore_index, self.label_smoothing, self.chunk_size)
+        return Tensor(data=grad),
+
+
+class LinearCrossEntropyBackward(Node):
+    saved_attrs = ('input', 'weight', 'bias', 'lse')
+
+    def __init__(self):
+        self.input: Tensor = None
+        self.weight: Tensor = None
+        self.bias: Tensor = None
+        self.lse: Tensor = None
+        self.target: np.ndarray = None
+        self.ignore_index: int = -100
+        self.label_smoothing: float = 0.0
+        self.reduction: str = 'mean'
+        self.num_valid: int = None
+        self.chunk_size: int = None
+        self.needs_input_grad: Tuple[bool, bool, bool] = None
+
+    def apply(self, grad_output: Tensor) -> list:
+        row_grad = grad_output.data
+        if self.reduction == 'mean':
+            row_grad = row_grad / self.num_valid
+        row_grad = np.broadcast_to(row_grad, self.target.shape)
+        grads = kernels.linear_cross_entropy_backward(
+            self.input.data, self.weight.data, None if self.bias is None else self.bias.data,
+            self.target, self.lse.data, row_grad, self.ignore_index, self.label_smoothing,
+            self.chunk_size, self.needs_input_grad)
+        return [Tensor(data=grad) for grad, needed in zip(grads, self.needs_input_grad) if needed]
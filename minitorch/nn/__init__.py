@@ -1,4 +1,6 @@
 from .modules.activation import *
+from .modules.container import *
 from .modules.linear import *
 from .modules.loss import *
 from .modules.module import *
+from . import utils
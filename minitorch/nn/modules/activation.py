@@ -5,9 +5,32 @@ from .module import Module
 
 class Sigmoid(Module):
     def forward(self, input: Tensor) -> Tensor:
-        return 1 / (1 + F.exp(-input))
+        return F.sigmoid(input)
+
+
+class Tanh(Module):
+    def forward(self, input: Tensor) -> Tensor:
+        return F.tanh(input)
 
 
 class ReLU(Module):
     def forward(self, input: Tensor) -> Tensor:
         return F.relu(input)
+
+
+class Softmax(Module):
+    def __init__(self, axis: int = -1) -> None:
+        super().__init__()
+        self.axis = axis
+
+    def forward(self, input: Tensor) -> Tensor:
+        return F.softmax(input, axis=self.axis)
+
+
+class LogSoftmax(Module):
+    def __init__(self, axis: int = -1) -> None:
+        super().__init__()
+        self.axis = axis
+
+    def forward(self, input: Tensor) -> Tensor:
+        return F.log_softmax(input, axis=self.axis)
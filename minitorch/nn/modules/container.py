@@ -0,0 +1,33 @@
+from typing import Iterator, Union
+
+from minitorch import Tensor
+from .module import Module
+
+
+class Sequential(Module):
+    """A sequential container.
+
+    Modules will be added to it in the order they are passed in the constructor.
+    """
+
+    def __init__(self, *modules: Module) -> None:
+        super().__init__()
+        for idx, module in enumerate(modules):
+            self._modules[str(idx)] = module
+
+    def __len__(self) -> int:
+        return len(self._modules)
+
+    def __iter__(self) -> Iterator[Module]:
+        return iter(self._modules.values())
+
+    def __getitem__(self, idx: Union[int, slice]) -> Module:
+        modules = list(self._modules.values())
+        if isinstance(idx, slice):
+            return Sequential(*modules[idx])
+        return modules[idx]
+
+    def forward(self, input: Tensor) -> Tensor:
+        for module in self._modules.values():
+            input = module(input)
+        return input
@@ -6,13 +6,13 @@ from ..parameter import Parameter
 class Linear(Module):
     """Applies a linear transformation to the incoming data: y = xA + b"""
 
-    def __init__(self, in_features: int, out_features: int, bias: bool = True) -> None:
+    def __init__(self, in_features: int, out_features: int, bias: bool = True, dtype=None) -> None:
         super().__init__()
         self.in_features = in_features
         self.out_features = out_features
-        self.weight = Parameter(out_features, in_features)
+        self.weight = Parameter(out_features, in_features, dtype=dtype)
         if bias:
-            self.bias = Parameter(out_features)
+            self.bias = Parameter(out_features, dtype=dtype)
         else:
             self.bias = None
 
@@ -1,5 +1,11 @@
+from typing import Union
+
+import numpy as np
+
 from minitorch import Tensor
+import minitorch.autograd.functional as F
 from .module import Module
+from ..parameter import Parameter
 
 
 class MSELoss(Module):
@@ -8,6 +14,7 @@ class MSELoss(Module):
     """
 
     def __init__(self, reduction: str = 'mean'):
+        super().__init__()
         self.reduction = reduction
 
     def forward(self, input: Tensor, target: Tensor) -> Tensor:
@@ -24,4 +31,82 @@ class MSELoss(Module):
 
 
 class CrossEntropyLoss(Module):
-    pass
+    """This criterion combines log-softmax and negative log likelihood in a single
+    fused op on logits of shape (N, C) and integer class targets of shape (N,).
+
+    Args:
+        weight: manual rescaling weight given to each class, of shape (C,).
+        ignore_index: target value that is ignored and does not contribute to the
+            gradient. The mean is taken over the non-ignored targets.
+        reduction: one of 'none', 'mean' and 'sum'.
+        label_smoothing: amount of smoothing in [0, 1]. The targets become a mix of
+            the original class and a uniform distribution over all classes.
+        chunk_size: number of rows processed at once, bounding the temporaries.
+    """
+
+    def __init__(self,
+                 weight: Tensor = None,
+                 ignore_index: int = -100,
+                 reduction: str = 'mean',
+                 label_smoothing: float = 0.0,
+                 chunk_size: int = None):
+        super().__init__()
+        self.weight = weight
+        self.ignore_index = ignore_index
+        self.reduction = reduction
+        self.label_smoothing = label_smoothing
+        self.chunk_size = chunk_size
+
+    def forward(self, input: Tensor, target: Union[Tensor, np.ndarray]) -> Tensor:
+        return F.cross_entropy(input, target, weight=self.weight, ignore_index=self.ignore_index,
+                               reduction=self.reduction, label_smoothing=self.label_smoothing,
+                               chunk_size=self.chunk_size)
+
+
+class LinearCrossEntropy(Module):
+    """Fuses a final Linear layer (y = x @ weight.t() + bias) with CrossEntropyLoss
+    for large output vocabularies.
+
+    The classes are processed in blocks of chunk_size with an online log-sum-exp,
+    and the backward recomputes each block of logits, so the (N, num_classes)
+    logits never exist at once while the gradients of input, weight and bias
+    stay exact.
+
+    Args:
+        in_features: size of each input sample.
+        num_classes: size of the output vocabulary.
+        bias: whether the linear layer has a bias.
+        ignore_index: target value that is ignored and does not contribute to the
+            gradient. The mean is taken over the non-ignored targets.
+        reduction: one of 'none', 'mean' and 'sum'.
+        label_smoothing: amount of smoothing in [0, 1].
+        chunk_size: number of classes processed at once, bounding the temporaries.
+        dtype: dtype of the parameters, the default dtype if None.
+    """
+
+    def __init__(self,
+                 in_features: int,
+                 num_classes: int,
+                 bias: bool = True,
+                 ignore_index: int = -100,
+                 reduction: str = 'mean',
+                 label_smoothing: float = 0.0,
+                 chunk_size: int = None,
+                 dtype=None):
+        super().__init__()
+        self.in_features = in_features
+        self.num_classes = num_classes
+        self.weight = Parameter(num_classes, in_features, dtype=dtype)
+        if bias:
+            self.bias = Parameter(num_classes, dtype=dtype)
+        else:
+            self.bias = None
+        self.ignore_index = ignore_index
+        self.reduction = reduction
+        self.label_smoothing = label_smoothing
+        self.chunk_size = chunk_size
+
+    def forward(self, input: Tensor, target: Union[Tensor, np.ndarray]) -> Tensor:
+        return F.linear_cross_entropy(input, self.weight, self.bias, target,
+                                      ignore_index=self.ignore_index, reduction=self.reduction,
+                                      label_smoothing=self.label_smoothing, chunk_size=self.chunk_size)
@@ -1,12 +1,20 @@
 from abc import ABCMeta, abstractmethod
 from collections import OrderedDict
 
-from typing import Iterator, Union, Tuple
+from typing import Dict, Iterator, List, NamedTuple, Union, Tuple
+
+import numpy as np
 
 from ..parameter import Parameter
+from ..utils.flat_parameters import FlatParameters
 from minitorch import Tensor
 
 
+class IncompatibleKeys(NamedTuple):
+    missing_keys: List[str]
+    unexpected_keys: List[str]
+
+
 class Module(metaclass=ABCMeta):
     r"""Base class for all neural network modules.
 
@@ -79,7 +87,75 @@ class Module(metaclass=ABCMeta):
             submodule_prefix = prefix + ('.' if prefix else '') + name
             yield from module.named_modules(submodule_prefix)
 
+    def state_dict(self) -> 'OrderedDict[str, Tensor]':
+        """Map every parameter name to a tensor sharing its data."""
+        return OrderedDict((name, Tensor(param.data)) for name, param in self.named_parameters())
+
+    def load_state_dict(self, state_dict: Dict[str, Union[Tensor, np.ndarray]], strict: bool = True,
+                        assign: bool = False) -> IncompatibleKeys:
+        """Copy the values of state_dict into the parameters of the same name.
+
+        With assign=True the parameters take the loaded arrays as their data
+        instead of copying them, so memory-mapped checkpoints are not read
+        until they are used. Missing or unexpected keys raise with strict=True
+        and are returned either way.
+        """
+        params = OrderedDict(self.named_parameters())
+        missing_keys = [name for name in params if name not in state_dict]
+        unexpected_keys = [name for name in state_dict if name not in params]
+        errors = []
+        if strict:
+            if missing_keys:
+                errors.append("Missing key(s): {}.".format(', '.join(missing_keys)))
+            if unexpected_keys:
+                errors.append("Unexpected key(s): {}.".format(', '.join(unexpected_keys)))
+        for name, param in params.items():
+            if name not in state_dict:
+                continue
+            value = state_dict[name]
+            value = value.data if isinstance(value, Tensor) else np.asarray(value)
+            if value.shape != param.shape:
+                errors.append(f"size mismatch for {name}: copying a param with shape {value.shape}, "
+                              f"the shape in current model is {param.shape}.")
+        if errors:
+            raise RuntimeError("Error(s) in loading state_dict for {}:\n\t{}".format(
+                type(self).__name__, '\n\t'.join(errors)))
+        for name, param in params.items():
+            if name not in state_dict:
+                continue
+            value = state_dict[name]
+            value = value.data if isinstance(value, Tensor) else np.asarray(value)
+            if assign:
+                param.data = value.astype(param.dtype, copy=False)
+            else:
+                np.copyto(param.data, value, casting='same_kind')
+        return IncompatibleKeys(missing_keys, unexpected_keys)
+
+    def to(self, dtype) -> 'Module':
+        """Cast the parameters and their gradients to dtype in place."""
+        for p in self.parameters():
+            p.data = p.data.astype(dtype, copy=False)
+            if p.grad is not None:
+                p.grad.data = p.grad.data.astype(dtype, copy=False)
+        return self
+
+    def flatten_parameters(self) -> FlatParameters:
+        """Pack all parameters and their gradients into one contiguous buffer
+        each, with every parameter viewing its slice, so optimizers and
+        zero_grad can treat the whole model as a single array.
+
+        Opt-in: gradients then stay allocated and are zeroed in place. Flatten
+        again after adding parameters or rebinding their data.
+        """
+        flat = FlatParameters(self.parameters())
+        object.__setattr__(self, '_flat_parameters', flat)
+        return flat
+
     def zero_grad(self) -> None:
+        flat = getattr(self, '_flat_parameters', None)
+        if flat is not None and flat.is_intact():
+            flat.zero_grad()
+            return
         for p in self.parameters():
             if p.grad is not None:
                 p.grad = None
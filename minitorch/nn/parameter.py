@@ -1,11 +1,11 @@
 import numpy as np
 
-from minitorch import Tensor
+from minitorch import Tensor, get_default_dtype
 
 
 class Parameter(Tensor):
     """A kind of Tensor that is to be considered a module parameter."""
 
-    def __init__(self, *shape) -> None:
-        data = np.random.randn(*shape)
+    def __init__(self, *shape, dtype=None) -> None:
+        data = np.random.randn(*shape).astype(get_default_dtype() if dtype is None else dtype, copy=False)
         super().__init__(data=data, requires_grad=True)
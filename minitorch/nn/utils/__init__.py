@@ -0,0 +1,2 @@
+from .clip_grad import *
+from .flat_parameters import FlatParameters
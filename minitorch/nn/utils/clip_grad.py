@@ -0,0 +1,68 @@
+import math
+from typing import Iterable, List, Union
+
+import numpy as np
+
+from minitorch import Tensor
+
+__all__ = ['clip_grad_norm_', 'clip_grad_value_', 'get_total_norm']
+
+
+def _grad_arrays(parameters: Union[Tensor, Iterable[Tensor]]) -> List[np.ndarray]:
+    """The gradients of parameters, as the single flat grad buffer when the
+    parameters are exactly those of a FlatParameters holding current
+    gradients, so they are reduced and scaled with one call each."""
+    params = [parameters] if isinstance(parameters, Tensor) else list(parameters)
+    if params:
+        flat = getattr(params[0], '_flat', None)
+        if flat is not None and flat.covers(params) and flat.has_grads():
+            return [flat.grad]
+    return [p.grad.data for p in params if p.grad is not None]
+
+
+def _total_norm(grads: List[np.ndarray], norm_type: float, error_if_nonfinite: bool) -> float:
+    total_norm = _norm(grads, float(norm_type))
+    if error_if_nonfinite and not math.isfinite(total_norm):
+        raise RuntimeError(f"The total norm of order {float(norm_type)} for gradients is non-finite, "
+                           "so it cannot be clipped")
+    return total_norm
+
+
+def _norm(grads: List[np.ndarray], norm_type: float) -> float:
+    if not grads:
+        return 0.0
+    if norm_type == math.inf:
+        # NumPy reductions propagate NaN wherever it is, unlike Python's max
+        return float(np.max([np.maximum(g.max(), -g.min()) for g in grads if g.size], initial=0.0))
+    if norm_type == 2:
+        # vdot reduces without a temporary the size of the gradient
+        return math.sqrt(sum(float(np.vdot(g.ravel(), g.ravel())) for g in grads))
+    if norm_type == 1:
+        return float(sum(np.abs(g).sum() for g in grads))
+    return float(sum((np.abs(g) ** norm_type).sum() for g in grads)) ** (1.0 / norm_type)
+
+
+def get_total_norm(parameters: Union[Tensor, Iterable[Tensor]], norm_type: float = 2.0,
+                   error_if_nonfinite: bool = False) -> float:
+    """Norm of the gradients of parameters, viewed as a single vector."""
+    return _total_norm(_grad_arrays(parameters), norm_type, error_if_nonfinite)
+
+
+def clip_grad_norm_(parameters: Union[Tensor, Iterable[Tensor]], max_norm: float, norm_type: float = 2.0,
+                    error_if_nonfinite: bool = False) -> float:
+    """Scale the gradients of parameters in place so that their total norm is
+    at most max_norm, and return the norm they had."""
+    grads = _grad_arrays(parameters)
+    total_norm = _total_norm(grads, norm_type, error_if_nonfinite)
+    clip_coef = max_norm / (total_norm + 1e-6)
+    if clip_coef < 1:
+        for g in grads:
+            g *= clip_coef
+    return total_norm
+
+
+def clip_grad_value_(parameters: Union[Tensor, Iterable[Tensor]], clip_value: float) -> None:
+    """Clip the gradients of parameters in place to [-clip_value, clip_value]."""
+    clip_value = float(clip_value)
+    for g in _grad_arrays(parameters):
+        np.clip(g, -clip_value, clip_value, out=g)
@@ -0,0 +1,91 @@
+import operator
+from typing import Iterable, List
+
+import numpy as np
+
+from minitorch import Tensor
+
+
+class FlatParameters:
+    """Packs parameters into one contiguous data buffer and one contiguous
+    gradient buffer.
+
+    Every parameter's data and grad become views into the buffers, so a whole
+    model can be updated or zeroed with a single vectorized operation. The
+    gradients stay allocated: zero_grad fills them with zeros instead of
+    dropping them, and AccumulateGrad sums straight into them.
+
+    data and grad optionally provide the buffers, e.g. in shared memory; they
+    must be 1-D arrays of the parameters' dtype and total size.
+
+    Rebinding param.data, e.g. through Module.to or assign=True loads, detaches
+    a parameter from the buffer; flatten again afterwards.
+    """
+
+    def __init__(self, params: Iterable[Tensor], data: np.ndarray = None, grad: np.ndarray = None):
+        self.params: List[Tensor] = []
+        seen = set()
+        for p in params:
+            if id(p) not in seen:
+                seen.add(id(p))
+                self.params.append(p)
+        if not self.params:
+            raise ValueError("FlatParameters got an empty parameter list")
+        dtypes = set(p.dtype for p in self.params)
+        if len(dtypes) > 1:
+            raise TypeError(f"parameters of a single dtype can be flattened, rather than {sorted(map(str, dtypes))}")
+        dtype = dtypes.pop()
+        self.offsets = np.cumsum([0] + [p.data.size for p in self.params]).tolist()
+        self.data = self._storage(data, dtype)
+        self.grad = self._storage(grad, dtype)
+        if grad is not None:
+            self.grad.fill(0)
+        self.views: List[np.ndarray] = []
+        for p, start, end in zip(self.params, self.offsets, self.offsets[1:]):
+            data = self.data[start:end].reshape(p.shape)
+            data[...] = p.data
+            grad = self.grad[start:end].reshape(p.shape)
+            if p.grad is not None:
+                grad[...] = p.grad.data
+            p.data = data
+            self.views.append(data)
+            p.grad = Tensor(grad)
+            p._grad_buffer = grad
+            p._flat = self
+
+    def _storage(self, buffer: np.ndarray, dtype: np.dtype) -> np.ndarray:
+        if buffer is None:
+            return np.zeros(self.offsets[-1], dtype=dtype)
+        if buffer.shape != (self.offsets[-1],) or buffer.dtype != dtype:
+            raise ValueError(f"expected a buffer of shape ({self.offsets[-1]},) and dtype {dtype}, "
+                             f"rather than {buffer.shape} and {buffer.dtype}")
+        return buffer
+
+    def __len__(self) -> int:
+        return len(self.params)
+
+    @property
+    def numel(self) -> int:
+        return self.data.size
+
+    def covers(self, params: Iterable[Tensor]) -> bool:
+        """Tell whether params are exactly the flattened parameters, all still
+        viewing the buffers."""
+        params = list(params)
+        if len(params) != len(self.params):
+            return False
+        if not all(map(operator.is_, params, self.params)) and set(map(id, params)) != set(map(id, self.params)):
+            return False
+        return self.is_intact()
+
+    def is_intact(self) -> bool:
+        """Tell whether every parameter still views the data buffer."""
+        return all(p.data is view for p, view in zip(self.params, self.views))
+
+    def has_grads(self) -> bool:
+        """Tell whether every parameter has a gradient viewing the grad buffer,
+        i.e. whether the grad buffer holds the current gradients."""
+        return all(p.grad is not None and p.grad.data is p._grad_buffer for p in self.params)
+
+    def zero_grad(self) -> None:
+        self.grad.fill(0)
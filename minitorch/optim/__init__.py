@@ -1 +1,4 @@
+from .adam import *
+from .optimizer import *
 from .sgd import *
+from . import lr_scheduler
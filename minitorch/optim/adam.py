@@ -0,0 +1,104 @@
+import math
+from typing import Tuple
+
+import numpy as np
+
+from .optimizer import Optimizer
+
+
+class Adam(Optimizer):
+    """Implements Adam, with L2 weight decay added to the gradient, and the
+    AMSGrad variant.
+
+    The moments are kept in preallocated buffers and every step is made of
+    in-place operations, bias corrections folded into scalars. With
+    foreach=True, each param group is updated a dtype at a time over flat
+    storage, see Optimizer.
+    """
+
+    decoupled_weight_decay = False
+
+    def __init__(self, params, lr: float = 1e-3, betas: Tuple[float, float] = (0.9, 0.999),
+                 eps: float = 1e-8, weight_decay: float = 0, amsgrad: bool = False, foreach: bool = False):
+        if lr < 0.0:
+            raise ValueError("Invalid learning rate: {}".format(lr))
+        if eps < 0.0:
+            raise ValueError("Invalid epsilon value: {}".format(eps))
+        if not 0.0 <= betas[0] < 1.0:
+            raise ValueError("Invalid beta parameter at index 0: {}".format(betas[0]))
+        if not 0.0 <= betas[1] < 1.0:
+            raise ValueError("Invalid beta parameter at index 1: {}".format(betas[1]))
+        if weight_decay < 0.0:
+            raise ValueError("Invalid weight_decay value: {}".format(weight_decay))
+        defaults = dict(lr=lr, betas=tuple(betas), eps=eps, weight_decay=weight_decay, amsgrad=amsgrad,
+                        foreach=foreach)
+        super().__init__(params, defaults)
+
+    def _keys(self, group: dict) -> Tuple[str, ...]:
+        return ('exp_avg', 'exp_avg_sq', 'max_exp_avg_sq') if group['amsgrad'] else ('exp_avg', 'exp_avg_sq')
+
+    def step(self):
+        for group in self.param_groups:
+            keys = self._keys(group)
+            flats = self._flat_parameters(group)
+            if flats is not None:
+                states = [self._flat_state(flat, keys, ('step',)) for flat in flats]
+                if all(state is not None for state in states):
+                    for flat, (buffers, _) in zip(flats, states):
+                        self._update(flat.data, flat.grad, buffers, buffers['step'], group)
+                    continue
+            self._unflatten_state(group)
+            for p in group['params']:
+                if p.grad is None:
+                    continue
+                state = self.state.setdefault(p, {})
+                if 'step' not in state:
+                    state['step'] = np.array(0)
+                    for key in keys:
+                        state[key] = np.zeros_like(p.data)
+                self._update(p.data, p.grad.data, state, state['step'], group)
+
+    def _update(self, param: np.ndarray, grad: np.ndarray, state: dict, step: np.ndarray, group: dict) -> None:
+        lr, (beta1, beta2), eps = group['lr'], group['betas'], group['eps']
+        weight_decay = group['weight_decay']
+        scratch, scaled = self._buffers(param)
+        step += 1
+        g = grad
+        if weight_decay != 0:
+            if self.decoupled_weight_decay:
+                param *= 1 - lr * weight_decay
+            else:
+                g = np.multiply(param, weight_decay, out=scratch)
+                g += grad
+        exp_avg, exp_avg_sq = state['exp_avg'], state['exp_avg_sq']
+        exp_avg *= beta1
+        np.multiply(g, 1 - beta1, out=scaled)
+        exp_avg += scaled
+        exp_avg_sq *= beta2
+        np.multiply(g, g, out=scaled)
+        scaled *= 1 - beta2
+        exp_avg_sq += scaled
+        if group['amsgrad']:
+            exp_avg_sq = np.maximum(state['max_exp_avg_sq'], exp_avg_sq, out=state['max_exp_avg_sq'])
+        t = int(step)
+        bias_correction1 = 1 - beta1 ** t
+        bias_correction2 = 1 - beta2 ** t
+        # param -= lr / bc1 * exp_avg / (sqrt(exp_avg_sq) / sqrt(bc2) + eps)
+        denom = np.sqrt(exp_avg_sq, out=scaled)
+        denom *= 1 / math.sqrt(bias_correction2)
+        denom += eps
+        update = np.divide(exp_avg, denom, out=scaled)
+        update *= lr / bias_correction1
+        param -= update
+
+
+class AdamW(Adam):
+    """Implements AdamW: Adam with weight decay decoupled from the gradient,
+    applied to the parameters directly."""
+
+    decoupled_weight_decay = True
+
+    def __init__(self, params, lr: float = 1e-3, betas: Tuple[float, float] = (0.9, 0.999),
+                 eps: float = 1e-8, weight_decay: float = 1e-2, amsgrad: bool = False, foreach: bool = False):
+        super().__init__(params, lr=lr, betas=betas, eps=eps, weight_decay=weight_decay, amsgrad=amsgrad,
+                         foreach=foreach)
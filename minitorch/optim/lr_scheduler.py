@@ -0,0 +1,241 @@
+import math
+from abc import ABCMeta, abstractmethod
+from typing import List
+
+from .optimizer import Optimizer
+
+__all__ = ['LRScheduler', 'StepLR', 'CosineAnnealingLR', 'OneCycleLR', 'ReduceLROnPlateau']
+
+
+class LRScheduler(metaclass=ABCMeta):
+    """Base class for schedulers setting the lr of every param group as a
+    closed-form function of the step count.
+
+    Nothing is replayed: step(epoch) jumps to any step in O(1), so resuming
+    from a checkpoint costs the same whatever the step. The initial lr of a
+    group is kept in the group as 'initial_lr', which the optimizer's
+    state_dict saves along with it.
+    """
+
+    def __init__(self, optimizer: Optimizer, last_epoch: int = -1):
+        if not isinstance(optimizer, Optimizer):
+            raise TypeError("{} is not an Optimizer".format(type(optimizer).__name__))
+        self.optimizer = optimizer
+        for i, group in enumerate(optimizer.param_groups):
+            if last_epoch == -1:
+                group.setdefault('initial_lr', group['lr'])
+            elif 'initial_lr' not in group:
+                raise KeyError("param 'initial_lr' is not specified in param_groups[{}] "
+                               "when resuming an optimizer".format(i))
+        self.base_lrs: List[float] = [group['initial_lr'] for group in optimizer.param_groups]
+        self.last_epoch = last_epoch
+        self.step()
+
+    def get_lr(self) -> List[float]:
+        """The lr of every group at step last_epoch."""
+        return [self.lr_at(self.last_epoch, base_lr) for base_lr in self.base_lrs]
+
+    @abstractmethod
+    def lr_at(self, step: int, base_lr: float) -> float:
+        """The lr of a group starting from base_lr, at step."""
+        pass
+
+    def get_last_lr(self) -> List[float]:
+        return self._last_lr
+
+    def step(self, epoch: int = None) -> None:
+        self.last_epoch = self.last_epoch + 1 if epoch is None else epoch
+        self._last_lr = self.get_lr()
+        for group, lr in zip(self.optimizer.param_groups, self._last_lr):
+            group['lr'] = lr
+
+    def state_dict(self) -> dict:
+        return {key: value for key, value in self.__dict__.items() if key != 'optimizer'}
+
+    def load_state_dict(self, state_dict: dict) -> None:
+        self.__dict__.update(state_dict)
+
+
+class StepLR(LRScheduler):
+    """Decays the lr by gamma every step_size steps."""
+
+    def __init__(self, optimizer: Optimizer, step_size: int, gamma: float = 0.1, last_epoch: int = -1):
+        if step_size <= 0:
+            raise ValueError("step_size should be positive, rather than {}".format(step_size))
+        self.step_size = step_size
+        self.gamma = gamma
+        super().__init__(optimizer, last_epoch)
+
+    def lr_at(self, step: int, base_lr: float) -> float:
+        return base_lr * self.gamma ** (step // self.step_size)
+
+
+class CosineAnnealingLR(LRScheduler):
+    """Anneals the lr from its initial value down to eta_min along a half
+    cosine reaching eta_min at step T_max, after an optional linear warmup of
+    warmup_steps steps. The lr stays at eta_min past T_max.
+    """
+
+    def __init__(self, optimizer: Optimizer, T_max: int, eta_min: float = 0.0, warmup_steps: int = 0,
+                 last_epoch: int = -1):
+        if not 0 <= warmup_steps < T_max:
+            raise ValueError("expected 0 <= warmup_steps < T_max, got warmup_steps={} and T_max={}"
+                             .format(warmup_steps, T_max))
+        self.T_max = T_max
+        self.eta_min = eta_min
+        self.warmup_steps = warmup_steps
+        super().__init__(optimizer, last_epoch)
+
+    def lr_at(self, step: int, base_lr: float) -> float:
+        if step < self.warmup_steps:
+            return base_lr * (step + 1) / (self.warmup_steps + 1)
+        progress = min(step - self.warmup_steps, self.T_max - self.warmup_steps) / (self.T_max - self.warmup_steps)
+        return self.eta_min + (base_lr - self.eta_min) * (1 + math.cos(math.pi * progress)) / 2
+
+
+class OneCycleLR(LRScheduler):
+    """The 1cycle policy: the lr rises from max_lr / div_factor to max_lr over
+    the first pct_start of total_steps, then anneals down to
+    max_lr / (div_factor * final_div_factor). With three_phase, it first goes
+    back down to the initial lr symmetrically, then anneals.
+
+    With cycle_momentum, the momentum ('momentum', or beta1 of 'betas') moves
+    inversely between max_momentum and base_momentum.
+    """
+
+    def __init__(self, optimizer: Optimizer, max_lr: float, total_steps: int, pct_start: float = 0.3,
+                 anneal_strategy: str = 'cos', cycle_momentum: bool = True, base_momentum: float = 0.85,
+                 max_momentum: float = 0.95, div_factor: float = 25.0, final_div_factor: float = 1e4,
+                 three_phase: bool = False, last_epoch: int = -1):
+        if total_steps <= 0:
+            raise ValueError("total_steps should be positive, rather than {}".format(total_steps))
+        if not 0 <= pct_start <= 1:
+            raise ValueError("pct_start should be in [0, 1], rather than {}".format(pct_start))
+        if anneal_strategy not in ('cos', 'linear'):
+            raise ValueError("anneal_strategy should be 'cos' or 'linear', rather than {}".format(anneal_strategy))
+        if cycle_momentum and not all('momentum' in group or 'betas' in group for group in optimizer.param_groups):
+            raise ValueError("optimizer must support momentum or betas with cycle_momentum enabled")
+        self.total_steps = total_steps
+        self.anneal_strategy = anneal_strategy
+        self.cycle_momentum = cycle_momentum
+        self.base_momentum = base_momentum
+        self.max_momentum = max_momentum
+        initial_lr = max_lr / div_factor
+        min_lr = initial_lr / final_div_factor
+        # (end step, start lr, end lr, start momentum, end momentum) of every phase
+        warmup_end = float(pct_start * total_steps) - 1
+        if three_phase:
+            self.phases = [
+                (warmup_end, initial_lr, max_lr, max_momentum, base_momentum),
+                (2 * warmup_end, max_lr, initial_lr, base_momentum, max_momentum),
+                (total_steps - 1, initial_lr, min_lr, max_momentum, max_momentum),
+            ]
+        else:
+            self.phases = [
+                (warmup_end, initial_lr, max_lr, max_momentum, base_momentum),
+                (total_steps - 1, max_lr, min_lr, base_momentum, max_momentum),
+            ]
+        for group in optimizer.param_groups:
+            if last_epoch == -1:
+                group['lr'] = initial_lr
+        super().__init__(optimizer, last_epoch)
+
+    def _anneal(self, start: float, end: float, pct: float) -> float:
+        if self.anneal_strategy == 'cos':
+            return end + (start - end) / 2 * (math.cos(math.pi * pct) + 1)
+        return start + (end - start) * pct
+
+    def _phase(self, step: int):
+        if step >= self.total_steps:
+            raise ValueError("Tried to step {} times. The specified number of total steps is {}"
+                             .format(step + 1, self.total_steps))
+        start_step = 0.0
+        for i, phase in enumerate(self.phases):
+            end_step = phase[0]
+            if step <= end_step or i == len(self.phases) - 1:
+                return phase, (step - start_step) / (end_step - start_step) if end_step > start_step else 1.0
+            start_step = end_step
+        raise AssertionError("unreachable")
+
+    def lr_at(self, step: int, base_lr: float) -> float:
+        (_, start, end, _, _), pct = self._phase(step)
+        return self._anneal(start, end, pct)
+
+    def step(self, epoch: int = None) -> None:
+        super().step(epoch)
+        if self.cycle_momentum:
+            (_, _, _, start, end), pct = self._phase(self.last_epoch)
+            momentum = self._anneal(start, end, pct)
+            for group in self.optimizer.param_groups:
+                if 'betas' in group:
+                    group['betas'] = (momentum, *group['betas'][1:])
+                else:
+                    group['momentum'] = momentum
+
+
+class ReduceLROnPlateau:
+    """Reduces the lr of every group by factor once the metric passed to
+    step has not improved for more than patience steps.
+
+    Its state is a handful of numbers, so steps cost O(1).
+    """
+
+    def __init__(self, optimizer: Optimizer, mode: str = 'min', factor: float = 0.1, patience: int = 10,
+                 threshold: float = 1e-4, threshold_mode: str = 'rel', cooldown: int = 0,
+                 min_lr: float = 0.0, eps: float = 1e-8):
+        if factor >= 1.0:
+            raise ValueError("factor should be < 1.0, rather than {}".format(factor))
+        if mode not in ('min', 'max'):
+            raise ValueError("mode should be 'min' or 'max', rather than {}".format(mode))
+        if threshold_mode not in ('rel', 'abs'):
+            raise ValueError("threshold_mode should be 'rel' or 'abs', rather than {}".format(threshold_mode))
+        self.optimizer = optimizer
+        self.mode = mode
+        self.factor = factor
+        self.patience = patience
+        self.threshold = threshold
+        self.threshold_mode = threshold_mode
+        self.cooldown = cooldown
+        self.min_lrs = [min_lr] * len(optimizer.param_groups)
+        self.eps = eps
+        self.best = math.inf if mode == 'min' else -math.inf
+        self.num_bad_epochs = 0
+        self.cooldown_counter = 0
+        self.last_epoch = 0
+        self._last_lr = [group['lr'] for group in optimizer.param_groups]
+
+    def is_better(self, current: float) -> bool:
+        if self.mode == 'min':
+            best = self.best * (1 - self.threshold) if self.threshold_mode == 'rel' else self.best - self.threshold
+            return current < best
+        best = self.best * (1 + self.threshold) if self.threshold_mode == 'rel' else self.best + self.threshold
+        return current > best
+
+    def step(self, metrics: float) -> None:
+        current = float(metrics)
+        self.last_epoch += 1
+        if self.is_better(current):
+            self.best = current
+            self.num_bad_epochs = 0
+        else:
+            self.num_bad_epochs += 1
+        if self.cooldown_counter > 0:
+            self.cooldown_counter -= 1
+            self.num_bad_epochs = 0
+        if self.num_bad_epochs > self.patience:
+            for group, min_lr in zip(self.optimizer.param_groups, self.min_lrs):
+                new_lr = max(group['lr'] * self.factor, min_lr)
+                if group['lr'] - new_lr > self.eps:
+                    group['lr'] = new_lr
+            self.cooldown_counter = self.cooldown
+            self.num_bad_epochs = 0
+        self._last_lr = [group['lr'] for group in self.optimizer.param_groups]
+
+    def get_last_lr(self) -> List[float]:
+        return self._last_lr
+
+    def state_dict(self) -> dict:
+        return {key: value for key, value in self.__dict__.items() if key != 'optimizer'}
+
+    def load_state_dict(self, state_dict: dict) -> None:
+        self.__dict__.update(state_dict)
@@ -1,9 +1,193 @@
 from abc import ABCMeta, abstractmethod
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from minitorch import Tensor
+from minitorch.nn.utils import FlatParameters
 
 
 class Optimizer(metaclass=ABCMeta):
-    """Base class for all optimizers."""
+    """Base class for all optimizers.
+
+    Parameters are organized in param_groups, dicts holding a 'params' list
+    and the hyperparameters of those parameters, missing ones taken from
+    defaults. Per-parameter buffers live in state, keyed by parameter.
+
+    Updates are done in place. When the parameters of a group are exactly
+    the ones flattened by Module.flatten_parameters, the state buffers of the
+    group are flat arrays too, with the per-parameter state viewing them, and
+    a step updates the whole group with a few vectorized operations.
+    Flattened parameters normally all have a gradient and are all updated;
+    if some gradient was dropped, the step goes parameter by parameter.
+
+    With foreach=True, the parameters of a group are packed into one
+    FlatParameters per dtype when the group is added, so groups of many small
+    parameters get the same vectorized updates without flattening a module.
+    Packing rebinds the data of every parameter to a view of the flat buffer:
+    arrays taken from param.data before building the optimizer no longer see
+    the updates. A parameter rebound later gets packed again on the next use.
+    """
+
+    def __init__(self, params: Iterable[Union[Tensor, dict]], defaults: dict):
+        self.defaults = defaults
+        self.state: Dict[Tensor, dict] = {}
+        self.param_groups: List[dict] = []
+        self._flat_groups = {}
+        self._flat_buffers = {}
+        self._scratch = {}
+        param_groups = list(params)
+        if len(param_groups) == 0:
+            raise ValueError("optimizer got an empty parameter list")
+        if not isinstance(param_groups[0], dict):
+            param_groups = [{'params': param_groups}]
+        for param_group in param_groups:
+            self.add_param_group(param_group)
+
+    def add_param_group(self, param_group: dict) -> None:
+        param_group = dict(param_group)
+        params = param_group['params']
+        param_group['params'] = [params] if isinstance(params, Tensor) else list(params)
+        for name, default in self.defaults.items():
+            param_group.setdefault(name, default)
+        existing = set(id(p) for group in self.param_groups for p in group['params'])
+        if any(id(p) in existing for p in param_group['params']):
+            raise ValueError("some parameters appear in more than one parameter group")
+        self.param_groups.append(param_group)
+        if param_group.get('foreach'):
+            self._packed_parameters(param_group)
+
+    def zero_grad(self) -> None:
+        """Drop the gradients, zeroing flat gradient buffers in place instead."""
+        for group in self.param_groups:
+            flats = self._packed_parameters(group)
+            if flats is not None:
+                for flat in flats:
+                    flat.zero_grad()
+                continue
+            for p in group['params']:
+                p.grad = None
 
     @abstractmethod
     def step(self):
         pass
+
+    def state_dict(self) -> dict:
+        """Hyperparameters of every group and the state of every parameter,
+        with parameters referred to by their index in the groups."""
+        index = {}
+        param_groups = []
+        for group in self.param_groups:
+            packed = {k: v for k, v in group.items() if k != 'params'}
+            packed['params'] = [index.setdefault(id(p), len(index)) for p in group['params']]
+            param_groups.append(packed)
+        state = {index[id(p)]: dict(s) for p, s in self.state.items() if id(p) in index}
+        return {'state': state, 'param_groups': param_groups}
+
+    def load_state_dict(self, state_dict: dict) -> None:
+        groups = self.param_groups
+        saved_groups = state_dict['param_groups']
+        if len(groups) != len(saved_groups):
+            raise ValueError("loaded state dict has a different number of parameter groups")
+        if any(len(g['params']) != len(s['params']) for g, s in zip(groups, saved_groups)):
+            raise ValueError("loaded state dict contains a parameter group that doesn't match "
+                             "the size of optimizer's group")
+        params = {}
+        for group, saved in zip(groups, saved_groups):
+            params.update(zip(saved['params'], group['params']))
+            group.update({k: v for k, v in saved.items() if k != 'params'})
+        self.state = {}
+        self._flat_buffers = {}
+        for index, saved in state_dict['state'].items():
+            p = params[index]
+            self.state[p] = {k: np.array(v.data if isinstance(v, Tensor) else v, copy=True) for k, v in saved.items()}
+
+    def _flat_parameters(self, group: dict) -> Optional[List[FlatParameters]]:
+        """The FlatParameters the group consists of, when their grad buffers
+        hold the current gradients, or None to update parameter by parameter."""
+        flats = self._packed_parameters(group)
+        if flats is None or not all(flat.has_grads() for flat in flats):
+            return None
+        return flats
+
+    def _packed_parameters(self, group: dict) -> Optional[List[FlatParameters]]:
+        """The parameters of a flattened module when the group is exactly
+        those, else, for foreach groups, one FlatParameters per dtype packed
+        when the group is added and again whenever a parameter is rebound."""
+        flats = self._flat_groups.get(id(group))
+        if flats is not None and all(flat.is_intact() for flat in flats):
+            return flats
+        params = group['params']
+        flat = getattr(params[0], '_flat', None)
+        if flat is not None and flat.covers(params):
+            flats = [flat]
+        elif group.get('foreach'):
+            buckets = {}
+            for p in params:
+                buckets.setdefault(p.dtype, []).append(p)
+            flats = [self._pack(bucket) for bucket in buckets.values()]
+        else:
+            return None
+        for stale in self._flat_groups.get(id(group), ()):
+            self._flat_buffers.pop(stale, None)
+        self._flat_groups[id(group)] = flats
+        return flats
+
+    def _pack(self, params: List[Tensor]) -> FlatParameters:
+        missing = [p for p in params if p.grad is None]
+        flat = FlatParameters(params)
+        for p in missing:
+            p.grad = None
+        return flat
+
+    def _flat_state(self, flat: FlatParameters, keys: Tuple[str, ...],
+                    scalars: Tuple[str, ...] = ()) -> Optional[Tuple[Dict[str, np.ndarray], bool]]:
+        """Flat state buffers of a FlatParameters, allocated once and seeded
+        with the per-parameter state, which then views them. Also tells
+        whether no parameter had state yet.
+
+        Scalar state, e.g. step counts, is shared by the parameters as one 0-d
+        array, so None is returned when the parameters disagree on it.
+        """
+        buffers = self._flat_buffers.get(flat)
+        if buffers is not None:
+            return buffers, False
+        states = [self.state.get(p, {}) for p in flat.params]
+        buffers = {}
+        for key in scalars:
+            values = set(np.asarray(state.get(key, 0)).item() for state in states)
+            if len(values) > 1:
+                return None
+            buffers[key] = np.array(values.pop())
+        fresh = not any(key in state for state in states for key in keys)
+        for key in keys:
+            buffers[key] = np.zeros(flat.numel, dtype=flat.data.dtype)
+        for p, start, end in zip(flat.params, flat.offsets, flat.offsets[1:]):
+            state = self.state.setdefault(p, {})
+            for key in keys:
+                if key in state:
+                    buffers[key][start:end] = np.ravel(state[key])
+                state[key] = buffers[key][start:end].reshape(p.shape)
+            for key in scalars:
+                state[key] = buffers[key]
+        self._flat_buffers[flat] = buffers
+        return buffers, fresh
+
+    def _unflatten_state(self, group: dict) -> None:
+        """Give the parameters of the group private scalar state again before
+        updating them one by one."""
+        for flat in self._flat_groups.get(id(group), ()):
+            if self._flat_buffers.pop(flat, None) is None:
+                continue
+            for p in flat.params:
+                state = self.state.get(p)
+                if state:
+                    self.state[p] = {k: v.copy() if np.ndim(v) == 0 else v for k, v in state.items()}
+
+    def _buffers(self, like: np.ndarray, count: int = 2) -> List[np.ndarray]:
+        """Scratch arrays shaped like like, reused across steps and parameters."""
+        key = (like.shape, like.dtype)
+        buffers = self._scratch.get(key)
+        if buffers is None or len(buffers) < count:
+            buffers = self._scratch[key] = [np.empty_like(like) for _ in range(count)]
+        return buffers
@@ -1,15 +1,80 @@
+import numpy as np
+
 from .optimizer import Optimizer
 
 
 class SGD(Optimizer):
-    """Implements stochastic gradient descent"""
+    """Implements stochastic gradient descent, optionally with momentum,
+    Nesterov momentum and weight decay, following PyTorch's formulation:
+
+        d = grad + weight_decay * param
+        buf = momentum * buf + (1 - dampening) * d    (buf = d on the first step)
+        d = d + momentum * buf if nesterov else buf
+        param -= lr * d
 
-    def __init__(self, params, lr):
+    With foreach=True, each param group is updated a dtype at a time over
+    flat storage, see Optimizer.
+    """
+
+    def __init__(self, params, lr, momentum: float = 0, dampening: float = 0,
+                 weight_decay: float = 0, nesterov: bool = False, foreach: bool = False):
         if lr < 0.0:
             raise ValueError("Invalid learning rate: {}".format(lr))
-        self.params = list(params)
-        self.lr = lr
+        if momentum < 0.0:
+            raise ValueError("Invalid momentum value: {}".format(momentum))
+        if weight_decay < 0.0:
+            raise ValueError("Invalid weight_decay value: {}".format(weight_decay))
+        if nesterov and (momentum <= 0 or dampening != 0):
+            raise ValueError("Nesterov momentum requires a momentum and zero dampening")
+        defaults = dict(lr=lr, momentum=momentum, dampening=dampening,
+                        weight_decay=weight_decay, nesterov=nesterov, foreach=foreach)
+        super().__init__(params, defaults)
 
     def step(self):
-        for param in self.params:
-            param.data = param.data - self.lr * param.grad.data
+        for group in self.param_groups:
+            flats = self._flat_parameters(group)
+            if flats is not None:
+                for flat in flats:
+                    buffer, fresh = None, False
+                    if group['momentum'] != 0:
+                        buffers, fresh = self._flat_state(flat, ('momentum_buffer',))
+                        buffer = buffers['momentum_buffer']
+                    self._update(flat.data, flat.grad, buffer, fresh, group)
+                continue
+            for p in group['params']:
+                if p.grad is None:
+                    continue
+                buffer, fresh = None, False
+                if group['momentum'] != 0:
+                    state = self.state.setdefault(p, {})
+                    fresh = 'momentum_buffer' not in state
+                    if fresh:
+                        state['momentum_buffer'] = np.empty_like(p.data)
+                    buffer = state['momentum_buffer']
+                self._update(p.data, p.grad.data, buffer, fresh, group)
+
+    def _update(self, param: np.ndarray, grad: np.ndarray, buffer: np.ndarray, fresh: bool, group: dict) -> None:
+        lr, momentum, dampening = group['lr'], group['momentum'], group['dampening']
+        weight_decay, nesterov = group['weight_decay'], group['nesterov']
+        scratch, scaled = self._buffers(param)
+        d = grad
+        if weight_decay != 0:
+            d = np.multiply(param, weight_decay, out=scratch)
+            d += grad
+        if buffer is not None:
+            if fresh:
+                np.copyto(buffer, d)
+            elif dampening == 1:
+                buffer *= momentum
+            else:
+                # momentum * buf + (1 - dampening) * d without a temporary
+                buffer *= momentum / (1 - dampening)
+                buffer += d
+                buffer *= 1 - dampening
+            if nesterov:
+                np.multiply(buffer, momentum, out=scaled)
+                d = np.add(d, scaled, out=scratch)
+            else:
+                d = buffer
+        np.multiply(d, lr, out=scaled)
+        param -= scaled
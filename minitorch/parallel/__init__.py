@@ -0,0 +1 @@
+from .data_parallel import *
@@ -0,0 +1,286 @@
+"""Data-parallel training across forked CPU processes.
+
+The parameters live in one shared-memory buffer, so the workers always see
+the weights the optimizer just updated in the main process. Every worker
+owns a row of a shared gradient matrix that its flattened parameters
+accumulate into directly. As backward fills a bucket of parameters in a
+worker, a post-accumulate-grad hook reports it, and the main process sums
+that bucket across the rows into the gradient of the main module while the
+workers are still busy with earlier layers.
+"""
+
+import multiprocessing
+import os
+import queue
+import traceback
+from multiprocessing import shared_memory
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+from minitorch import Tensor
+from minitorch.nn import Module
+from minitorch.nn.utils import FlatParameters
+
+__all__ = ['DataParallel']
+
+
+class SharedArray:
+    """A NumPy array in a named shared-memory block."""
+
+    def __init__(self, shape: Tuple[int, ...], dtype: np.dtype, name: str = None):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        size = max(int(np.prod(self.shape)) * self.dtype.itemsize, 1)
+        self.shm = shared_memory.SharedMemory(name=name, create=name is None, size=size)
+        self.array = np.ndarray(self.shape, dtype=self.dtype, buffer=self.shm.buf)
+
+    @property
+    def spec(self) -> Tuple[str, Tuple[int, ...], str]:
+        return self.shm.name, self.shape, self.dtype.str
+
+    def close(self, unlink: bool = False) -> None:
+        self.array = None
+        try:
+            self.shm.close()
+        except BufferError:
+            # arrays still view the block; it is freed once they are gone
+            pass
+        if unlink:
+            self.shm.unlink()
+
+
+def _buckets(flat: FlatParameters, bucket_numel: int) -> List[Tuple[int, int, List[int]]]:
+    """Split the flat buffer into (start, end, parameter indices) buckets of
+    about bucket_numel elements, from the last parameter to the first, the
+    order backward usually produces their gradients in."""
+    buckets = []
+    end, members = flat.offsets[-1], []
+    for i in reversed(range(len(flat))):
+        members.append(i)
+        start = flat.offsets[i]
+        if end - start >= bucket_numel or i == 0:
+            buckets.append((start, end, members))
+            end, members = start, []
+    return buckets
+
+
+class _Worker:
+    """State of a forked worker process: its replica of the module, whose
+    flat gradient is its row of the shared gradient matrix."""
+
+    def __init__(self, rank: int, parallel: 'DataParallel'):
+        self.rank = rank
+        self.module = parallel.module
+        self.loss_fn = parallel.loss_fn
+        self.buckets = parallel.buckets
+        self.commands = parallel.commands[rank]
+        self.events = parallel.events
+        self.inputs: Dict[str, SharedArray] = {}
+        self.flat = FlatParameters(self.module.parameters(), data=parallel.shared_params.array,
+                                   grad=parallel.shared_grads.array[rank])
+        self.pending = [0] * len(self.buckets)
+        bucket_of = {}
+        for b, (_, _, members) in enumerate(self.buckets):
+            for i in members:
+                bucket_of[i] = b
+        for i, p in enumerate(self.flat.params):
+            p.register_post_accumulate_grad_hook(self._hook(bucket_of[i]))
+
+    def _hook(self, bucket: int) -> Callable[[Tensor], None]:
+        def hook(tensor: Tensor) -> None:
+            self.pending[bucket] -= 1
+            if self.pending[bucket] == 0:
+                self.events.put(('bucket', self.rank, bucket))
+        return hook
+
+    def _attach(self, key: str, spec) -> np.ndarray:
+        name, shape, dtype = spec
+        shared = self.inputs.get(key)
+        if shared is None or shared.shm.name != name:
+            if shared is not None:
+                shared.close()
+            shared = self.inputs[key] = SharedArray(shape, dtype, name=name)
+        return shared.array
+
+    def run(self) -> None:
+        while True:
+            command = self.commands.recv()
+            if command is None:
+                break
+            try:
+                self.events.put(('done', self.rank, self.train_step(*command)))
+            except Exception:
+                self.events.put(('error', self.rank, traceback.format_exc()))
+        for shared in self.inputs.values():
+            shared.close()
+
+    def train_step(self, input_spec, target_spec, start: int, end: int, total: int) -> float:
+        input = Tensor(self._attach('input', input_spec)[start:end])
+        target = Tensor(self._attach('target', target_spec)[start:end])
+        self.flat.zero_grad()
+        self.pending = [len(members) for _, _, members in self.buckets]
+        loss = self.loss_fn(self.module(input), target)
+        # the shards average into the loss of the whole batch
+        weight = (end - start) / total
+        loss.backward(Tensor(np.full((), weight, dtype=loss.dtype)))
+        for b, count in enumerate(self.pending):
+            if count > 0:
+                # parameters the graph did not reach keep a zero gradient
+                self.events.put(('bucket', self.rank, b))
+        return float(loss.data) * weight
+
+
+class DataParallel(Module):
+    """Trains a module on several forked processes at once.
+
+    train_step(input, target) shards the batch along its first axis over the
+    workers, runs the forward pass, loss_fn and backward in each of them, and
+    leaves the gradient of the mean loss over the batch in the parameters of
+    module, in the main process, then returns that loss. The optimizer steps
+    in the main process as usual, on the parameters of the module, which are
+    flattened into shared memory, all of a single dtype.
+
+    Calling the wrapper runs the module in the main process, e.g. for
+    evaluation. Workers are started by fork, so POSIX only; call close, or
+    use the wrapper as a context manager, to stop them. A worker that dies
+    makes train_step raise RuntimeError, after which the wrapper should be
+    closed.
+    """
+
+    # seconds between liveness checks of the workers while waiting on them
+    poll_interval = 1.0
+
+    def __init__(self, module: Module, loss_fn: Callable, num_workers: int = None, bucket_size_mb: float = 4.0):
+        super().__init__()
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            raise RuntimeError("DataParallel needs the fork start method")
+        num_workers = num_workers if num_workers is not None else os.cpu_count()
+        if num_workers <= 0:
+            raise ValueError("num_workers should be positive, rather than {}".format(num_workers))
+        self.module = module
+        self.loss_fn = loss_fn
+        self.num_workers = num_workers
+        params = list(module.parameters())
+        flat = FlatParameters(params)
+        self.shared_params = SharedArray(flat.data.shape, flat.data.dtype)
+        self.shared_grads = SharedArray((num_workers, flat.numel), flat.data.dtype)
+        # the main module views the shared parameters and gets the reduced gradients
+        self.flat = FlatParameters(params, data=self.shared_params.array)
+        object.__setattr__(module, '_flat_parameters', self.flat)
+        self.buckets = _buckets(self.flat, max(int(bucket_size_mb * 2 ** 20) // flat.data.itemsize, 1))
+        self.inputs: Dict[str, SharedArray] = {}
+
+        context = multiprocessing.get_context('fork')
+        self.events = context.Queue()
+        pipes = [context.Pipe(duplex=False) for _ in range(num_workers)]
+        self.commands = [receiver for receiver, _ in pipes]
+        self.processes = [context.Process(target=self._work, args=(rank,), daemon=True)
+                          for rank in range(num_workers)]
+        for process in self.processes:
+            process.start()
+        for receiver in self.commands:
+            receiver.close()
+        self.commands = [sender for _, sender in pipes]
+
+    def _work(self, rank: int) -> None:
+        _Worker(rank, self).run()
+
+    def _share(self, key: str, array: np.ndarray) -> Tuple[str, Tuple[int, ...], str]:
+        shared = self.inputs.get(key)
+        if shared is None or shared.shape != array.shape or shared.dtype != array.dtype:
+            if shared is not None:
+                shared.close(unlink=True)
+            shared = self.inputs[key] = SharedArray(array.shape, array.dtype)
+        np.copyto(shared.array, array)
+        return shared.spec
+
+    def forward(self, *inputs):
+        return self.module(*inputs)
+
+    def zero_grad(self) -> None:
+        self.flat.zero_grad()
+        self._attach_grads()
+
+    def _attach_grads(self) -> None:
+        # the gradients are reduced into the flat buffer, which dropped or
+        # rebound grads no longer view
+        for p in self.flat.params:
+            if p.grad is None or p.grad.data is not p._grad_buffer:
+                p.grad = Tensor(p._grad_buffer)
+
+    def _next_event(self, ranks: range) -> tuple:
+        while True:
+            try:
+                return self.events.get(timeout=self.poll_interval)
+            except queue.Empty:
+                pass
+            for rank in ranks:
+                process = self.processes[rank]
+                if not process.is_alive():
+                    raise RuntimeError("DataParallel worker {} died with exit code {}".format(rank, process.exitcode))
+
+    def train_step(self, input: Tensor, target: Tensor) -> float:
+        input = input.data if isinstance(input, Tensor) else np.asarray(input)
+        target = target.data if isinstance(target, Tensor) else np.asarray(target)
+        if len(input) != len(target):
+            raise ValueError("input and target have different batch sizes: {} and {}".format(len(input), len(target)))
+        total = len(input)
+        num_shards = min(self.num_workers, total)
+        bounds = np.linspace(0, total, num_shards + 1).astype(int).tolist()
+        input_spec, target_spec = self._share('input', input), self._share('target', target)
+        self._attach_grads()
+        ranks = range(num_shards)
+        for rank in ranks:
+            try:
+                self.commands[rank].send((input_spec, target_spec, bounds[rank], bounds[rank + 1], total))
+            except OSError:
+                raise RuntimeError("DataParallel worker {} died with exit code {}".format(
+                    rank, self.processes[rank].exitcode)) from None
+
+        grads = self.shared_grads.array[:num_shards]
+        arrived = [0] * len(self.buckets)
+        loss, done, errors = 0.0, 0, []
+        while done < num_shards:
+            kind, rank, payload = self._next_event(ranks)
+            if kind == 'bucket':
+                arrived[payload] += 1
+                if arrived[payload] == num_shards:
+                    start, end, _ = self.buckets[payload]
+                    np.sum(grads[:, start:end], axis=0, out=self.flat.grad[start:end])
+            elif kind == 'done':
+                loss += payload
+                done += 1
+            else:
+                errors.append(payload)
+                done += 1
+        if errors:
+            raise RuntimeError("DataParallel worker failed:\n" + errors[0])
+        return loss
+
+    def close(self) -> None:
+        """Stop the workers and free the shared memory."""
+        if not self.processes:
+            return
+        for sender in self.commands:
+            try:
+                sender.send(None)
+            except OSError:
+                # the worker is already gone
+                pass
+            sender.close()
+        for process in self.processes:
+            process.join()
+        self.processes = []
+        # the parameters must not view the shared memory once it is gone
+        self.flat = FlatParameters(self.flat.params)
+        object.__setattr__(self.module, '_flat_parameters', self.flat)
+        for shared in [self.shared_params, self.shared_grads, *self.inputs.values()]:
+            shared.close(unlink=True)
+        self.inputs = {}
+
+    def __enter__(self) -> 'DataParallel':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
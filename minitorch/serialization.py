@@ -0,0 +1,154 @@
+"""Save and load tensors in a flat binary container.
+
+Layout of a file:
+
+    MAGIC | header length (uint64, little endian) | JSON header | tensor bytes
+
+The JSON header describes the saved object, with every tensor or array
+replaced by a reference to an entry of its tensor table (dtype, shape and
+offset). The raw bytes of every tensor follow the header in C order, each
+starting at a multiple of ALIGNMENT, so they can be used in place as NumPy
+arrays: either from a single read of the file or from a memory map that only
+reads a parameter from disk when it is first touched.
+"""
+
+import json
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, List, Union
+
+import numpy as np
+
+from minitorch import Tensor
+
+MAGIC = b'MINITRCH'
+VERSION = 1
+ALIGNMENT = 64
+
+PathLike = Union[str, os.PathLike]
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _encode(obj: Any, arrays: List[np.ndarray], copy: bool):
+    """Replace tensors and arrays by references into arrays, keeping the rest
+    of the structure JSON serializable."""
+    if isinstance(obj, (Tensor, np.ndarray)):
+        array = obj.data if isinstance(obj, Tensor) else obj
+        if array.dtype.hasobject:
+            raise TypeError("arrays of Python objects cannot be saved")
+        array = np.array(array, order='C', copy=True) if copy else np.ascontiguousarray(array)
+        arrays.append(array)
+        return {'__tensor__': len(arrays) - 1, 'type': 'tensor' if isinstance(obj, Tensor) else 'ndarray'}
+    if isinstance(obj, dict):
+        if all(isinstance(k, str) for k in obj):
+            return {'__dict__': [[k, _encode(v, arrays, copy)] for k, v in obj.items()]}
+        return {'__dict__': [[_encode(k, arrays, copy), _encode(v, arrays, copy)] for k, v in obj.items()]}
+    if isinstance(obj, (list, tuple)):
+        return {'__list__' if isinstance(obj, list) else '__tuple__': [_encode(v, arrays, copy) for v in obj]}
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return obj
+    raise TypeError(f"cannot save an object of type {type(obj).__name__}")
+
+
+def _decode(obj: Any, arrays: List[np.ndarray]):
+    if not isinstance(obj, dict):
+        return obj
+    if '__tensor__' in obj:
+        array = arrays[obj['__tensor__']]
+        return Tensor(array) if obj['type'] == 'tensor' else array
+    if '__dict__' in obj:
+        return {_decode(k, arrays): _decode(v, arrays) for k, v in obj['__dict__']}
+    if '__list__' in obj:
+        return [_decode(v, arrays) for v in obj['__list__']]
+    return tuple(_decode(v, arrays) for v in obj['__tuple__'])
+
+
+def _write(path: PathLike, structure: Any, arrays: List[np.ndarray]) -> None:
+    table = []
+    offset = 0
+    for array in arrays:
+        table.append(dict(dtype=array.dtype.str, shape=list(array.shape), offset=offset))
+        offset = _align(offset + array.nbytes)
+    header = json.dumps(dict(version=VERSION, tensors=table, object=structure)).encode('utf-8')
+    start = _align(len(MAGIC) + 8 + len(header))
+    # write next to the destination and rename, so a crash mid-save never
+    # leaves a truncated checkpoint behind
+    tmp_path = os.fspath(path) + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(len(header).to_bytes(8, 'little'))
+        f.write(header)
+        for array, entry in zip(arrays, table):
+            f.write(b'\0' * (start + entry['offset'] - f.tell()))
+            f.write(array.reshape(-1).view(np.uint8))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def save(obj: Any, path: PathLike, async_save: bool = False) -> Union[None, Future]:
+    """Save obj, typically a state_dict, to path.
+
+    obj may nest dicts, lists and tuples of tensors, arrays, numbers, strings
+    and None. With async_save=True the tensors are snapshotted right away and
+    the file is written by a background thread. The returned Future resolves
+    once the file is complete; asynchronous saves finish in call order.
+    """
+    global _executor
+    arrays = []
+    structure = _encode(obj, arrays, copy=async_save)
+    if not async_save:
+        _write(path, structure, arrays)
+        return None
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(1, thread_name_prefix='minitorch-save')
+    return _executor.submit(_write, path, structure, arrays)
+
+
+def load(path: PathLike, mmap: bool = False) -> Any:
+    """Load an object saved by save.
+
+    With mmap=True the tensors are copy-on-write views of a memory map of the
+    file: nothing is read until it is accessed, and writes stay private to
+    this process.
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a minitorch checkpoint")
+        header_length = int.from_bytes(f.read(8), 'little')
+        header = json.loads(f.read(header_length).decode('utf-8'))
+    if header.get('version') != VERSION:
+        raise ValueError(f"unsupported checkpoint version {header.get('version')}")
+    start = _align(len(MAGIC) + 8 + header_length)
+    if mmap:
+        buffer = np.memmap(path, dtype=np.uint8, mode='c') if os.path.getsize(path) > start else None
+    else:
+        size = max(os.path.getsize(path) - start, 0)
+        # over-allocate so the tensors keep the alignment they had in the file
+        raw = np.empty(size + ALIGNMENT, dtype=np.uint8)
+        shift = -raw.ctypes.data % ALIGNMENT
+        buffer = raw[shift:shift + size]
+        with open(path, 'rb') as f:
+            f.seek(start)
+            if f.readinto(buffer) != size:
+                raise ValueError(f"{path} is truncated")
+        start = 0
+    arrays = []
+    for entry in header['tensors']:
+        dtype = np.dtype(entry['dtype'])
+        shape = tuple(entry['shape'])
+        if int(np.prod(shape, dtype=np.int64)) == 0:
+            arrays.append(np.empty(shape, dtype=dtype))
+        else:
+            arrays.append(np.ndarray(shape, dtype=dtype, buffer=buffer, offset=start + entry['offset']))
+    return _decode(header['object'], arrays)
@@ -1,77 +1,114 @@
 import numpy as np
-from typing import Union, Tuple
+from typing import Callable, Union, Tuple
 
 from minitorch import autograd
+from minitorch.autograd.grad_mode import is_inference_mode_enabled
 
 
 Arrayable = Union[float, list, np.ndarray]
+DTypeLike = Union[np.dtype, type, str]
 
+_default_dtype = np.dtype(np.float64)
 
-def ensure_ndarray(data: Arrayable) -> np.ndarray:
-    if isinstance(data, np.ndarray):
-        return data
-    else:
-        return np.array(data)
+
+def set_default_dtype(dtype: DTypeLike) -> None:
+    """Set the floating point dtype of new parameters, random tensors and
+    tensors created from Python floats."""
+    global _default_dtype
+    dtype = np.dtype(dtype)
+    if dtype.kind != 'f':
+        raise TypeError(f"only floating point dtypes are supported as default, rather than {dtype}")
+    _default_dtype = dtype
+
+
+def get_default_dtype() -> np.dtype:
+    return _default_dtype
 
 
-def ensure_tensor(data):
+def ensure_ndarray(data: Arrayable, dtype: DTypeLike = None) -> np.ndarray:
+    if isinstance(data, (np.ndarray, np.generic)):
+        return np.asarray(data, dtype=dtype)
+    data = np.array(data, dtype=dtype)
+    if dtype is None and data.dtype.kind == 'f':
+        # Python floats carry no precision of their own
+        data = data.astype(_default_dtype, copy=False)
+    return data
+
+
+def ensure_tensor(data, like: 'Tensor' = None):
     if isinstance(data, Tensor):
         return data
-    else:
-        return Tensor(data)
+    if like is not None and isinstance(data, (int, float)):
+        # a Python scalar takes the dtype of the tensor it is combined with,
+        # as in NumPy, instead of promoting float32 to float64
+        return Tensor(np.asarray(data, dtype=np.result_type(like.dtype, data)))
+    return Tensor(data)
+
+
+def _shape_args(shape: tuple) -> tuple:
+    # accept both t.reshape(2, 3) and t.reshape((2, 3))
+    if len(shape) == 1 and isinstance(shape[0], (tuple, list)):
+        return tuple(shape[0])
+    return shape
 
 
 class Tensor:
     def __init__(self,
                  data: Arrayable,
                  requires_grad: bool = False,
-                 grad_fn=None):
-        self.data = ensure_ndarray(data)
+                 grad_fn=None,
+                 dtype: DTypeLike = None):
+        self.data = ensure_ndarray(data, dtype)
         self.requires_grad = requires_grad
         self.grad = None
         self.grad_fn = grad_fn
+        self.is_inference = is_inference_mode_enabled()
 
     @property
     def shape(self):
         return self.data.shape
 
+    @property
+    def dtype(self) -> np.dtype:
+        return self.data.dtype
+
     def __repr__(self):
         return f"Tensor({self.data}, requires_grad={self.requires_grad})"
 
     def __add__(self, other) -> 'Tensor':
-        return autograd.functional.add(self, ensure_tensor(other))
+        return autograd.functional.add(self, ensure_tensor(other, like=self))
 
     def __radd__(self, other) -> 'Tensor':
-        return autograd.functional.add(ensure_tensor(other), self)
+        return autograd.functional.add(ensure_tensor(other, like=self), self)
 
     def __iadd__(self, other) -> 'Tensor':
-        self.data += ensure_tensor(other).data
+        self.data += ensure_tensor(other, like=self).data
         return self
 
     def __neg__(self) -> 'Tensor':
         return autograd.functional.neg(self)
 
     def __sub__(self, other) -> 'Tensor':
-        return autograd.functional.sub(self, ensure_tensor(other))
+        return autograd.functional.sub(self, ensure_tensor(other, like=self))
 
-    def __rsub__(self, othere) -> 'Tensor':
-        return autograd.functional.sub(ensure_tensor(other), self)
+    def __rsub__(self, other) -> 'Tensor':
+        return autograd.functional.sub(ensure_tensor(other, like=self), self)
 
     def __isub__(self, other) -> 'Tensor':
-        self.data -= ensure_tensor(other).data
+        self.data -= ensure_tensor(other, like=self).data
         return self
 
     def __mul__(self, other) -> 'Tensor':
-        return autograd.functional.mul(self, ensure_tensor(other))
+        return autograd.functional.mul(self, ensure_tensor(other, like=self))
 
     def __rmul__(self, other) -> 'Tensor':
-        return autograd.functional.mul(ensure_tensor(other), self)
+        return autograd.functional.mul(ensure_tensor(other, like=self), self)
 
     def __truediv__(self, other) -> 'Tensor':
-        return autograd.functional.div(self, ensure_tensor(other))
+        return autograd.functional.div(self, ensure_tensor(other, like=self))
 
     def __rtruediv__(self, other) -> 'Tensor':
-        return autograd.functional.div(ensure_tensor(other), self)
+        return autograd.functional.div(ensure_tensor(other, like=self), self)
 
     def __matmul__(self, other) -> 'Tensor':
         return autograd.functional.matmul(self, other)
@@ -89,25 +126,88 @@ class Tensor:
         """transpose"""
         return autograd.functional.t(self)
 
+    def astype(self, dtype: DTypeLike) -> 'Tensor':
+        """Differentiable cast, the gradient flows back in the original dtype."""
+        return autograd.functional.astype(self, dtype)
+
+    def __getitem__(self, index) -> 'Tensor':
+        return autograd.functional.getitem(self, index)
+
+    def reshape(self, *shape) -> 'Tensor':
+        return autograd.functional.reshape(self, _shape_args(shape))
+
+    def view(self, *shape) -> 'Tensor':
+        return autograd.functional.view(self, _shape_args(shape))
+
+    def permute(self, *dims) -> 'Tensor':
+        return autograd.functional.permute(self, _shape_args(dims))
+
+    def transpose(self, dim0: int, dim1: int) -> 'Tensor':
+        return autograd.functional.transpose(self, dim0, dim1)
+
+    def squeeze(self, axis: Union[int, Tuple[int]] = None) -> 'Tensor':
+        return autograd.functional.squeeze(self, axis)
+
+    def unsqueeze(self, axis: int) -> 'Tensor':
+        return autograd.functional.unsqueeze(self, axis)
+
+    def expand(self, *shape) -> 'Tensor':
+        return autograd.functional.expand(self, _shape_args(shape))
+
     def exp(self) -> 'Tensor':
         return autograd.functional.exp(self)
 
     def relu(self) -> 'Tensor':
         return autograd.functional.relu(self)
 
-    def backward(self, grad: 'Tensor' = None) -> None:
+    def sigmoid(self) -> 'Tensor':
+        return autograd.functional.sigmoid(self)
+
+    def tanh(self) -> 'Tensor':
+        return autograd.functional.tanh(self)
+
+    def backward(self, grad: 'Tensor' = None, retain_graph: bool = False) -> None:
+        """Accumulate the gradient of this tensor into the leaves of its graph.
+
+        The tensors saved by the graph are freed as soon as the node using
+        them has run, unless retain_graph is True.
+        """
         assert self.requires_grad
         if grad is None and self.shape != ():
             raise RuntimeError("grad can be implicitly created only for scalar outputs")
-        grad = grad if grad else Tensor(1.0)
+        if grad is None:
+            grad = Tensor(np.ones((), dtype=self.dtype))
+        elif grad.dtype != self.dtype:
+            grad = Tensor(grad.data, dtype=self.dtype)
         from minitorch.autograd.engine import Engine
         engine = Engine()
-        engine.execute(self, grad)
+        engine.execute(self, grad, retain_graph=retain_graph)
 
     def zero_grad(self) -> None:
         self.grad = None
 
+    def register_post_accumulate_grad_hook(self, hook: Callable[['Tensor'], None]) -> 'RemovableHandle':
+        """Call hook(tensor) every time a gradient was accumulated into the
+        grad of this leaf tensor during backward."""
+        if self.grad_fn is not None and not isinstance(self.grad_fn, autograd.node.AccumulateGrad):
+            raise RuntimeError("post accumulate grad hooks can only be registered on leaf tensors")
+        hooks = self.__dict__.setdefault('_post_accumulate_grad_hooks', [])
+        hooks.append(hook)
+        return RemovableHandle(hooks, hook)
+
+
+class RemovableHandle:
+    """Handle returned by hook registrations, removing the hook."""
+
+    def __init__(self, hooks: list, hook: Callable):
+        self.hooks = hooks
+        self.hook = hook
+
+    def remove(self) -> None:
+        if self.hook in self.hooks:
+            self.hooks.remove(self.hook)
+
 
-def rand(*shape, requires_grad=False) -> Tensor:
-    data = np.random.randn(*shape)
+def rand(*shape, requires_grad=False, dtype: DTypeLike = None) -> Tensor:
+    data = np.random.randn(*shape).astype(_default_dtype if dtype is None else dtype, copy=False)
     return Tensor(data=data, requires_grad=requires_grad)
@@ -0,0 +1 @@
+from .checkpoint import checkpoint, checkpoint_sequential
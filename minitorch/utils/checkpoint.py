@@ -0,0 +1,74 @@
+"""Activation checkpointing: trade compute for memory.
+
+A checkpointed segment runs its forward under no_grad, so none of its
+intermediate results are saved. Its single backward node keeps only the
+segment inputs and replays the forward with grad enabled when the engine
+reaches it, then backpropagates through the recomputed subgraph.
+"""
+
+from typing import Callable, List
+
+from minitorch import Tensor
+from minitorch.autograd.engine import Engine
+from minitorch.autograd.grad_mode import enable_grad, is_grad_enabled, no_grad
+from minitorch.autograd.node import Node, collect_next_edges
+from minitorch.nn import Module, Sequential
+
+
+class CheckpointBackward(Node):
+    saved_attrs = ('inputs',)
+
+    def __init__(self):
+        self.function: Callable = None
+        self.inputs: tuple = None
+
+    def saved_tensors(self) -> List[Tensor]:
+        return list(self.inputs) if self.inputs is not None else []
+
+    def apply(self, grad_output: Tensor) -> list:
+        inputs = [Tensor(data=t.data, requires_grad=t.requires_grad) for t in self.inputs]
+        with enable_grad():
+            output = self.function(*inputs)
+        if output.grad_fn is not None:
+            Engine().execute(output, grad_output)
+        return [t.grad for t in inputs if t.requires_grad]
+
+
+def checkpoint(function: Callable, *inputs: Tensor) -> Tensor:
+    """Run function(*inputs) without saving its intermediate results.
+
+    Gradients flow to the inputs and to the parameters of function when it is
+    a Module. A plain callable that only closes over parameters needs at least
+    one input that requires grad, otherwise its output does not either.
+    """
+    requires_grad = any(t.requires_grad for t in inputs)
+    if isinstance(function, Module):
+        requires_grad = requires_grad or any(p.requires_grad for p in function.parameters())
+    with no_grad():
+        output = function(*inputs)
+    if not (requires_grad and is_grad_enabled()):
+        return output
+    checkpoint_bw = CheckpointBackward()
+    checkpoint_bw.set_next_edges(collect_next_edges(*inputs, saved=True))
+    checkpoint_bw.function = function
+    checkpoint_bw.inputs = inputs
+    return Tensor(data=output.data,
+                  requires_grad=True,
+                  grad_fn=checkpoint_bw)
+
+
+def checkpoint_sequential(sequential: Sequential, segments: int, input: Tensor) -> Tensor:
+    """Split sequential into segments and checkpoint each of them but the last,
+    which runs normally since its backward comes first anyway. An empty
+    sequential returns input unchanged."""
+    if segments <= 0:
+        raise ValueError(f"segments should be positive, rather than {segments}")
+    modules = list(sequential)
+    if not modules:
+        return input
+    segment_size = -(-len(modules) // segments)
+    end = 0
+    for start in range(0, len(modules) - segment_size, segment_size):
+        end = start + segment_size
+        input = checkpoint(Sequential(*modules[start:end]), input)
+    return Sequential(*modules[end:])(input)
@@ -0,0 +1,4 @@
+from .dataloader import DataLoader, default_collate
+from .dataset import Dataset, TensorDataset
+from .memmap import MemmapDataset
+from .sampler import BatchSampler, BlockShuffleSampler, RandomSampler, Sampler, SequentialSampler
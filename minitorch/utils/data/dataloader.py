@@ -0,0 +1,128 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Callable, List, Sequence, Tuple
+
+import numpy as np
+
+from minitorch import Tensor
+from .dataset import Dataset
+from .sampler import BatchSampler, RandomSampler, Sampler, SequentialSampler
+
+
+def default_collate(samples: list, out: Tuple[np.ndarray, ...] = None):
+    """Stack a list of samples into a batch, field by field for tuple samples.
+
+    When out is given, the fields are stacked into those arrays instead of
+    newly allocated ones.
+    """
+    single = not isinstance(samples[0], (tuple, list))
+    fields = [samples] if single else list(zip(*samples))
+    batch = []
+    for i, field in enumerate(fields):
+        arrays = [s.data if isinstance(s, Tensor) else s for s in field]
+        batch.append(Tensor(np.stack(arrays, out=None if out is None else out[i])))
+    return batch[0] if single else tuple(batch)
+
+
+class DataLoader:
+    """Iterates over a dataset in mini-batches.
+
+    Args:
+        dataset: the dataset to load from. If it implements gather(indices, out),
+            whole batches are fetched with it instead of sample by sample.
+        batch_size: number of samples per batch.
+        shuffle: reshuffle the samples every epoch.
+        sampler: strategy to draw the indices from, mutually exclusive with shuffle.
+        drop_last: drop the last batch when it is smaller than batch_size.
+        collate_fn: merges a list of samples into a batch, default_collate if None.
+        num_workers: number of background threads assembling batches, 0 loads
+            them in the main thread when they are requested.
+        prefetch_factor: number of batches loaded ahead by every worker.
+        reuse_buffers: assemble the batches into a ring of preallocated arrays
+            instead of allocating every step. A batch is overwritten once the
+            loader got far enough ahead, so it is only valid until the next
+            batch is requested.
+        generator: random generator used by the shuffling.
+    """
+
+    def __init__(self,
+                 dataset: Dataset,
+                 batch_size: int = 1,
+                 shuffle: bool = False,
+                 sampler: Sampler = None,
+                 drop_last: bool = False,
+                 collate_fn: Callable = None,
+                 num_workers: int = 0,
+                 prefetch_factor: int = 2,
+                 reuse_buffers: bool = False,
+                 generator: np.random.Generator = None):
+        if sampler is not None and shuffle:
+            raise ValueError("sampler option is mutually exclusive with shuffle")
+        if num_workers < 0:
+            raise ValueError(f"num_workers should be non-negative, rather than {num_workers}")
+        if prefetch_factor < 1:
+            raise ValueError(f"prefetch_factor should be positive, rather than {prefetch_factor}")
+        if reuse_buffers and collate_fn is not None:
+            raise ValueError("reuse_buffers only works with the default collation")
+        if sampler is None:
+            sampler = RandomSampler(dataset, generator) if shuffle else SequentialSampler(dataset)
+        self.dataset = dataset
+        self.batch_size = batch_size
+        self.drop_last = drop_last
+        self.sampler = sampler
+        self.batch_sampler = BatchSampler(sampler, batch_size, drop_last)
+        self.collate_fn = collate_fn
+        self.num_workers = num_workers
+        self.prefetch_factor = prefetch_factor
+        self.reuse_buffers = reuse_buffers
+
+    def __len__(self) -> int:
+        return len(self.batch_sampler)
+
+    def __iter__(self):
+        batches = iter(self.batch_sampler)
+        if self.num_workers == 0:
+            buffers = self._allocate_buffers(1)
+            for indices in batches:
+                yield self._fetch(indices, buffers, 0)
+            return
+        # batch k is released when batch k + 1 is requested, so depth + 1
+        # buffers cover the batch in use and the ones in flight
+        depth = self.num_workers * self.prefetch_factor
+        buffers = self._allocate_buffers(depth + 1)
+        executor = ThreadPoolExecutor(self.num_workers)
+        try:
+            futures = deque()
+            for step, indices in enumerate(islice(batches, depth)):
+                futures.append(executor.submit(self._fetch, indices, buffers, step))
+            step = len(futures)
+            while futures:
+                batch = futures.popleft().result()
+                indices = next(batches, None)
+                if indices is not None:
+                    futures.append(executor.submit(self._fetch, indices, buffers, step))
+                    step += 1
+                yield batch
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _allocate_buffers(self, size: int) -> List[Tuple[np.ndarray, ...]]:
+        if not self.reuse_buffers or len(self.dataset) == 0:
+            return None
+        sample = self._fetch([0])
+        fields = sample if isinstance(sample, tuple) else (sample,)
+        return [tuple(np.empty((self.batch_size,) + t.shape[1:], dtype=t.dtype) for t in fields)
+                for _ in range(size)]
+
+    def _fetch(self, indices: Sequence[int], buffers: List[Tuple[np.ndarray, ...]] = None, step: int = 0):
+        out = None
+        if buffers is not None:
+            out = tuple(b[:len(indices)] for b in buffers[step % len(buffers)])
+        gather = getattr(self.dataset, 'gather', None)
+        if gather is not None and self.collate_fn is None:
+            return tuple(Tensor(a) for a in gather(indices, out=out))
+        samples = [self.dataset[i] for i in indices]
+        if self.collate_fn is not None:
+            return self.collate_fn(samples)
+        return default_collate(samples, out=out)
@@ -0,0 +1,55 @@
+from abc import ABCMeta, abstractmethod
+from typing import Sequence, Tuple, Union
+
+import numpy as np
+
+from minitorch import Tensor
+
+
+class Dataset(metaclass=ABCMeta):
+    """Base class for map-style datasets: a sized collection of samples.
+
+    A dataset may also implement gather(indices, out=None), returning the
+    fields of a whole batch as arrays and writing them into out when it is
+    given. DataLoader prefers it over collating samples one by one.
+    """
+
+    @abstractmethod
+    def __getitem__(self, index: int):
+        """subclass must implement the method."""
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+
+class TensorDataset(Dataset):
+    """Dataset wrapping tensors or arrays that share their first dimension.
+
+    Each sample is a tuple with one row of every tensor.
+    """
+
+    def __init__(self, *tensors: Union[Tensor, np.ndarray]):
+        arrays = tuple(t.data if isinstance(t, Tensor) else np.asarray(t) for t in tensors)
+        if not arrays:
+            raise ValueError("TensorDataset needs at least one tensor")
+        if any(len(a) != len(arrays[0]) for a in arrays):
+            raise ValueError("size mismatch between tensors, they should share the first dimension")
+        self.arrays = arrays
+
+    def __getitem__(self, index: int) -> Tuple[Tensor, ...]:
+        return tuple(Tensor(a[index]) for a in self.arrays)
+
+    def __len__(self) -> int:
+        return len(self.arrays[0])
+
+    def gather(self, indices: Sequence[int], out: Tuple[np.ndarray, ...] = None) -> Tuple[np.ndarray, ...]:
+        indices = np.asarray(indices, dtype=np.intp)
+        if out is None:
+            return tuple(a[indices] for a in self.arrays)
+        if len(indices) and (indices.min() < 0 or indices.max() >= len(self)):
+            raise IndexError(f"indices out of range for a dataset of size {len(self)}")
+        # with mode='raise' np.take would buffer the result instead of
+        # writing into out, the bounds were checked above
+        return tuple(np.take(a, indices, axis=0, out=o, mode='clip') for a, o in zip(self.arrays, out))
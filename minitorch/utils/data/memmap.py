@@ -0,0 +1,113 @@
+"""On-disk dataset format for data that does not fit in memory.
+
+A dataset is a directory holding a header.json and one raw binary file per
+field. The header lists, in order, the name, dtype and sample shape of every
+field together with the number of samples, so each file can be opened as an
+np.memmap of shape (length,) + sample shape. Only the pages a batch touches
+are read from disk.
+"""
+
+import json
+import os
+from typing import Dict, Sequence, Tuple, Union
+
+import numpy as np
+
+from minitorch import Tensor
+from .dataset import Dataset
+
+HEADER = 'header.json'
+VERSION = 1
+
+PathLike = Union[str, os.PathLike]
+
+
+class MemmapDataset(Dataset):
+    """Dataset backed by np.memmap files, see the module docstring for the
+    format. Samples are tuples with one row of every field."""
+
+    def __init__(self, path: PathLike, mode: str = 'r'):
+        with open(os.path.join(path, HEADER)) as f:
+            header = json.load(f)
+        if header.get('version') != VERSION:
+            raise ValueError(f"unsupported memmap dataset version {header.get('version')}")
+        self.path = path
+        self.length = header['length']
+        self.names = tuple(field['name'] for field in header['fields'])
+        self.arrays = tuple(
+            np.memmap(os.path.join(path, field['file']), dtype=np.dtype(field['dtype']), mode=mode,
+                      shape=(self.length,) + tuple(field['shape']))
+            for field in header['fields'])
+
+    @classmethod
+    def create(cls, path: PathLike, length: int, **fields: Tuple[tuple, np.dtype]) -> 'MemmapDataset':
+        """Allocate the files of a dataset with length samples, given the sample
+        shape and dtype of every field, and open it for writing. Fill it chunk
+        by chunk through dataset.arrays and call flush() when done."""
+        if not fields:
+            raise ValueError("a memmap dataset needs at least one field")
+        os.makedirs(path, exist_ok=True)
+        header = dict(version=VERSION, length=int(length), fields=[])
+        for name, (shape, dtype) in fields.items():
+            header['fields'].append(dict(name=name, dtype=np.dtype(dtype).str, shape=list(shape),
+                                         file=f'{name}.bin'))
+            nbytes = int(length) * int(np.prod(shape, dtype=np.int64)) * np.dtype(dtype).itemsize
+            with open(os.path.join(path, f'{name}.bin'), 'wb') as f:
+                f.truncate(nbytes)
+        with open(os.path.join(path, HEADER), 'w') as f:
+            json.dump(header, f, indent=2)
+        return cls(path, mode='r+')
+
+    @classmethod
+    def from_arrays(cls, path: PathLike, chunk_size: int = 65536,
+                    **arrays: Union[Tensor, np.ndarray]) -> 'MemmapDataset':
+        """Write arrays sharing their first dimension as a dataset, chunk_size
+        rows at a time, and open it for reading."""
+        arrays = {name: a.data if isinstance(a, Tensor) else a for name, a in arrays.items()}
+        lengths = set(len(a) for a in arrays.values())
+        if len(lengths) != 1:
+            raise ValueError("size mismatch between arrays, they should share the first dimension")
+        length = lengths.pop()
+        dataset = cls.create(path, length, **{name: (a.shape[1:], a.dtype) for name, a in arrays.items()})
+        for target, source in zip(dataset.arrays, arrays.values()):
+            for start in range(0, length, chunk_size):
+                target[start:start + chunk_size] = source[start:start + chunk_size]
+        dataset.flush()
+        return cls(path)
+
+    def flush(self) -> None:
+        for a in self.arrays:
+            a.flush()
+
+    def fields(self) -> Dict[str, np.memmap]:
+        return dict(zip(self.names, self.arrays))
+
+    def __getitem__(self, index: int) -> Tuple[Tensor, ...]:
+        return tuple(Tensor(np.array(a[index])) for a in self.arrays)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def gather(self, indices: Sequence[int], out: Tuple[np.ndarray, ...] = None) -> Tuple[np.ndarray, ...]:
+        """Read a batch, copying contiguous runs of indices as slices so that
+        sequential and block-shuffled batches turn into a few large reads."""
+        indices = np.asarray(indices, dtype=np.intp)
+        if len(indices) and (indices.min() < 0 or indices.max() >= self.length):
+            raise IndexError(f"indices out of range for a dataset of size {self.length}")
+        if out is None:
+            out = tuple(np.empty((len(indices),) + a.shape[1:], dtype=a.dtype) for a in self.arrays)
+        if not len(indices):
+            return out
+        breaks = np.flatnonzero(np.diff(indices) != 1) + 1
+        if 4 * len(breaks) > len(indices):
+            # mostly scattered indices, a fancy read beats a loop over runs
+            for a, o in zip(self.arrays, out):
+                np.take(a, indices, axis=0, out=o, mode='clip')
+            return out
+        starts = np.concatenate(([0], breaks)).tolist()
+        stops = np.concatenate((breaks, [len(indices)])).tolist()
+        for a, o in zip(self.arrays, out):
+            for start, stop in zip(starts, stops):
+                first = int(indices[start])
+                o[start:stop] = a[first:first + stop - start]
+        return out
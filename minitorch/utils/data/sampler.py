@@ -0,0 +1,95 @@
+from abc import ABCMeta, abstractmethod
+from typing import Iterator, List
+
+import numpy as np
+
+
+class Sampler(metaclass=ABCMeta):
+    """Base class for all samplers: an iterable over dataset indices."""
+
+    @abstractmethod
+    def __iter__(self) -> Iterator[int]:
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+
+class SequentialSampler(Sampler):
+    """Samples elements sequentially, always in the same order."""
+
+    def __init__(self, data_source):
+        self.data_source = data_source
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(len(self.data_source)))
+
+    def __len__(self) -> int:
+        return len(self.data_source)
+
+
+class RandomSampler(Sampler):
+    """Samples elements in a new random order every epoch."""
+
+    def __init__(self, data_source, generator: np.random.Generator = None):
+        self.data_source = data_source
+        self.generator = generator if generator is not None else np.random.default_rng()
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.generator.permutation(len(self.data_source)).tolist())
+
+    def __len__(self) -> int:
+        return len(self.data_source)
+
+
+class BlockShuffleSampler(Sampler):
+    """Shuffles the order of contiguous blocks of block_size samples while
+    keeping the samples of a block in order.
+
+    Meant for datasets read from disk: every block is one sequential read, and
+    a batch_size dividing block_size never straddles two blocks.
+    """
+
+    def __init__(self, data_source, block_size: int, generator: np.random.Generator = None):
+        if not isinstance(block_size, int) or block_size <= 0:
+            raise ValueError(f"block_size should be a positive integer, rather than {block_size}")
+        self.data_source = data_source
+        self.block_size = block_size
+        self.generator = generator if generator is not None else np.random.default_rng()
+
+    def __iter__(self) -> Iterator[int]:
+        length = len(self.data_source)
+        num_blocks = (length + self.block_size - 1) // self.block_size
+        for block in self.generator.permutation(num_blocks).tolist():
+            start = block * self.block_size
+            yield from range(start, min(start + self.block_size, length))
+
+    def __len__(self) -> int:
+        return len(self.data_source)
+
+
+class BatchSampler(Sampler):
+    """Groups the indices of another sampler into lists of batch_size."""
+
+    def __init__(self, sampler: Sampler, batch_size: int, drop_last: bool = False):
+        if not isinstance(batch_size, int) or batch_size <= 0:
+            raise ValueError(f"batch_size should be a positive integer, rather than {batch_size}")
+        self.sampler = sampler
+        self.batch_size = batch_size
+        self.drop_last = drop_last
+
+    def __iter__(self) -> Iterator[List[int]]:
+        batch = []
+        for index in self.sampler:
+            batch.append(index)
+            if len(batch) == self.batch_size:
+                yield batch
+                batch = []
+        if batch and not self.drop_last:
+            yield batch
+
+    def __len__(self) -> int:
+        if self.drop_last:
+            return len(self.sampler) // self.batch_size
+        return (len(self.sampler) + self.batch_size - 1) // self.batch_size
@@ -1,11 +1,24 @@
 from .test_add import TestAdd
+from .test_allocator import TestAllocator
+from .test_compile import TestCompile
 from .test_div import TestDiv
+from .test_dtype import TestDtype
+from .test_einsum import TestEinsum
+from .test_engine import TestEngine
 from .test_exp import TestExp
+from .test_grad_mode import TestGradMode
+from .test_lazy import TestLazy
 from .test_matmul import TestMatmul
 from .test_mean import TestMean
 from .test_mul import TestMul
 from .test_neg import TestNeg
+from .test_parallel_engine import TestParallelEngine
 from .test_pow import TestPow
 from .test_relu import TestReLU
+from .test_retain_graph import TestRetainGraph
+from .test_sigmoid import TestSigmoid
+from .test_softmax import TestSoftmax
 from .test_sub import TestSub
 from .test_sum import TestSum
+from .test_tanh import TestTanh
+from .test_view import TestView
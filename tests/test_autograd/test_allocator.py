@@ -0,0 +1,76 @@
+from unittest import TestCase
+
+import numpy as np
+
+from minitorch import Tensor
+from minitorch.autograd import allocator
+from minitorch.autograd.allocator import CachingAllocator
+
+
+class TestAllocator(TestCase):
+
+    def test_reuse(self):
+        pool = CachingAllocator(min_bytes=0)
+        a = pool.empty((4, 256), np.float32)
+        address = a.ctypes.data
+        view = a[1:].T
+        del a
+        # the view keeps the block in use
+        b = pool.empty((4, 256), np.float32)
+        self.assertNotEqual(b.ctypes.data, address)
+        del view
+        c = pool.empty((1024,), np.float32)
+        self.assertEqual(c.ctypes.data, address)
+        # blocks are shared between dtypes and shapes of the same size
+        del c
+        d = pool.empty((2, 256), np.float64)
+        self.assertEqual(d.ctypes.data, address)
+        self.assertEqual(pool.info()['hits'], 2)
+        self.assertEqual(pool.info()['misses'], 2)
+        self.assertEqual(pool.info()['bytes_lent'], 2 * 4096)
+        # small arrays are not pooled
+        pool.min_bytes = 1024
+        pool.empty((8,), np.float32)
+        self.assertEqual(pool.info()['misses'], 2)
+
+    def test_cap(self):
+        pool = CachingAllocator(max_bytes=4096, min_bytes=0)
+        a = pool.empty((512,), np.float32)
+        b = pool.empty((256,), np.float32)
+        del a, b
+        # the dead blocks are evicted to make room for a new size
+        c = pool.empty((1024,), np.float32)
+        self.assertEqual(pool.info()['evictions'], 2)
+        self.assertEqual(pool.info()['bytes_lent'], 4096)
+        # the pool is full of live blocks, this one is left to NumPy
+        d = pool.empty((256,), np.float32)
+        self.assertEqual(d.shape, (256,))
+        self.assertEqual(pool.info()['bytes_lent'], 4096)
+        del c
+        pool.empty_cache()
+        self.assertEqual(pool.info()['bytes_lent'] + pool.info()['bytes_cached'], 0)
+
+    def test_training_step(self):
+        np.random.seed(0)
+        w = np.random.randn(64, 64)
+        x = Tensor(np.random.randn(128, 64))
+
+        def step():
+            weight = Tensor(w, requires_grad=True)
+            h = (x @ weight).tanh().sigmoid()
+            loss = ((h - x) ** 2).mean() + (h * h + h / (1 + h.exp()) - h.relu()).sum()
+            loss.backward()
+            return loss.data, weight.grad.data
+
+        expected = step()
+        allocator.enable_caching_allocator(min_bytes=4096)
+        try:
+            for _ in range(3):
+                loss, grad = step()
+                np.testing.assert_array_equal(loss, expected[0])
+                np.testing.assert_array_equal(grad, expected[1])
+            info = allocator.caching_allocator_info()
+            self.assertGreater(info['hits'], info['misses'])
+        finally:
+            allocator.disable_caching_allocator()
+        self.assertEqual(allocator.caching_allocator_info()['max_bytes'], 0)
@@ -0,0 +1,166 @@
+import threading
+from unittest import TestCase
+
+import numpy as np
+
+import minitorch
+from minitorch import Tensor
+import minitorch.nn as nn
+from minitorch.autograd.compile import _run_traced
+
+
+def make_params():
+    np.random.seed(0)
+    w1 = Tensor(np.random.randn(4, 6), requires_grad=True)
+    b1 = Tensor(np.random.randn(6), requires_grad=True)
+    w2 = Tensor(np.random.randn(6, 3), requires_grad=True)
+    return [w1, b1, w2]
+
+
+def model(params, x, y):
+    w1, b1, w2 = params
+    h = (x @ w1 + b1).tanh()
+    h = h * h.sigmoid() + h.exp() / (1 + h.relu())
+    out = (h.reshape(-1, 6).transpose(0, 1).t() @ w2).unsqueeze(0).expand(2, -1, -1)
+    return ((out - y) ** 2).mean() + out.sum(axis=2).mean() * 0.5 - (-out).permute(2, 1, 0).sum()
+
+
+class TestCompile(TestCase):
+
+    def run_steps(self, compiled, steps=3):
+        params = make_params()
+        fn = lambda x, y: model(params, x, y)
+        if compiled:
+            fn = minitorch.compile(fn)
+        x = Tensor(np.linspace(-1, 1, 20).reshape(5, 4), requires_grad=True)
+        y = Tensor(np.linspace(0, 1, 15).reshape(5, 3))
+        losses = []
+        for _ in range(steps):
+            for p in params:
+                p.grad = None
+            x.grad = None
+            loss = fn(x, y)
+            loss.backward()
+            losses.append(float(loss.data))
+            for p in params:
+                p.data -= 0.01 * p.grad.data
+        return losses, [p.grad.data for p in params] + [x.grad.data], fn
+
+    def test_matches_eager(self):
+        eager_losses, eager_grads, _ = self.run_steps(False)
+        losses, grads, fn = self.run_steps(True)
+        np.testing.assert_allclose(losses, eager_losses)
+        for grad, expected in zip(grads, eager_grads):
+            np.testing.assert_allclose(grad, expected)
+        self.assertEqual((fn.misses, fn.hits), (1, 2))
+
+    def test_module(self):
+        np.random.seed(0)
+        net = nn.Sequential(nn.Linear(3, 5), nn.ReLU(), nn.Linear(5, 1))
+        loss_fn = minitorch.compile(lambda x, y: nn.MSELoss()(net(x), y))
+        x, y = Tensor(np.random.rand(8, 3)), Tensor(np.random.rand(8, 1))
+        for _ in range(2):
+            net.zero_grad()
+            loss_fn(x, y).backward()
+        grads = [p.grad.data.copy() for p in net.parameters()]
+        net.zero_grad()
+        expected = nn.MSELoss()(net(x), y)
+        expected.backward()
+        np.testing.assert_allclose(loss_fn(x, y).data, expected.data)
+        for p, grad in zip(net.parameters(), grads):
+            np.testing.assert_allclose(grad, p.grad.data)
+
+    def test_fallback(self):
+        params = make_params()
+        fn = minitorch.compile(lambda x, y: model(params, x, y))
+        y = Tensor(np.zeros((1, 3)))
+        for rows in (5, 5, 7, 7):
+            x = Tensor(np.ones((rows, 4)))
+            np.testing.assert_allclose(fn(x, y).data, model(params, x, y).data)
+        self.assertEqual((fn.misses, fn.hits), (2, 2))
+
+        # ops without a replay kernel run eagerly
+        softmax = minitorch.compile(lambda x: minitorch.softmax(x * 2).sum())
+        for _ in range(2):
+            self.assertAlmostEqual(float(softmax(Tensor(np.ones((2, 3)))).data), 2.0)
+        self.assertIsNone(softmax.programs[next(iter(softmax.programs))])
+
+        # a captured tensor changing shape triggers a new trace
+        params[1].data = np.zeros((1, 6))
+        fn(Tensor(np.ones((5, 4))), y)
+        self.assertEqual(fn.misses, 3)
+
+        # the non-tensor arguments are part of the key
+        scaled = minitorch.compile(lambda x, mode: x.sum() if mode == 'sum' else x.mean())
+        x = Tensor(np.arange(4.0))
+        self.assertEqual([float(scaled(x, mode).data) for mode in ('sum', 'mean', 'sum')], [6.0, 1.5, 6.0])
+
+    def test_stale_output(self):
+        params = make_params()
+        fn = minitorch.compile(lambda x: (x @ params[0]).sum())
+        x = Tensor(np.ones((2, 4)))
+        fn(x)
+        first = fn(x)
+        fn(x)
+        with self.assertRaises(RuntimeError):
+            first.backward()
+        with minitorch.no_grad():
+            self.assertFalse(fn(x).requires_grad)
+
+    def test_tensor_made_inside(self):
+        w = Tensor(np.ones(3), requires_grad=True)
+        fn = minitorch.compile(lambda x: (Tensor(np.sin(x.data)) * w).sum())
+        for value in (1.0, 2.0, 1.5):
+            x = Tensor(np.full(3, value))
+            self.assertAlmostEqual(float(fn(x).data), 3 * np.sin(value))
+        self.assertIsNone(fn.programs[next(iter(fn.programs))])
+
+    def test_results_survive(self):
+        fn = minitorch.compile(lambda x: (x * 3).sum())
+        losses = [fn(Tensor(np.full(2, value))) for value in (0.5, 1.0, 1.5)]
+        self.assertEqual([float(loss.data) for loss in losses], [3.0, 6.0, 9.0])
+        self.assertEqual(fn.hits, 2)
+
+    def test_data_dependent(self):
+        # control flow on tensor data is not recorded, such calls run eagerly
+        fn = minitorch.compile(lambda x: -x.sum() if x.data.sum() > 0 else (x * 3).sum())
+        results = [float(fn(Tensor(np.full(2, value))).data) for value in (1.0, -1.0, -2.0)]
+        self.assertEqual(results, [-2.0, -6.0, -12.0])
+        self.assertIsNone(fn.programs[next(iter(fn.programs))])
+
+    def test_captured_scalar(self):
+        class Scaled:
+            scale = 2.0
+        m = Scaled()
+        fn = minitorch.compile(lambda x: (x * m.scale).sum())
+        x = Tensor(np.ones(2))
+        results = []
+        for scale in (2.0, 3.0):
+            m.scale = scale
+            results.append(float(fn(x).data))
+        self.assertEqual(results, [4.0, 6.0])
+        self.assertIsNone(fn.programs[next(iter(fn.programs))])
+
+        # constants written in fn are replayed
+        fn = minitorch.compile(lambda x: (x * 2.5).sum(axis=0))
+        for _ in range(2):
+            self.assertEqual(float(fn(x).data), 5.0)
+        self.assertEqual(fn.hits, 1)
+
+    def test_other_threads(self):
+        # ops run by other threads while fn is traced are not recorded
+        other = []
+
+        def eager():
+            other.append(float((Tensor(np.ones(3)) * 4).sum().data))
+
+        def body(x):
+            thread = threading.Thread(target=eager)
+            thread.start()
+            thread.join()
+            return (x * 2).sum()
+
+        trace, output = _run_traced(body, (Tensor(np.ones(2)),), {})
+        self.assertEqual((float(output.data), other), (4.0, [12.0]))
+        self.assertEqual([name for name, _, _ in trace.ops], ['mul', 'sum'])
+        self.assertIsNone(trace.unsupported)
@@ -0,0 +1,78 @@
+from unittest import TestCase
+
+import numpy as np
+
+import minitorch
+from minitorch import Tensor
+import minitorch.nn as nn
+
+
+class TestDtype(TestCase):
+
+    def tearDown(self):
+        minitorch.set_default_dtype(np.float64)
+
+    def test_default_dtype(self):
+        self.assertEqual(minitorch.get_default_dtype(), np.float64)
+        self.assertEqual(Tensor([1.0, 2.0]).dtype, np.float64)
+        minitorch.set_default_dtype(np.float32)
+        self.assertEqual(Tensor([1.0, 2.0]).dtype, np.float32)
+        self.assertEqual(Tensor(1.5).dtype, np.float32)
+        self.assertEqual(Tensor([1, 2]).dtype.kind, 'i')
+        self.assertEqual(Tensor(np.ones(2)).dtype, np.float64)
+        self.assertEqual(Tensor([1.0], dtype=np.float16).dtype, np.float16)
+        self.assertEqual(minitorch.rand(2, 3).dtype, np.float32)
+        self.assertEqual(nn.Linear(3, 2).weight.dtype, np.float32)
+        self.assertEqual(nn.Linear(3, 2, dtype=np.float16).bias.dtype, np.float16)
+        with self.assertRaises(TypeError):
+            minitorch.set_default_dtype(np.int32)
+
+    def test_dtype_propagation(self):
+        x = Tensor(np.random.randn(4, 3).astype(np.float32), requires_grad=True)
+        w = Tensor(np.random.randn(3, 5).astype(np.float32), requires_grad=True)
+        y = (x @ w + 1.0) * 2 - 0.5
+        y = y / 3.0 + 1 / (y ** 2 + 1)
+        y = y.relu() + y.exp().sigmoid() + y.tanh() - (-y).t().t()
+        y = minitorch.softmax(y) + minitorch.log_softmax(y)
+        y = minitorch.einsum('ij,ij->i', y, y)
+        loss = y.mean() + y.sum() + minitorch.cross_entropy(x, np.array([0, 1, 2, 0]))
+        self.assertEqual(loss.dtype, np.float32)
+        loss.backward()
+        self.assertEqual(x.grad.dtype, np.float32)
+        self.assertEqual(w.grad.dtype, np.float32)
+
+    def test_float16_accumulation(self):
+        data = np.full(100000, 0.1, dtype=np.float16)
+        t = Tensor(data, requires_grad=True)
+        total = t.sum()
+        self.assertEqual(total.dtype, np.float16)
+        np.testing.assert_allclose(float(total.data), data.astype(np.float32).sum(), rtol=1e-3)
+        np.testing.assert_allclose(float(t.mean().data), 0.1, rtol=1e-3)
+        total.backward()
+        self.assertEqual(t.grad.dtype, np.float16)
+
+        a = np.random.rand(8, 4096).astype(np.float16)
+        b = np.random.rand(4096, 2).astype(np.float16)
+        t1 = Tensor(a, requires_grad=True)
+        t2 = Tensor(b, requires_grad=True)
+        output = t1 @ t2
+        self.assertEqual(output.dtype, np.float16)
+        expected = a.astype(np.float32) @ b.astype(np.float32)
+        np.testing.assert_allclose(output.data.astype(np.float32), expected, rtol=1e-3)
+        output.sum().backward()
+        self.assertEqual(t1.grad.dtype, np.float16)
+        self.assertEqual(t2.grad.dtype, np.float16)
+
+    def test_astype(self):
+        t = Tensor(np.ones(3, dtype=np.float16), requires_grad=True)
+        output = t.astype(np.float32)
+        self.assertEqual(output.dtype, np.float32)
+        output.sum().backward()
+        self.assertEqual(t.grad.dtype, np.float16)
+        self.assertEqual(t.grad.data.tolist(), [1.0, 1.0, 1.0])
+
+    def test_module_to(self):
+        model = nn.Sequential(nn.Linear(3, 4), nn.ReLU(), nn.Linear(4, 1)).to(np.float32)
+        self.assertTrue(all(p.dtype == np.float32 for p in model.parameters()))
+        model(Tensor(np.ones((2, 3), dtype=np.float32))).sum().backward()
+        self.assertTrue(all(p.grad.dtype == np.float32 for p in model.parameters()))
@@ -0,0 +1,68 @@
+from unittest import TestCase
+
+import numpy as np
+
+import minitorch
+from minitorch import Tensor
+from minitorch.autograd.memory import saved_tensors_report
+
+
+def numerical_grad(fn, arrays, index, grad, eps=1e-6):
+    expected = np.zeros_like(arrays[index])
+    for position in np.ndindex(arrays[index].shape):
+        shifted = [a.copy() for a in arrays]
+        shifted[index][position] += eps
+        upper = (fn(*shifted) * grad).sum()
+        shifted[index][position] -= 2 * eps
+        lower = (fn(*shifted) * grad).sum()
+        expected[position] = (upper - lower) / (2 * eps)
+    return expected
+
+
+class TestEinsum(TestCase):
+
+    def check(self, subscripts, *shapes):
+        arrays = [np.random.randn(*shape) for shape in shapes]
+        tensors = [Tensor(a, requires_grad=True) for a in arrays]
+        output = minitorch.einsum(subscripts, *tensors)
+        np.testing.assert_allclose(output.data, np.einsum(subscripts, *arrays))
+        grad = np.random.randn(*output.shape)
+        output.backward(Tensor(grad))
+        for i, t in enumerate(tensors):
+            expected = numerical_grad(lambda *a: np.einsum(subscripts, *a), arrays, i, grad)
+            np.testing.assert_allclose(t.grad.data, expected, atol=1e-6)
+            self.assertEqual(t.grad.shape, t.shape)
+
+    def test_einsum(self):
+        self.check('ij,jk->ik', (2, 3), (3, 4))
+        self.check('bij,bjk->bik', (2, 3, 4), (2, 4, 5))
+        self.check('ij,ij', (2, 3), (2, 3))
+        self.check('ij->j', (3, 4))
+        self.check('i,j->ij', (3,), (4,))
+        self.check('...ij,jk', (2, 1, 3, 4), (4, 2))
+        self.check('...ij,...jk->...ik', (2, 1, 3, 4), (5, 4, 2))
+        self.check('bhqd,bhkd->bhqk', (2, 3, 4, 5), (2, 1, 6, 5))
+        self.check('ij,jk,kl->il', (2, 3), (3, 4), (4, 5))
+
+    def test_einsum_partial_grad(self):
+        t1 = Tensor(np.random.randn(3, 4), requires_grad=True)
+        t2 = Tensor(np.random.randn(4, 2))
+        minitorch.einsum('ij,jk->ik', t1, t2).sum().backward()
+        np.testing.assert_allclose(t1.grad.data, np.broadcast_to(t2.data.sum(axis=1), (3, 4)))
+        self.assertIsNone(t2.grad)
+
+    def test_einsum_invalid(self):
+        with self.assertRaises(ValueError):
+            minitorch.einsum('ij,jk->ik', Tensor(np.ones((2, 3))))
+        with self.assertRaises(ValueError):
+            minitorch.einsum('ijk->i', Tensor(np.ones((2, 3))))
+        with self.assertRaises(NotImplementedError):
+            minitorch.einsum('ii->i', Tensor(np.ones((2, 2)), requires_grad=True))
+
+    def test_saved_tensors_report(self):
+        t1 = Tensor(np.ones((3, 4)), requires_grad=True)
+        t2 = Tensor(np.ones((4, 5)), requires_grad=True)
+        output = minitorch.einsum('ij,jk->ik', t1, t2).sum()
+        self.assertEqual(saved_tensors_report(output)['EinsumBackward'], t1.data.nbytes + t2.data.nbytes)
+        output.backward()
+        self.assertEqual(saved_tensors_report(output)['EinsumBackward'], 0)
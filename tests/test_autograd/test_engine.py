@@ -0,0 +1,64 @@
+import time
+from unittest import TestCase
+
+import numpy as np
+
+from minitorch import Tensor
+
+
+class TestEngine(TestCase):
+
+    def test_shared_subgraph(self):
+        # t3 is consumed twice, so its gradient must be summed before it runs
+        t1 = Tensor([1.0, 2.0], requires_grad=True)
+        t2 = t1 * t1
+        t3 = t2 + t2
+        t4 = t3 * t3
+        t4.backward(Tensor([1.0, 1.0]))
+        # t4 = 4 * t1^4
+        self.assertEqual(t1.grad.data.tolist(), [16.0, 128.0])
+
+    def test_deep_residual_graph(self):
+        # every block fans out twice, so the number of paths is 2 ** depth
+        t1 = Tensor([1.0, 2.0], requires_grad=True)
+        t2 = t1
+        for _ in range(200):
+            t2 = t2 + t2 * Tensor(0.0)
+        start = time.perf_counter()
+        t2.sum().backward()
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertEqual(t1.grad.data.tolist(), [1.0, 1.0])
+
+    def test_fan_in_does_not_mutate_inputs(self):
+        t1 = Tensor([1.0, 2.0], requires_grad=True)
+        t2 = Tensor([3.0, 4.0], requires_grad=True)
+        t3 = t1 + t2
+        t4 = t3 + t3 + t3
+        grad = Tensor([1.0, 1.0])
+        t4.backward(grad)
+        self.assertEqual(grad.data.tolist(), [1.0, 1.0])
+        self.assertEqual(t1.grad.data.tolist(), [3.0, 3.0])
+        self.assertEqual(t2.grad.data.tolist(), [3.0, 3.0])
+        # leaves fed by the same gradient array must not share their grads
+        self.assertFalse(np.shares_memory(t1.grad.data, t2.grad.data))
+
+    def test_accumulate_across_backward(self):
+        t1 = Tensor([1.0, 2.0], requires_grad=True)
+        grad = Tensor([1.0, 1.0])
+        (t1 * 2).backward(grad)
+        (t1 * 3).backward(grad)
+        self.assertEqual(t1.grad.data.tolist(), [5.0, 5.0])
+        self.assertEqual(grad.data.tolist(), [1.0, 1.0])
+
+    def test_post_accumulate_grad_hook(self):
+        t1 = Tensor([1.0, 2.0], requires_grad=True)
+        seen = []
+        handle = t1.register_post_accumulate_grad_hook(lambda t: seen.append(t.grad.data.tolist()))
+        # both uses are summed before the leaf is reached, so the hook fires once
+        (t1 * t1 + t1).sum().backward()
+        self.assertEqual(seen, [[3.0, 5.0]])
+        handle.remove()
+        (t1 * 2).sum().backward()
+        self.assertEqual(len(seen), 1)
+        with self.assertRaises(RuntimeError):
+            (t1 * 2).register_post_accumulate_grad_hook(lambda t: None)
@@ -0,0 +1,80 @@
+import threading
+from unittest import TestCase
+
+import minitorch
+from minitorch import Tensor
+import minitorch.nn as nn
+
+
+class TestGradMode(TestCase):
+
+    def test_no_grad(self):
+        t1 = Tensor([1.0, 2.0], requires_grad=True)
+        with minitorch.no_grad():
+            self.assertFalse(minitorch.is_grad_enabled())
+            t2 = (t1 * t1).relu().exp().sum()
+        self.assertTrue(minitorch.is_grad_enabled())
+        self.assertFalse(t2.requires_grad)
+        self.assertIsNone(t2.grad_fn)
+        # leaf tensors are not touched
+        self.assertIsNone(t1.grad_fn)
+
+    def test_no_grad_decorator(self):
+        linear = nn.Linear(3, 2)
+
+        @minitorch.no_grad()
+        def predict(input):
+            return linear(input)
+
+        output = predict(minitorch.rand(4, 3))
+        self.assertIsNone(output.grad_fn)
+        self.assertIsNone(linear.weight.grad_fn)
+        self.assertTrue(minitorch.is_grad_enabled())
+
+    def test_enable_grad(self):
+        t1 = Tensor([1.0, 2.0], requires_grad=True)
+        with minitorch.no_grad():
+            with minitorch.enable_grad():
+                t2 = (t1 * t1).sum()
+            t3 = t1 * t1
+        self.assertTrue(t2.requires_grad)
+        self.assertFalse(t3.requires_grad)
+        t2.backward()
+        self.assertEqual(t1.grad.data.tolist(), [2.0, 4.0])
+
+    def test_thread_local(self):
+        results = []
+
+        def worker():
+            results.append(minitorch.is_grad_enabled())
+
+        with minitorch.no_grad():
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+        self.assertEqual(results, [True])
+
+    def test_inference_mode(self):
+        t1 = Tensor([1.0, 2.0], requires_grad=True)
+        with minitorch.inference_mode():
+            self.assertFalse(minitorch.is_grad_enabled())
+            t2 = t1 * 2
+        self.assertTrue(minitorch.is_grad_enabled())
+        self.assertTrue(t2.is_inference)
+        self.assertIsNone(t2.grad_fn)
+        self.assertFalse(t1.is_inference)
+        # inference tensors can not be saved into a graph later on
+        with self.assertRaises(RuntimeError):
+            t1 * t2
+        # nor take a gradient
+        with minitorch.inference_mode():
+            t4 = Tensor([1.0, 2.0], requires_grad=True)
+        with self.assertRaises(RuntimeError):
+            (t4 * 2).sum()
+        # but may enter ops that do not save them
+        (t1 + t2).sum().backward()
+        self.assertEqual(t1.grad.data.tolist(), [1.0, 1.0])
+        # but are fine as plain data
+        with minitorch.no_grad():
+            t3 = t1 * t2
+        self.assertEqual(t3.data.tolist(), [2.0, 8.0])
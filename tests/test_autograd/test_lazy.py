@@ -0,0 +1,87 @@
+from unittest import TestCase
+
+import numpy as np
+
+import minitorch
+from minitorch import Tensor
+from minitorch.autograd import lazy
+from minitorch.autograd.engine import collect_graph
+import minitorch.nn as nn
+
+
+def sigmoid_mse(x, target):
+    return nn.MSELoss()(nn.Sigmoid()(x) * x.relu(), target)
+
+
+class TestLazy(TestCase):
+
+    def check_against_eager(self, size):
+        data = np.random.randn(size)
+        target = Tensor(np.random.randn(size))
+
+        x = Tensor(data, requires_grad=True)
+        expected = sigmoid_mse(x, target)
+        expected.backward()
+
+        y = Tensor(data, requires_grad=True)
+        with minitorch.lazy_mode():
+            loss = sigmoid_mse(y, target)
+        loss.backward()
+        np.testing.assert_allclose(loss.data, expected.data)
+        np.testing.assert_allclose(y.grad.data, x.grad.data)
+        # the elementwise part collapses into a single backward node
+        node_types = [type(node).__name__ for node in collect_graph(loss.grad_fn)[0]]
+        self.assertEqual(node_types, ['MeanBackward', 'FusedBackward', 'AccumulateGrad'])
+
+    def test_numpy_kernels(self):
+        numexpr = lazy.numexpr
+        lazy.numexpr = None
+        try:
+            self.check_against_eager(10)
+            self.check_against_eager(2 * lazy.NUMEXPR_MIN_SIZE)
+        finally:
+            lazy.numexpr = numexpr
+
+    def test_numexpr_kernels(self):
+        if lazy.numexpr is None:
+            self.skipTest("numexpr is not installed")
+        self.check_against_eager(2 * lazy.NUMEXPR_MIN_SIZE)
+
+    def test_scalar_operands(self):
+        data = np.random.randn(5).astype(np.float32)
+        x = Tensor(data, requires_grad=True)
+        with minitorch.lazy_mode():
+            loss = (((x * 2).exp() + 1) * 3 - 0.5).relu().sum()
+        node_types = [type(node).__name__ for node in collect_graph(loss.grad_fn)[0]]
+        self.assertEqual(node_types, ['SumBackward', 'FusedBackward', 'AccumulateGrad'])
+        self.assertEqual(loss.dtype, np.float32)
+        expected = np.maximum((np.exp(data * 2) + 1) * 3 - 0.5, 0).sum()
+        np.testing.assert_allclose(loss.data, expected, rtol=1e-6)
+
+    def test_materialize_on_demand(self):
+        t1 = Tensor([1.0, -2.0], requires_grad=True)
+        with minitorch.lazy_mode():
+            t2 = (t1 * 2).relu() + 1
+            self.assertIsNone(t2._data)
+            self.assertEqual(t2.shape, (2,))
+            self.assertEqual(t2.data.tolist(), [3.0, 1.0])
+            t3 = t2 * t2
+        t3.backward(Tensor([1.0, 1.0]))
+        self.assertEqual(t1.grad.data.tolist(), [12.0, 0.0])
+
+    def test_broadcast(self):
+        t1 = Tensor([[1.0, 2.0], [3.0, 4.0]], requires_grad=True)
+        t2 = Tensor([2.0], requires_grad=True)
+        with minitorch.lazy_mode():
+            t3 = t1 * t2 - t2
+        t3.backward(Tensor([[1.0, 1.0], [1.0, 1.0]]))
+        self.assertEqual(t3.data.tolist(), [[0.0, 2.0], [4.0, 6.0]])
+        self.assertEqual(t1.grad.data.tolist(), [[2.0, 2.0], [2.0, 2.0]])
+        self.assertEqual(t2.grad.data.tolist(), [6.0])
+
+    def test_no_grad(self):
+        t1 = Tensor([1.0, 2.0], requires_grad=True)
+        with minitorch.lazy_mode(), minitorch.no_grad():
+            t2 = t1.exp() + 1
+        self.assertIsNone(t2.grad_fn)
+        self.assertIsNone(t1.grad_fn)
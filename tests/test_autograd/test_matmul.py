@@ -1,5 +1,7 @@
 from unittest import TestCase
 
+import numpy as np
+
 from minitorch import Tensor
 
 
@@ -34,3 +36,26 @@ class TestMatmul(TestCase):
         t3.backward(Tensor([[1.0, 2.0], [3.0, 4.0], [3.0, 5.0]]))
         self.assertEqual(t1.grad.data.tolist(), [[8.0, 11.0], [18.0, 25.0], [21.0, 29.0]])
         self.assertEqual(t2.grad.data.tolist(), [[16.0, 25.0], [23.0, 36.0]])
+
+    def test_matmul_batched(self):
+        shapes = [((2, 3, 4), (2, 4, 5)), ((2, 3, 4), (4, 5)), ((4,), (2, 4, 5)), ((2, 1, 3, 4), (5, 4, 2)),
+                  ((2, 3, 4), (4,)), ((4,), (4,)), ((3, 4), (4,))]
+        for shape1, shape2 in shapes:
+            a1 = np.random.randn(*shape1)
+            a2 = np.random.randn(*shape2)
+            t1 = Tensor(a1, requires_grad=True)
+            t2 = Tensor(a2, requires_grad=True)
+            t3 = t1 @ t2
+            np.testing.assert_allclose(t3.data, a1 @ a2)
+            grad = np.random.randn(*t3.shape)
+            t3.backward(Tensor(grad))
+            for t, index in ((t1, 0), (t2, 1)):
+                expected = np.zeros(t.shape)
+                for position in np.ndindex(t.shape):
+                    arrays = [a1.copy(), a2.copy()]
+                    arrays[index][position] += 1e-6
+                    upper = ((arrays[0] @ arrays[1]) * grad).sum()
+                    arrays[index][position] -= 2e-6
+                    lower = ((arrays[0] @ arrays[1]) * grad).sum()
+                    expected[position] = (upper - lower) / 2e-6
+                np.testing.assert_allclose(t.grad.data, expected, atol=1e-6)
@@ -1,5 +1,7 @@
 from unittest import TestCase
 
+import numpy as np
+
 from minitorch import Tensor
 
 
@@ -33,3 +35,15 @@ class TestMean(TestCase):
         t2 = t1.mean()
         t2.backward(Tensor(1.0))
         self.assertEqual(t1.grad.data.tolist(), [[1/6, 1/6, 1/6], [1/6, 1/6, 1/6]])
+
+    def test_mean_view(self):
+        # the gradient of a full reduction takes O(1) memory
+        t1 = Tensor(np.ones((256, 256)), requires_grad=True)
+        t2 = t1.mean()
+        grad = t2.grad_fn(Tensor(np.ones(())))[0]
+        self.assertEqual(grad.data.strides, (0, 0))
+        self.assertEqual(grad.data[0, 0], 1 / 65536)
+
+        t1 = Tensor([[1., 2.], [3., 4.]], requires_grad=True)
+        t1.mean(axis=-1).backward(Tensor([1., 2.]))
+        self.assertEqual(t1.grad.data.tolist(), [[0.5, 0.5], [1., 1.]])
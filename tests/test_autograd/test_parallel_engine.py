@@ -0,0 +1,68 @@
+from unittest import TestCase
+
+import numpy as np
+
+from minitorch import Tensor
+from minitorch.autograd import engine
+from minitorch.autograd.engine import Engine
+import minitorch.nn as nn
+from minitorch.utils import checkpoint
+
+
+def build_graph(x, weights):
+    # parallel heads sharing an input, summed back together
+    heads = [(x @ w).relu() for w in weights]
+    out = heads[0]
+    for head in heads[1:]:
+        out = out + head * head
+    return out.sum() + (x * x).sum()
+
+
+class TestParallelEngine(TestCase):
+
+    def run_graph(self, num_threads):
+        np.random.seed(0)
+        x = Tensor(np.random.randn(16, 8), requires_grad=True)
+        weights = [Tensor(np.random.randn(8, 8), requires_grad=True) for _ in range(4)]
+        loss = build_graph(x, weights)
+        Engine(num_threads=num_threads).execute(loss, Tensor(1.0))
+        return [x.grad.data] + [w.grad.data for w in weights]
+
+    def test_matches_serial(self):
+        serial = self.run_graph(1)
+        for _ in range(5):
+            for expected, grad in zip(serial, self.run_graph(4)):
+                # the accumulation order is the serial one, so results are bitwise equal
+                np.testing.assert_array_equal(grad, expected)
+
+    def test_constant_branch_and_errors(self):
+        x = Tensor(np.ones(3), requires_grad=True)
+        z = Tensor(np.ones(3), requires_grad=False)
+        loss = (x * 2).sum() + (z + z).sum()
+        Engine(num_threads=2).execute(loss, Tensor(1.0))
+        np.testing.assert_array_equal(x.grad.data, 2 * np.ones(3))
+
+        loss = (x * 2).sum()
+        Engine(num_threads=2).execute(loss, Tensor(1.0))
+        with self.assertRaises(RuntimeError):
+            Engine(num_threads=2).execute(loss, Tensor(1.0))
+        with self.assertRaises(ValueError):
+            Engine(num_threads=0)
+
+    def test_default_num_threads(self):
+        self.assertEqual(engine.get_num_threads(), 1)
+        engine.set_num_threads(3)
+        try:
+            np.random.seed(0)
+            model = nn.Sequential(nn.Linear(4, 8), nn.ReLU(), nn.Linear(8, 8), nn.ReLU(), nn.Linear(8, 1))
+            x = Tensor(np.random.randn(5, 4), requires_grad=True)
+            # the checkpoint runs a nested backward inside a pool thread
+            checkpoint(model, x).sum().backward()
+            grads = [p.grad.data.copy() for p in model.parameters()]
+        finally:
+            engine.set_num_threads(1)
+        model.zero_grad()
+        x.grad = None
+        model(x).sum().backward()
+        for p, grad in zip(model.parameters(), grads):
+            np.testing.assert_allclose(grad, p.grad.data)
@@ -0,0 +1,84 @@
+import weakref
+from unittest import TestCase
+
+import numpy as np
+
+import minitorch
+from minitorch import Tensor
+from minitorch.autograd.engine import Engine
+from minitorch.autograd.memory import saved_tensors_report
+from minitorch.autograd.node import Node, collect_next_edges
+
+
+class StopGradient(Node):
+
+    def apply(self, grad_output: Tensor) -> list:
+        return [None]
+
+
+class TestRetainGraph(TestCase):
+
+    def test_release_saved_tensors(self):
+        t1 = Tensor([1.0, 2.0], requires_grad=True)
+        t2 = (t1 * t1).exp().sum()
+        t2.backward()
+        self.assertIsNone(t2.grad_fn.next_edges[0].node.output)
+        with self.assertRaises(RuntimeError):
+            t2.backward()
+
+    def test_release_skipped(self):
+        # nodes no gradient reaches are released too
+        for num_threads in (1, 2):
+            t1 = Tensor([1.0, 2.0], requires_grad=True)
+            t2 = t1.exp()
+            stop = StopGradient()
+            stop.set_next_edges(collect_next_edges(t2))
+            t3 = Tensor(t2.data.sum(), requires_grad=True, grad_fn=stop)
+            Engine(num_threads=num_threads).execute(t3, Tensor(1.0))
+            self.assertIsNone(t2.grad_fn.output)
+            self.assertIsNone(t1.grad)
+
+    def test_release_fused(self):
+        t1 = Tensor([1.0, 2.0], requires_grad=True)
+        h = t1 @ Tensor(np.ones((2, 3)))
+        with minitorch.lazy_mode():
+            t2 = (h * h).exp().sum()
+        t2.backward()
+        fused = t2.grad_fn.next_edges[0].node
+        self.assertEqual(type(fused).__name__, 'FusedBackward')
+        self.assertEqual(fused.saved_tensors(), [])
+        # nothing keeps the input of the fused node alive anymore
+        ref = weakref.ref(h)
+        del h
+        self.assertIsNone(ref())
+        with self.assertRaises(RuntimeError):
+            t2.backward()
+
+    def test_retain_graph(self):
+        t1 = Tensor([1.0, 2.0], requires_grad=True)
+        t2 = (t1 * t1).sum()
+        t2.backward(retain_graph=True)
+        t2.backward()
+        self.assertEqual(t1.grad.data.tolist(), [4.0, 8.0])
+
+    def test_graph_without_saved_tensors(self):
+        t1 = Tensor([1.0, 2.0], requires_grad=True)
+        t2 = (t1 + t1).sum()
+        t2.backward()
+        t2.backward()
+        self.assertEqual(t1.grad.data.tolist(), [4.0, 4.0])
+
+    def test_saved_tensors_report(self):
+        t1 = Tensor(np.ones((4, 8)), requires_grad=True)
+        t2 = Tensor(np.ones((8, 2)), requires_grad=True)
+        t3 = (t1 @ t2).relu()
+        t4 = (t3 * t3).sum()
+        report = saved_tensors_report(t4)
+        self.assertEqual(report['MatMulBackward'], t1.data.nbytes + t2.data.nbytes)
+        self.assertEqual(report['ReluBackward'], 4 * 2 * 8)
+        self.assertEqual(report['MulBackward'], 4 * 2 * 8)
+        self.assertEqual(report['SumBackward'], 0)
+        self.assertEqual(list(report)[0], 'MatMulBackward')
+
+        t4.backward()
+        self.assertEqual(sum(saved_tensors_report(t4).values()), 0)
@@ -0,0 +1,33 @@
+from unittest import TestCase
+
+import numpy as np
+
+from minitorch import Tensor
+
+
+class TestSigmoid(TestCase):
+
+    def test_sigmoid(self):
+        t1 = Tensor(0.0)
+        t2 = t1.sigmoid()
+        self.assertEqual(t2.data.tolist(), 0.5)
+
+        t1 = Tensor(0.0, requires_grad=True)
+        t2 = t1.sigmoid()
+        t2.backward()
+        self.assertEqual(t1.grad.data.tolist(), 0.25)
+
+        t1 = Tensor([-1.0, 2.0], requires_grad=True)
+        t2 = t1.sigmoid()
+        t2.backward(Tensor([1.0, 1.0]))
+        expected = 1 / (1 + np.exp(-np.array([-1.0, 2.0])))
+        np.testing.assert_allclose(t2.data, expected)
+        np.testing.assert_allclose(t1.grad.data, expected * (1 - expected))
+
+    def test_stability(self):
+        t1 = Tensor([-1000.0, 1000.0], requires_grad=True)
+        with np.errstate(over='raise', invalid='raise'):
+            t2 = t1.sigmoid()
+            t2.backward(Tensor([1.0, 1.0]))
+        self.assertEqual(t2.data.tolist(), [0.0, 1.0])
+        self.assertEqual(t1.grad.data.tolist(), [0.0, 0.0])
@@ -0,0 +1,53 @@
+from unittest import TestCase
+
+import numpy as np
+
+import minitorch
+from minitorch import Tensor
+
+
+def numerical_grad(fn, data, grad, eps=1e-6):
+    result = np.zeros_like(data)
+    for index in np.ndindex(data.shape):
+        shifted = data.copy()
+        shifted[index] += eps
+        upper = (fn(shifted) * grad).sum()
+        shifted[index] -= 2 * eps
+        lower = (fn(shifted) * grad).sum()
+        result[index] = (upper - lower) / (2 * eps)
+    return result
+
+
+class TestSoftmax(TestCase):
+
+    def test_softmax(self):
+        data = np.random.randn(3, 4)
+        grad = np.random.randn(3, 4)
+        for axis in (0, 1, -1):
+            t1 = Tensor(data, requires_grad=True)
+            t2 = minitorch.softmax(t1, axis=axis)
+            t2.backward(Tensor(grad))
+            exp = np.exp(data)
+            np.testing.assert_allclose(t2.data, exp / exp.sum(axis=axis, keepdims=True))
+            expected = numerical_grad(lambda x: minitorch.softmax(Tensor(x), axis=axis).data, data, grad)
+            np.testing.assert_allclose(t1.grad.data, expected, atol=1e-6)
+
+    def test_log_softmax(self):
+        data = np.random.randn(3, 4)
+        grad = np.random.randn(3, 4)
+        for axis in (0, 1):
+            t1 = Tensor(data, requires_grad=True)
+            t2 = minitorch.log_softmax(t1, axis=axis)
+            t2.backward(Tensor(grad))
+            exp = np.exp(data)
+            np.testing.assert_allclose(t2.data, np.log(exp / exp.sum(axis=axis, keepdims=True)))
+            expected = numerical_grad(lambda x: minitorch.log_softmax(Tensor(x), axis=axis).data, data, grad)
+            np.testing.assert_allclose(t1.grad.data, expected, atol=1e-6)
+
+    def test_stability(self):
+        t1 = Tensor([[1000.0, 0.0, -1000.0]], requires_grad=True)
+        with np.errstate(over='raise'):
+            t2 = minitorch.log_softmax(t1)
+            t3 = minitorch.softmax(t1)
+        np.testing.assert_allclose(t2.data, [[0.0, -1000.0, -2000.0]])
+        np.testing.assert_allclose(t3.data, [[1.0, 0.0, 0.0]])
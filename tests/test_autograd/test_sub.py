@@ -96,3 +96,10 @@ class TestSub(TestCase):
         t3.backward(Tensor([[1.0, 1.0], [1.0, 1.0]]))
         self.assertEqual(t1.grad.data.tolist(), [[1.0, 1.0], [1.0, 1.0]])
         self.assertEqual(t2.grad.data.tolist(), [-2.0, -2.0])
+
+    def test_scalar_rsub(self):
+        t1 = Tensor([1.0, 2.0], requires_grad=True)
+        t2 = 2 - t1
+        self.assertEqual(t2.data.tolist(), [1.0, 0.0])
+        t2.backward(Tensor([1.0, 1.0]))
+        self.assertEqual(t1.grad.data.tolist(), [-1.0, -1.0])
@@ -1,5 +1,7 @@
 from unittest import TestCase
 
+import numpy as np
+
 from minitorch import Tensor
 
 
@@ -33,3 +35,24 @@ class TestSum(TestCase):
         t2 = t1.sum()
         t2.backward(Tensor(1.0))
         self.assertEqual(t1.grad.data.tolist(), [[1., 1., 1.], [1., 1., 1.]])
+
+    def test_sum_axes(self):
+        # (2, 3, 4) -> (3, ), negative axes
+        t1 = Tensor(np.ones((2, 3, 4)), requires_grad=True)
+        t2 = t1.sum(axis=(0, -1))
+        t2.backward(Tensor([1., 2., 3.]), retain_graph=True)
+        self.assertEqual(t1.grad.data[1].tolist(), [[1.] * 4, [2.] * 4, [3.] * 4])
+        # the backward is repeatable and hands a view of the output gradient
+        self.assertEqual(t2.grad_fn.axis, (0, -1))
+        grad = t2.grad_fn(Tensor([1., 2., 3.]))[0]
+        self.assertEqual(grad.shape, (2, 3, 4))
+        self.assertFalse(grad.data.flags.writeable)
+        self.assertEqual(grad.data.strides[0], 0)
+
+    def test_unbroadcast(self):
+        # (2, 3, 4) + (3, 1) sums the gradient over axes 0 and 2 at once
+        t1 = Tensor(np.ones((2, 3, 4)), requires_grad=True)
+        t2 = Tensor(np.ones((3, 1)), requires_grad=True)
+        (t1 + t2).backward(Tensor(np.arange(24.).reshape(2, 3, 4)))
+        self.assertEqual(t2.grad.shape, (3, 1))
+        self.assertEqual(t2.grad.data.tolist(), [[60.], [92.], [124.]])
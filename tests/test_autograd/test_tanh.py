@@ -0,0 +1,22 @@
+from unittest import TestCase
+
+import numpy as np
+
+from minitorch import Tensor
+
+
+class TestTanh(TestCase):
+
+    def test_tanh(self):
+        t1 = Tensor(0.0, requires_grad=True)
+        t2 = t1.tanh()
+        t2.backward()
+        self.assertEqual(t2.data.tolist(), 0.0)
+        self.assertEqual(t1.grad.data.tolist(), 1.0)
+
+        t1 = Tensor([-1.0, 2.0], requires_grad=True)
+        t2 = t1.tanh()
+        t2.backward(Tensor([1.0, 1.0]))
+        expected = np.tanh([-1.0, 2.0])
+        np.testing.assert_allclose(t2.data, expected)
+        np.testing.assert_allclose(t1.grad.data, 1 - expected ** 2)
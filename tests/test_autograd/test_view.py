@@ -0,0 +1,73 @@
+from unittest import TestCase
+
+import numpy as np
+
+from minitorch import Tensor
+
+
+class TestView(TestCase):
+
+    def check_grad(self, fn, shape):
+        data = np.random.randn(*shape)
+        t = Tensor(data, requires_grad=True)
+        output = fn(t)
+        grad = np.random.randn(*output.shape)
+        output.backward(Tensor(grad))
+        expected = np.zeros(shape)
+        for index in np.ndindex(shape):
+            shifted = data.copy()
+            shifted[index] += 1.0
+            expected[index] = ((fn(Tensor(shifted)).data - output.data) * grad).sum()
+        np.testing.assert_allclose(t.grad.data, expected, atol=1e-10)
+        self.assertEqual(t.grad.dtype, t.dtype)
+
+    def test_getitem(self):
+        t = Tensor(np.arange(12.0).reshape(3, 4), requires_grad=True)
+        row = t[1]
+        self.assertEqual(row.data.tolist(), [4.0, 5.0, 6.0, 7.0])
+        self.assertTrue(np.shares_memory(row.data, t.data))
+        self.check_grad(lambda t: t[1:, ::2], (3, 4))
+        self.check_grad(lambda t: t[..., 1, None], (2, 3, 4))
+        self.check_grad(lambda t: t[np.array([0, 2, 0, 0])], (3, 4))
+        self.check_grad(lambda t: t[[-1, 1, -1]], (5,))
+        self.check_grad(lambda t: t[np.array([0, 1, 1]), np.array([2, 2, 2])], (3, 4))
+        self.check_grad(lambda t: t[:, [3, 3, 0]], (3, 4))
+        mask = np.random.rand(3, 4) > 0.5
+        self.check_grad(lambda t: t[mask], (3, 4))
+        self.check_grad(lambda t: t[Tensor(np.array([1, 1]))], (2, 3))
+        self.check_grad(lambda t: t[np.array([[0, 1], [1, 1]])], (2, 3))
+
+    def test_getitem_float32(self):
+        t = Tensor(np.ones((3, 2), dtype=np.float32), requires_grad=True)
+        t[[0, 0, 2]].sum().backward()
+        self.assertEqual(t.grad.dtype, np.float32)
+        self.assertEqual(t.grad.data.tolist(), [[2.0, 2.0], [0.0, 0.0], [1.0, 1.0]])
+
+    def test_reshape(self):
+        t = Tensor(np.arange(6.0), requires_grad=True)
+        v = t.view(2, 3)
+        self.assertTrue(np.shares_memory(v.data, t.data))
+        self.assertEqual(t.reshape((3, -1)).shape, (3, 2))
+        with self.assertRaises(RuntimeError):
+            v.t().view(6)
+        self.assertEqual(v.t().reshape(6).data.tolist(), [0.0, 3.0, 1.0, 4.0, 2.0, 5.0])
+        self.check_grad(lambda t: t.reshape(3, 4), (2, 6))
+        self.check_grad(lambda t: t.view(-1), (2, 3))
+        self.check_grad(lambda t: t.squeeze(), (1, 3, 1))
+        self.check_grad(lambda t: t.squeeze(0), (1, 3, 1))
+        self.check_grad(lambda t: t.unsqueeze(-1), (2, 3))
+
+    def test_permute(self):
+        t = Tensor(np.arange(24.0).reshape(2, 3, 4))
+        self.assertEqual(t.permute(2, 0, 1).shape, (4, 2, 3))
+        self.assertEqual(t.transpose(0, -1).shape, (4, 3, 2))
+        self.assertTrue(np.shares_memory(t.permute(1, 2, 0).data, t.data))
+        self.check_grad(lambda t: t.permute(2, 0, 1), (2, 3, 4))
+        self.check_grad(lambda t: t.transpose(1, 2) @ Tensor(np.ones((3, 2))), (2, 3, 4))
+
+    def test_expand(self):
+        t = Tensor(np.arange(3.0).reshape(3, 1))
+        e = t.expand(2, -1, 4)
+        self.assertEqual(e.shape, (2, 3, 4))
+        self.assertTrue(np.shares_memory(e.data, t.data))
+        self.check_grad(lambda t: t.expand(2, -1, 4), (3, 1))
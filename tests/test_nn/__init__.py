@@ -1 +1,6 @@
-from .test_loss import TestLoss
\ No newline at end of file
+from .test_activation import TestActivation
+from .test_clip_grad import TestClipGrad
+from .test_container import TestContainer
+from .test_flat_parameters import TestFlatParameters
+from .test_loss import TestLoss
+from .test_module import TestModule
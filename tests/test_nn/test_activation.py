@@ -1,5 +1,7 @@
 from unittest import TestCase
 
+import numpy as np
+
 from minitorch import Tensor
 import minitorch.nn as nn
 
@@ -7,11 +9,22 @@ import minitorch.nn as nn
 class TestActivation(TestCase):
 
     def test_sigmoid(self):
-        input = Tensor([[1, 2, 3, 4, 5], [6, 7, 8, 9, 10]])
-        target = Tensor([[6, 7, 8, 9, 10], [1, 2, 3, 4, 5]])
-        loss = nn.MSELoss()
-        output = loss(input, target)
-        self.assertEqual(output.data.tolist(), 25.)
+        input = Tensor([[-800.0, 0.0, 800.0]])
+        output = nn.Sigmoid()(input)
+        self.assertEqual(output.data.tolist(), [[0.0, 0.5, 1.0]])
+
+    def test_tanh(self):
+        input = Tensor([[-1.0, 0.0, 1.0]])
+        output = nn.Tanh()(input)
+        np.testing.assert_allclose(output.data, np.tanh([[-1.0, 0.0, 1.0]]))
 
     def test_relu(self):
-        ...
+        input = Tensor([[-1.0, 0.0, 1.0]])
+        output = nn.ReLU()(input)
+        self.assertEqual(output.data.tolist(), [[0.0, 0.0, 1.0]])
+
+    def test_softmax(self):
+        input = Tensor([[1.0, 1.0], [2.0, 2.0]])
+        self.assertEqual(nn.Softmax()(input).data.tolist(), [[0.5, 0.5], [0.5, 0.5]])
+        np.testing.assert_allclose(nn.LogSoftmax(axis=0)(input).data,
+                                   np.log(np.exp([[1.0, 1.0], [2.0, 2.0]]) / np.exp([1.0, 2.0]).sum()))
@@ -0,0 +1,68 @@
+import math
+from unittest import TestCase
+
+import numpy as np
+
+from minitorch import Tensor
+import minitorch.nn as nn
+
+
+def make_model(flatten):
+    np.random.seed(0)
+    model = nn.Sequential(nn.Linear(3, 4), nn.ReLU(), nn.Linear(4, 2))
+    if flatten:
+        model.flatten_parameters()
+    model.zero_grad()
+    x = Tensor(np.random.randn(5, 3))
+    (model(x) * 10).sum().backward()
+    return model
+
+
+class TestClipGrad(TestCase):
+
+    def test_clip_grad_norm(self):
+        for flatten in (False, True):
+            model = make_model(flatten)
+            grads = np.concatenate([p.grad.data.ravel() for p in model.parameters()])
+            for norm_type in (1, 2, 3, math.inf):
+                norm = nn.utils.get_total_norm(model.parameters(), norm_type)
+                self.assertAlmostEqual(norm, np.linalg.norm(grads, ord=norm_type))
+            norm = nn.utils.clip_grad_norm_(model.parameters(), max_norm=1.0)
+            self.assertAlmostEqual(norm, np.linalg.norm(grads))
+            clipped = np.concatenate([p.grad.data.ravel() for p in model.parameters()])
+            np.testing.assert_allclose(clipped, grads / (norm + 1e-6))
+            self.assertAlmostEqual(nn.utils.clip_grad_norm_(model.parameters(), max_norm=10.0), 1.0, places=5)
+            np.testing.assert_allclose(np.concatenate([p.grad.data.ravel() for p in model.parameters()]), clipped)
+
+    def test_clip_grad_norm_nonfinite(self):
+        model = make_model(True)
+        model[0].weight.grad.data[0, 0] = np.nan
+        self.assertTrue(math.isnan(nn.utils.clip_grad_norm_(model.parameters(), max_norm=1.0)))
+        with self.assertRaises(RuntimeError):
+            nn.utils.clip_grad_norm_(model.parameters(), max_norm=1.0, error_if_nonfinite=True)
+
+    def test_inf_norm_nan(self):
+        # NaN in a grad after the first one, in either order
+        for grads in ([[1., 2., 3.], [np.nan, 1., 1.]], [[np.nan, 1., 1.], [1., 2., 3.]]):
+            params = [Tensor(np.zeros(3), requires_grad=True) for _ in grads]
+            for p, grad in zip(params, grads):
+                p.grad = Tensor(np.array(grad))
+            self.assertTrue(math.isnan(nn.utils.get_total_norm(params, math.inf)))
+            with self.assertRaises(RuntimeError):
+                nn.utils.clip_grad_norm_(params, max_norm=1.0, norm_type=math.inf, error_if_nonfinite=True)
+
+    def test_clip_grad_norm_missing_grad(self):
+        model = make_model(True)
+        model[2].bias.grad = None
+        expected = np.linalg.norm(np.concatenate([p.grad.data.ravel() for p in model.parameters()
+                                                  if p.grad is not None]))
+        self.assertAlmostEqual(nn.utils.clip_grad_norm_(model.parameters(), max_norm=1e9), expected)
+        self.assertEqual(nn.utils.clip_grad_norm_([], max_norm=1.0), 0.0)
+
+    def test_clip_grad_value(self):
+        for flatten in (False, True):
+            model = make_model(flatten)
+            grads = [p.grad.data.copy() for p in model.parameters()]
+            nn.utils.clip_grad_value_(model.parameters(), 0.5)
+            for p, grad in zip(model.parameters(), grads):
+                np.testing.assert_array_equal(p.grad.data, np.clip(grad, -0.5, 0.5))
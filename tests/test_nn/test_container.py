@@ -0,0 +1,17 @@
+from unittest import TestCase
+
+import minitorch
+import minitorch.nn as nn
+
+
+class TestContainer(TestCase):
+
+    def test_sequential(self):
+        model = nn.Sequential(nn.Linear(3, 4), nn.ReLU(), nn.Linear(4, 2))
+        self.assertEqual(len(model), 3)
+        self.assertIsInstance(model[1], nn.ReLU)
+        self.assertEqual(len(model[1:]), 2)
+        self.assertEqual([name for name, _ in model.named_parameters()],
+                         ['0.weight', '0.bias', '2.weight', '2.bias'])
+        output = model(minitorch.rand(5, 3))
+        self.assertEqual(output.shape, (5, 2))
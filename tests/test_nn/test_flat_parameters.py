@@ -0,0 +1,68 @@
+from unittest import TestCase
+
+import numpy as np
+
+from minitorch import Tensor
+import minitorch.nn as nn
+import minitorch.optim as optim
+
+
+def make_model():
+    np.random.seed(0)
+    return nn.Sequential(nn.Linear(3, 4), nn.ReLU(), nn.Linear(4, 4), nn.ReLU(), nn.Linear(4, 1))
+
+
+def train(model, flatten, steps=3):
+    if flatten:
+        model.flatten_parameters()
+    optimizer = optim.SGD(model.parameters(), lr=0.1)
+    x = Tensor(np.linspace(-1, 1, 24).reshape(8, 3))
+    y = Tensor(np.linspace(0, 1, 8).reshape(8, 1))
+    for _ in range(steps):
+        model.zero_grad()
+        nn.MSELoss()(model(x), y).backward()
+        optimizer.step()
+    return model
+
+
+class TestFlatParameters(TestCase):
+
+    def test_flatten_parameters(self):
+        model = make_model()
+        values = [p.data.copy() for p in model.parameters()]
+        flat = model.flatten_parameters()
+        self.assertEqual(len(flat), 6)
+        self.assertEqual(flat.numel, sum(v.size for v in values))
+        for p, value, start in zip(model.parameters(), values, flat.offsets):
+            np.testing.assert_array_equal(p.data, value)
+            self.assertTrue(np.shares_memory(p.data, flat.data))
+            self.assertTrue(np.shares_memory(p.grad.data, flat.grad))
+        with self.assertRaises(TypeError):
+            nn.Sequential(nn.Linear(2, 2), nn.Linear(2, 2, dtype=np.float32)).flatten_parameters()
+
+    def test_flat_grad_accumulation(self):
+        model = make_model()
+        flat = model.flatten_parameters()
+        x = Tensor(np.ones((2, 3)))
+        model(x).sum().backward()
+        first = flat.grad.copy()
+        self.assertTrue(np.any(first))
+        model(x).sum().backward()
+        np.testing.assert_allclose(flat.grad, 2 * first)
+        model.zero_grad()
+        self.assertFalse(np.any(flat.grad))
+        # a gradient dropped by hand still lands in the buffer
+        model[0].weight.grad = None
+        model(x).sum().backward()
+        np.testing.assert_allclose(flat.grad, first)
+        self.assertTrue(np.shares_memory(model[0].weight.grad.data, flat.grad))
+
+    def test_flat_sgd(self):
+        expected = train(make_model(), flatten=False)
+        model = train(make_model(), flatten=True)
+        for p1, p2 in zip(expected.parameters(), model.parameters()):
+            np.testing.assert_allclose(p1.data, p2.data)
+        # a parameter detached from the buffer falls back to the per-parameter update
+        model.to(np.float64)
+        model[0].weight.data = model[0].weight.data.copy()
+        train(model, flatten=False, steps=1)
@@ -1,5 +1,7 @@
 from unittest import TestCase
 
+import numpy as np
+
 from minitorch import Tensor
 import minitorch.nn as nn
 
@@ -12,3 +14,88 @@ class TestLoss(TestCase):
         loss = nn.MSELoss()
         output = loss(input, target)
         self.assertEqual(output.data.tolist(), 25.)
+
+    def test_cross_entropy_loss(self):
+        def reference(x, target, weight, ignore_index, reduction, label_smoothing):
+            num_classes = x.shape[1]
+            weight = np.ones(num_classes) if weight is None else weight
+            x_max = x.max(axis=1, keepdims=True)
+            log_prob = x - x_max - np.log(np.exp(x - x_max).sum(axis=1, keepdims=True))
+            valid = target != ignore_index
+            safe_target = np.where(valid, target, 0)
+            nll = -weight[safe_target] * log_prob[np.arange(len(x)), safe_target] * valid
+            smooth = -(log_prob * weight).sum(axis=1) * valid
+            loss = (1 - label_smoothing) * nll + label_smoothing / num_classes * smooth
+            if reduction == 'sum':
+                return loss.sum()
+            if reduction == 'mean':
+                return loss.sum() / (weight[safe_target] * valid).sum()
+            return loss
+
+        x = np.random.randn(7, 5) * 3
+        target = np.array([0, 4, 2, 2, -100, 1, 3])
+        for weight in (None, np.random.rand(5)):
+            for reduction in ('none', 'mean', 'sum'):
+                for label_smoothing in (0.0, 0.2):
+                    for chunk_size in (None, 3):
+                        loss = nn.CrossEntropyLoss(weight=weight, reduction=reduction,
+                                                   label_smoothing=label_smoothing, chunk_size=chunk_size)
+                        input = Tensor(x, requires_grad=True)
+                        output = loss(input, target)
+                        grad = np.random.randn(*output.shape)
+                        output.backward(Tensor(grad))
+                        args = (target, weight, -100, reduction, label_smoothing)
+                        np.testing.assert_allclose(output.data, reference(x, *args))
+                        expected = np.zeros_like(x)
+                        for index in np.ndindex(x.shape):
+                            shifted = x.copy()
+                            shifted[index] += 1e-6
+                            upper = (reference(shifted, *args) * grad).sum()
+                            shifted[index] -= 2e-6
+                            lower = (reference(shifted, *args) * grad).sum()
+                            expected[index] = (upper - lower) / 2e-6
+                        np.testing.assert_allclose(input.grad.data, expected, atol=1e-5)
+                        self.assertEqual(input.grad.data[4].tolist(), [0.0] * 5)
+
+    def test_cross_entropy_loss_stability(self):
+        input = Tensor([[1000.0, 0.0], [0.0, -1000.0]], requires_grad=True)
+        output = nn.CrossEntropyLoss()(input, Tensor([0, 1]))
+        output.backward()
+        np.testing.assert_allclose(output.data, 500.0)
+        np.testing.assert_allclose(input.grad.data, [[0.0, 0.0], [0.5, -0.5]])
+
+    def test_linear_cross_entropy(self):
+        x = np.random.randn(6, 4)
+        target = np.array([0, 6, 2, -100, 6, 3])
+        for bias in (True, False):
+            for reduction in ('none', 'mean', 'sum'):
+                for label_smoothing in (0.0, 0.1):
+                    for chunk_size in (None, 1, 3):
+                        fused = nn.LinearCrossEntropy(4, 7, bias=bias, reduction=reduction,
+                                                      label_smoothing=label_smoothing, chunk_size=chunk_size)
+                        linear = nn.Linear(4, 7, bias=bias)
+                        linear.weight.data = fused.weight.data.copy()
+                        if bias:
+                            linear.bias.data = fused.bias.data.copy()
+                        composed = nn.CrossEntropyLoss(reduction=reduction, label_smoothing=label_smoothing)
+                        input = Tensor(x, requires_grad=True)
+                        expected_input = Tensor(x, requires_grad=True)
+                        output = fused(input, target)
+                        expected = composed(linear(expected_input), target)
+                        np.testing.assert_allclose(output.data, expected.data)
+                        grad = np.random.randn(*output.shape)
+                        output.backward(Tensor(grad))
+                        expected.backward(Tensor(grad))
+                        np.testing.assert_allclose(input.grad.data, expected_input.grad.data, atol=1e-12)
+                        np.testing.assert_allclose(fused.weight.grad.data, linear.weight.grad.data, atol=1e-12)
+                        if bias:
+                            np.testing.assert_allclose(fused.bias.grad.data, linear.bias.grad.data, atol=1e-12)
+
+    def test_linear_cross_entropy_frozen_weight(self):
+        loss = nn.LinearCrossEntropy(3, 5, chunk_size=2)
+        loss.weight.requires_grad = False
+        input = Tensor(np.random.randn(4, 3), requires_grad=True)
+        loss(input, np.array([0, 1, 4, 2])).backward()
+        self.assertIsNone(loss.weight.grad)
+        self.assertEqual(input.grad.shape, (4, 3))
+        self.assertEqual(loss.bias.grad.shape, (5,))
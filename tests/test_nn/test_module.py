@@ -0,0 +1,96 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+import minitorch
+from minitorch import Tensor
+import minitorch.nn as nn
+
+
+def make_model():
+    return nn.Sequential(nn.Linear(3, 4), nn.ReLU(), nn.Linear(4, 2, bias=False))
+
+
+class TestModule(TestCase):
+
+    def test_state_dict(self):
+        model = make_model()
+        state_dict = model.state_dict()
+        self.assertEqual(list(state_dict), ['0.weight', '0.bias', '2.weight'])
+        self.assertTrue(np.shares_memory(state_dict['0.weight'].data, model[0].weight.data))
+
+        other = make_model()
+        weight = other[0].weight.data
+        result = other.load_state_dict(state_dict)
+        self.assertEqual(result.missing_keys, [])
+        self.assertIs(other[0].weight.data, weight)
+        for (_, p1), (_, p2) in zip(model.named_parameters(), other.named_parameters()):
+            np.testing.assert_array_equal(p1.data, p2.data)
+
+        other.load_state_dict(state_dict, assign=True)
+        self.assertIs(other[0].weight.data, state_dict['0.weight'].data)
+
+    def test_load_state_dict_errors(self):
+        model = make_model()
+        state_dict = model.state_dict()
+        del state_dict['0.bias']
+        state_dict['extra'] = Tensor(np.ones(1))
+        with self.assertRaises(RuntimeError):
+            model.load_state_dict(state_dict)
+        result = model.load_state_dict(state_dict, strict=False)
+        self.assertEqual(result.missing_keys, ['0.bias'])
+        self.assertEqual(result.unexpected_keys, ['extra'])
+        state_dict = model.state_dict()
+        state_dict['2.weight'] = np.ones((2, 5))
+        with self.assertRaises(RuntimeError):
+            model.load_state_dict(state_dict, strict=False)
+
+    def test_save_load(self):
+        model = make_model().to(np.float32)
+        obj = {'model': model.state_dict(), 'step': 3, 'lr': [0.1, None], 'shape': (2, 3),
+               'buffers': {0: np.arange(5, dtype=np.int16), 1: np.zeros((0, 3))}, 'half': np.float16(1.5)}
+        with tempfile.TemporaryDirectory() as path:
+            path = os.path.join(path, 'checkpoint.mt')
+            minitorch.save(obj, path)
+            for mmap in (False, True):
+                loaded = minitorch.load(path, mmap=mmap)
+                self.assertEqual(loaded['step'], 3)
+                self.assertEqual(loaded['lr'], [0.1, None])
+                self.assertEqual(loaded['shape'], (2, 3))
+                self.assertEqual(loaded['half'], 1.5)
+                self.assertEqual(loaded['buffers'][0].dtype, np.int16)
+                self.assertEqual(loaded['buffers'][1].shape, (0, 3))
+                for name, value in obj['model'].items():
+                    self.assertIsInstance(loaded['model'][name], Tensor)
+                    self.assertEqual(loaded['model'][name].dtype, np.float32)
+                    self.assertEqual(loaded['model'][name].data.ctypes.data % 64, 0)
+                    np.testing.assert_array_equal(loaded['model'][name].data, value.data)
+                if mmap:
+                    # copy-on-write: the model can train on the mapped arrays
+                    # without touching the file
+                    other = make_model()
+                    other.load_state_dict(loaded['model'], assign=True)
+                    other[0].weight.data += 1
+                    del loaded, other
+                    np.testing.assert_array_equal(minitorch.load(path)['model']['0.weight'].data,
+                                                  model[0].weight.data)
+            with self.assertRaises(TypeError):
+                minitorch.save({'model': model}, path)
+            with open(path, 'wb') as f:
+                f.write(b'not a checkpoint')
+            with self.assertRaises(ValueError):
+                minitorch.load(path)
+
+    def test_async_save(self):
+        model = make_model()
+        expected = model[0].weight.data.copy()
+        with tempfile.TemporaryDirectory() as path:
+            path = os.path.join(path, 'checkpoint.mt')
+            future = minitorch.save(model.state_dict(), path, async_save=True)
+            # training goes on while the file is written from a snapshot
+            model[0].weight.data += 1
+            future.result()
+            np.testing.assert_array_equal(minitorch.load(path)['0.weight'].data, expected)
+            self.assertFalse(os.path.exists(path + '.tmp'))
@@ -0,0 +1,3 @@
+from .test_adam import TestAdam
+from .test_lr_scheduler import TestLRScheduler
+from .test_sgd import TestSGD
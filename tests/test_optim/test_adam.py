@@ -0,0 +1,127 @@
+import tracemalloc
+from unittest import TestCase
+
+import numpy as np
+
+from minitorch import Tensor
+import minitorch.nn as nn
+import minitorch.optim as optim
+
+
+def make_model():
+    np.random.seed(0)
+    return nn.Sequential(nn.Linear(3, 4), nn.ReLU(), nn.Linear(4, 1))
+
+
+def run(model, optimizer, steps=4):
+    x = Tensor(np.linspace(-1, 1, 24).reshape(8, 3))
+    y = Tensor(np.linspace(0, 1, 8).reshape(8, 1))
+    for _ in range(steps):
+        optimizer.zero_grad()
+        nn.MSELoss()(model(x), y).backward()
+        optimizer.step()
+
+
+class TestAdam(TestCase):
+
+    def reference(self, param, grads, lr, betas, eps, weight_decay, amsgrad, decoupled):
+        param = param.copy()
+        m = np.zeros_like(param)
+        v = np.zeros_like(param)
+        v_max = np.zeros_like(param)
+        for t, grad in enumerate(grads, 1):
+            if decoupled:
+                param = param * (1 - lr * weight_decay)
+            else:
+                grad = grad + weight_decay * param
+            m = betas[0] * m + (1 - betas[0]) * grad
+            v = betas[1] * v + (1 - betas[1]) * grad * grad
+            if amsgrad:
+                v_max = np.maximum(v_max, v)
+            m_hat = m / (1 - betas[0] ** t)
+            v_hat = (v_max if amsgrad else v) / (1 - betas[1] ** t)
+            param = param - lr * m_hat / (np.sqrt(v_hat) + eps)
+        return param
+
+    def test_adam_matches_reference(self):
+        grads = [np.random.randn(3, 2) for _ in range(5)]
+        for cls, decoupled in ((optim.Adam, False), (optim.AdamW, True)):
+            for weight_decay, amsgrad in ((0, False), (0.1, False), (0.1, True)):
+                p = Tensor(np.random.randn(3, 2), requires_grad=True)
+                expected = self.reference(p.data, grads, 0.01, (0.9, 0.999), 1e-8, weight_decay, amsgrad, decoupled)
+                optimizer = cls([p], lr=0.01, weight_decay=weight_decay, amsgrad=amsgrad)
+                for grad in grads:
+                    p.grad = Tensor(grad)
+                    optimizer.step()
+                np.testing.assert_allclose(p.data, expected)
+                self.assertEqual(int(optimizer.state[p]['step']), len(grads))
+
+    def test_adam_invalid_arguments(self):
+        p = Tensor(np.zeros(2), requires_grad=True)
+        with self.assertRaises(ValueError):
+            optim.Adam([p], betas=(1.0, 0.999))
+        with self.assertRaises(ValueError):
+            optim.AdamW([p], eps=-1)
+
+    def test_adam_flat_parameters(self):
+        results = []
+        for flatten in (False, True):
+            model = make_model()
+            if flatten:
+                model.flatten_parameters()
+            optimizer = optim.AdamW(model.parameters(), lr=0.01, amsgrad=True)
+            run(model, optimizer)
+            results.append([p.data.copy() for p in model.parameters()])
+            if flatten:
+                steps = [optimizer.state[p]['step'] for p in model.parameters()]
+                self.assertTrue(all(step is steps[0] for step in steps))
+                self.assertEqual(int(steps[0]), 4)
+        for eager, flat in zip(*results):
+            np.testing.assert_allclose(flat, eager)
+
+    def test_adam_foreach(self):
+        results = []
+        for foreach in (False, True):
+            model = make_model()
+            optimizer = optim.Adam(model.parameters(), lr=0.01, weight_decay=0.1, foreach=foreach)
+            run(model, optimizer, steps=2)
+            # the last layer skips a step, so its step count falls behind
+            model[2].weight.grad = None
+            model[2].bias.grad = None
+            optimizer.step()
+            run(model, optimizer, steps=2)
+            results.append([p.data.copy() for p in model.parameters()])
+            self.assertEqual(int(optimizer.state[model[0].weight]['step']), 5)
+            self.assertEqual(int(optimizer.state[model[2].weight]['step']), 4)
+        for eager, packed in zip(*results):
+            np.testing.assert_allclose(packed, eager)
+
+    def test_adam_state_dict(self):
+        model = make_model()
+        model.flatten_parameters()
+        optimizer = optim.Adam(model.parameters(), lr=0.01)
+        run(model, optimizer, steps=2)
+        state_dict = optimizer.state_dict()
+
+        clone = make_model()
+        clone.load_state_dict(model.state_dict())
+        clone.flatten_parameters()
+        clone_optimizer = optim.Adam(clone.parameters(), lr=0.01)
+        clone_optimizer.load_state_dict(state_dict)
+        run(model, optimizer, steps=2)
+        run(clone, clone_optimizer, steps=2)
+        for p, q in zip(model.parameters(), clone.parameters()):
+            np.testing.assert_allclose(q.data, p.data)
+        self.assertEqual(int(clone_optimizer.state[clone[0].weight]['step']), 4)
+
+    def test_adam_no_allocation_after_warmup(self):
+        p = Tensor(np.random.randn(256, 256), requires_grad=True)
+        p.grad = Tensor(np.random.randn(256, 256))
+        optimizer = optim.Adam([p], lr=0.01, weight_decay=0.01, amsgrad=True)
+        optimizer.step()
+        tracemalloc.start()
+        for _ in range(5):
+            optimizer.step()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.assertLess(peak, p.data.nbytes // 4)
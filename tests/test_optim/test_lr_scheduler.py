@@ -0,0 +1,109 @@
+import math
+import os
+import tempfile
+import time
+from unittest import TestCase
+
+import numpy as np
+
+import minitorch
+from minitorch import Tensor
+import minitorch.optim as optim
+from minitorch.optim import lr_scheduler
+
+
+def make_optimizer(cls=optim.SGD, **kwargs):
+    params = [Tensor(np.zeros(2), requires_grad=True), Tensor(np.zeros(3), requires_grad=True)]
+    return cls([{'params': params[:1]}, {'params': params[1:], 'lr': 0.5}], **kwargs)
+
+
+def lrs(scheduler, steps):
+    values = [scheduler.get_last_lr()]
+    for _ in range(steps):
+        scheduler.optimizer.step()
+        scheduler.step()
+        values.append(scheduler.get_last_lr())
+    return values
+
+
+class TestLRScheduler(TestCase):
+
+    def test_step_lr(self):
+        optimizer = make_optimizer(lr=1.0)
+        values = lrs(lr_scheduler.StepLR(optimizer, step_size=3, gamma=0.5), 7)
+        np.testing.assert_allclose([v[0] for v in values], [1, 1, 1, 0.5, 0.5, 0.5, 0.25, 0.25])
+        np.testing.assert_allclose([v[1] for v in values], [0.5, 0.5, 0.5, 0.25, 0.25, 0.25, 0.125, 0.125])
+        self.assertEqual(optimizer.param_groups[1]['lr'], 0.125)
+        self.assertEqual(optimizer.param_groups[1]['initial_lr'], 0.5)
+
+    def test_cosine_annealing_lr(self):
+        optimizer = make_optimizer(lr=1.0)
+        scheduler = lr_scheduler.CosineAnnealingLR(optimizer, T_max=10, eta_min=0.1, warmup_steps=4)
+        values = [v[0] for v in lrs(scheduler, 12)]
+        np.testing.assert_allclose(values[:4], [0.2, 0.4, 0.6, 0.8])
+        expected = [0.1 + 0.9 * (1 + math.cos(math.pi * t / 6)) / 2 for t in range(7)]
+        np.testing.assert_allclose(values[4:11], expected)
+        np.testing.assert_allclose(values[11:], [0.1, 0.1])
+
+    def test_one_cycle_lr(self):
+        optimizer = make_optimizer(lr=1.0, momentum=0.9)
+        scheduler = lr_scheduler.OneCycleLR(optimizer, max_lr=1.0, total_steps=10, pct_start=0.3)
+        values = [v[0] for v in lrs(scheduler, 9)]
+        self.assertAlmostEqual(values[0], 1.0 / 25)
+        self.assertAlmostEqual(values[2], 1.0)
+        self.assertAlmostEqual(values[-1], 1.0 / 25 / 1e4)
+        self.assertTrue(all(a < b for a, b in zip(values[:2], values[1:3])))
+        self.assertTrue(all(a > b for a, b in zip(values[2:], values[3:])))
+        self.assertAlmostEqual(optimizer.param_groups[0]['momentum'], 0.95)
+        with self.assertRaises(ValueError):
+            scheduler.step()
+
+        adam = make_optimizer(optim.Adam)
+        scheduler = lr_scheduler.OneCycleLR(adam, max_lr=1.0, total_steps=10, three_phase=True)
+        self.assertEqual(adam.param_groups[0]['betas'], (0.95, 0.999))
+        scheduler.step(2)
+        self.assertAlmostEqual(adam.param_groups[0]['betas'][0], 0.85)
+        scheduler.step(4)
+        self.assertAlmostEqual(scheduler.get_last_lr()[0], 1.0 / 25)
+
+    def test_reduce_lr_on_plateau(self):
+        optimizer = make_optimizer(lr=1.0)
+        scheduler = lr_scheduler.ReduceLROnPlateau(optimizer, factor=0.5, patience=1, cooldown=1, min_lr=0.3)
+        values = []
+        for metric in [5, 4, 4, 4, 4, 4, 4, 3]:
+            scheduler.step(metric)
+            values.append(scheduler.get_last_lr()[0])
+        np.testing.assert_allclose(values, [1, 1, 1, 0.5, 0.5, 0.5, 0.3, 0.3])
+
+    def test_closed_form_resume(self):
+        optimizer = make_optimizer(lr=1.0)
+        scheduler = lr_scheduler.CosineAnnealingLR(optimizer, T_max=20_000_000, warmup_steps=1000)
+        start = time.perf_counter()
+        scheduler.step(10_000_000)
+        self.assertLess(time.perf_counter() - start, 0.1)
+        self.assertAlmostEqual(scheduler.get_last_lr()[0], 0.5, places=3)
+
+    def test_state_dict(self):
+        optimizer = make_optimizer(lr=1.0, momentum=0.9)
+        scheduler = lr_scheduler.OneCycleLR(optimizer, max_lr=1.0, total_steps=100)
+        lrs(scheduler, 40)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'checkpoint.mt')
+            minitorch.save({'optimizer': optimizer.state_dict(), 'scheduler': scheduler.state_dict()}, path)
+            checkpoint = minitorch.load(path)
+
+        resumed = make_optimizer(lr=0.1, momentum=0.0)
+        resumed.load_state_dict(checkpoint['optimizer'])
+        resumed_scheduler = lr_scheduler.OneCycleLR(resumed, max_lr=1.0, total_steps=100, last_epoch=40)
+        resumed_scheduler.load_state_dict(checkpoint['scheduler'])
+        self.assertEqual(resumed_scheduler.last_epoch, 40)
+        np.testing.assert_allclose(lrs(resumed_scheduler, 10), lrs(scheduler, 10))
+        self.assertEqual(resumed.param_groups[0]['momentum'], optimizer.param_groups[0]['momentum'])
+
+        plateau = lr_scheduler.ReduceLROnPlateau(optimizer)
+        plateau.step(1.0)
+        clone = lr_scheduler.ReduceLROnPlateau(resumed)
+        clone.load_state_dict(plateau.state_dict())
+        self.assertEqual(clone.best, 1.0)
+        with self.assertRaises(KeyError):
+            lr_scheduler.StepLR(make_optimizer(lr=1.0), step_size=1, last_epoch=3)
@@ -0,0 +1,174 @@
+import os
+import tempfile
+import tracemalloc
+from unittest import TestCase
+
+import numpy as np
+
+import minitorch
+from minitorch import Tensor
+import minitorch.nn as nn
+import minitorch.optim as optim
+
+
+def make_model():
+    np.random.seed(0)
+    return nn.Sequential(nn.Linear(3, 4), nn.ReLU(), nn.Linear(4, 1))
+
+
+def run(model, optimizer, steps=4):
+    x = Tensor(np.linspace(-1, 1, 24).reshape(8, 3))
+    y = Tensor(np.linspace(0, 1, 8).reshape(8, 1))
+    for _ in range(steps):
+        optimizer.zero_grad()
+        nn.MSELoss()(model(x), y).backward()
+        optimizer.step()
+
+
+class TestSGD(TestCase):
+
+    def reference(self, param, grads, lr, momentum, dampening, weight_decay, nesterov):
+        param = param.copy()
+        buf = None
+        for grad in grads:
+            d = grad + weight_decay * param
+            if momentum:
+                buf = d.copy() if buf is None else momentum * buf + (1 - dampening) * d
+                d = d + momentum * buf if nesterov else buf
+            param = param - lr * d
+        return param
+
+    def test_sgd_matches_reference(self):
+        configs = [
+            dict(momentum=0, dampening=0, weight_decay=0, nesterov=False),
+            dict(momentum=0.9, dampening=0, weight_decay=0, nesterov=False),
+            dict(momentum=0.9, dampening=0.5, weight_decay=0.1, nesterov=False),
+            dict(momentum=0.9, dampening=0, weight_decay=0.1, nesterov=True),
+        ]
+        grads = [np.random.randn(3, 2) for _ in range(4)]
+        for config in configs:
+            p = Tensor(np.random.randn(3, 2), requires_grad=True)
+            expected = self.reference(p.data, grads, 0.1, **config)
+            optimizer = optim.SGD([p], lr=0.1, **config)
+            for grad in grads:
+                p.grad = Tensor(grad)
+                optimizer.step()
+            np.testing.assert_allclose(p.data, expected)
+
+    def test_sgd_invalid_arguments(self):
+        p = Tensor(np.zeros(2), requires_grad=True)
+        with self.assertRaises(ValueError):
+            optim.SGD([p], lr=-1)
+        with self.assertRaises(ValueError):
+            optim.SGD([p], lr=0.1, nesterov=True)
+        with self.assertRaises(ValueError):
+            optim.SGD([], lr=0.1)
+
+    def test_sgd_param_groups(self):
+        model = make_model()
+        first, second = model[0], model[2]
+        optimizer = optim.SGD([{'params': first.parameters()},
+                               {'params': second.parameters(), 'lr': 0.0}], lr=0.1, momentum=0.9)
+        self.assertEqual(optimizer.param_groups[0]['lr'], 0.1)
+        self.assertEqual(optimizer.param_groups[1]['momentum'], 0.9)
+        before = [p.data.copy() for p in second.parameters()]
+        run(model, optimizer)
+        for p, value in zip(second.parameters(), before):
+            np.testing.assert_array_equal(p.data, value)
+        with self.assertRaises(ValueError):
+            optimizer.add_param_group({'params': first.parameters()})
+
+    def test_sgd_flat_parameters(self):
+        results = []
+        for flatten in (False, True):
+            model = make_model()
+            if flatten:
+                model.flatten_parameters()
+            optimizer = optim.SGD(model.parameters(), lr=0.1, momentum=0.9, weight_decay=0.01, nesterov=True)
+            run(model, optimizer)
+            results.append([p.data.copy() for p in model.parameters()])
+            if flatten:
+                buffer = optimizer.state[model[0].weight]['momentum_buffer']
+                self.assertTrue(np.shares_memory(buffer, optimizer._flat_buffers[model._flat_parameters]['momentum_buffer']))
+        for eager, flat in zip(*results):
+            np.testing.assert_allclose(flat, eager)
+
+    def test_sgd_foreach(self):
+        results = []
+        for foreach in (False, True):
+            model = make_model()
+            model[2].to(np.float32)
+            optimizer = optim.SGD(model.parameters(), lr=0.1, momentum=0.9, foreach=foreach)
+            run(model, optimizer)
+            results.append([p.data.copy() for p in model.parameters()])
+            if foreach:
+                flats = optimizer._flat_parameters(optimizer.param_groups[0])
+                self.assertEqual(sorted(flat.data.dtype.name for flat in flats), ['float32', 'float64'])
+        for eager, packed in zip(*results):
+            self.assertEqual(packed.dtype, eager.dtype)
+            np.testing.assert_allclose(packed, eager, rtol=1e-6)
+
+    def test_sgd_foreach_missing_grad(self):
+        a = Tensor(np.ones(3), requires_grad=True)
+        b = Tensor(np.ones(2), requires_grad=True)
+        optimizer = optim.SGD([a, b], lr=0.1, momentum=0.9, weight_decay=0.1, foreach=True)
+        for _ in range(2):
+            optimizer.zero_grad()
+            (a * 2).sum().backward()
+            optimizer.step()
+            np.testing.assert_array_equal(b.data, np.ones(2))
+        self.assertIsNone(b.grad)
+        optimizer.zero_grad()
+        ((a * 2).sum() + b.sum()).backward()
+        optimizer.step()
+        self.assertTrue(optimizer._flat_parameters(optimizer.param_groups[0]) is not None)
+        np.testing.assert_allclose(b.data, np.ones(2) - 0.1 * 1.1)
+
+    def test_sgd_foreach_packs_on_init(self):
+        a = Tensor(np.ones(3), requires_grad=True)
+        before = a.data
+        optimizer = optim.SGD([a], lr=0.1, foreach=True)
+        # the parameter is rebound to the flat buffer when the optimizer is built
+        after = a.data
+        self.assertIsNot(after, before)
+        self.assertTrue(np.shares_memory(after, optimizer._packed_parameters(optimizer.param_groups[0])[0].data))
+        optimizer.zero_grad()
+        (a * 2).sum().backward()
+        optimizer.step()
+        np.testing.assert_allclose(after, np.full(3, 0.8))
+        np.testing.assert_array_equal(before, np.ones(3))
+
+    def test_sgd_state_dict(self):
+        model = make_model()
+        optimizer = optim.SGD(model.parameters(), lr=0.1, momentum=0.9)
+        run(model, optimizer, steps=2)
+        state_dict = optimizer.state_dict()
+        self.assertEqual(sorted(state_dict['state']), list(range(4)))
+        self.assertEqual(state_dict['param_groups'][0]['params'], [0, 1, 2, 3])
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'optim.mt')
+            minitorch.save(state_dict, path)
+            loaded = minitorch.load(path)
+
+        clone = make_model()
+        clone.load_state_dict(model.state_dict())
+        clone_optimizer = optim.SGD(clone.parameters(), lr=0.5)
+        clone_optimizer.load_state_dict(loaded)
+        self.assertEqual(clone_optimizer.param_groups[0]['lr'], 0.1)
+        run(model, optimizer, steps=2)
+        run(clone, clone_optimizer, steps=2)
+        for p, q in zip(model.parameters(), clone.parameters()):
+            np.testing.assert_allclose(q.data, p.data)
+
+    def test_sgd_no_allocation_after_warmup(self):
+        p = Tensor(np.random.randn(256, 256), requires_grad=True)
+        p.grad = Tensor(np.random.randn(256, 256))
+        optimizer = optim.SGD([p], lr=0.1, momentum=0.9, weight_decay=0.01, nesterov=True)
+        optimizer.step()
+        tracemalloc.start()
+        for _ in range(5):
+            optimizer.step()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.assertLess(peak, p.data.nbytes // 4)
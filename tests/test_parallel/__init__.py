@@ -0,0 +1 @@
+from .test_data_parallel import TestDataParallel
@@ -0,0 +1,85 @@
+from unittest import TestCase
+
+import numpy as np
+
+from minitorch import Tensor
+import minitorch.nn as nn
+import minitorch.optim as optim
+from minitorch.parallel import DataParallel
+
+
+def make_model():
+    np.random.seed(0)
+    return nn.Sequential(nn.Linear(8, 16), nn.ReLU(), nn.Linear(16, 1))
+
+
+class TestDataParallel(TestCase):
+
+    def setUp(self):
+        rng = np.random.RandomState(1)
+        self.x = rng.randn(30, 8)
+        self.y = rng.randn(30, 1)
+
+    def test_matches_single_process(self):
+        model = make_model()
+        optimizer = optim.SGD(model.parameters(), lr=0.01, momentum=0.9)
+        losses = []
+        for _ in range(3):
+            optimizer.zero_grad()
+            loss = nn.MSELoss()(model(Tensor(self.x)), Tensor(self.y))
+            loss.backward()
+            optimizer.step()
+            losses.append(float(loss.data))
+
+        parallel_model = make_model()
+        # a tiny bucket size puts every parameter in its own bucket
+        with DataParallel(parallel_model, nn.MSELoss(), num_workers=3, bucket_size_mb=1e-6) as parallel:
+            self.assertEqual(len(parallel.buckets), 4)
+            optimizer = optim.SGD(parallel.parameters(), lr=0.01, momentum=0.9)
+            parallel_losses = []
+            for _ in range(3):
+                optimizer.zero_grad()
+                parallel_losses.append(parallel.train_step(Tensor(self.x), Tensor(self.y)))
+                optimizer.step()
+            np.testing.assert_allclose(parallel_losses, losses)
+            np.testing.assert_allclose(parallel(Tensor(self.x)).data, model(Tensor(self.x)).data)
+            # fewer samples than workers
+            parallel.train_step(Tensor(self.x[:2]), Tensor(self.y[:2]))
+        for p, q in zip(model.parameters(), parallel_model.parameters()):
+            np.testing.assert_allclose(q.data, p.data)
+        self.assertEqual(parallel.processes, [])
+        # the parameters left the shared memory and still train
+        optimizer.step()
+
+    def test_worker_error(self):
+        with DataParallel(make_model(), nn.MSELoss(), num_workers=2) as parallel:
+            with self.assertRaises(RuntimeError):
+                parallel.train_step(Tensor(self.x), Tensor(np.zeros((30, 2, 5))))
+            with self.assertRaises(ValueError):
+                parallel.train_step(Tensor(self.x), Tensor(self.y[:3]))
+            self.assertIsInstance(parallel.train_step(Tensor(self.x), Tensor(self.y)), float)
+
+    def test_zero_grad(self):
+        with DataParallel(make_model(), nn.MSELoss(), num_workers=2) as parallel:
+            optimizer = optim.SGD(parallel.parameters(), lr=0.1)
+            for _ in range(2):
+                before = [p.data.copy() for p in parallel.parameters()]
+                parallel.zero_grad()
+                parallel.train_step(Tensor(self.x), Tensor(self.y))
+                optimizer.step()
+                for p, data in zip(parallel.parameters(), before):
+                    self.assertFalse(np.array_equal(p.data, data))
+            # grads dropped elsewhere are attached to the flat buffer again
+            for p in parallel.parameters():
+                p.grad = None
+            parallel.train_step(Tensor(self.x), Tensor(self.y))
+            self.assertTrue(parallel.flat.has_grads())
+
+    def test_dead_worker(self):
+        parallel = DataParallel(make_model(), nn.MSELoss(), num_workers=2)
+        parallel.poll_interval = 0.05
+        parallel.processes[1].kill()
+        parallel.processes[1].join()
+        with self.assertRaises(RuntimeError):
+            parallel.train_step(Tensor(self.x), Tensor(self.y))
+        parallel.close()
@@ -2,12 +2,18 @@ import unittest
 
 import test_autograd
 import test_nn
+import test_optim
+import test_parallel
+import test_utils
 
 
 if __name__ == '__main__':
     suite = unittest.TestSuite()
     suite.addTests(unittest.TestLoader().loadTestsFromModule(test_autograd))
     suite.addTests(unittest.TestLoader().loadTestsFromModule(test_nn))
+    suite.addTests(unittest.TestLoader().loadTestsFromModule(test_optim))
+    suite.addTests(unittest.TestLoader().loadTestsFromModule(test_parallel))
+    suite.addTests(unittest.TestLoader().loadTestsFromModule(test_utils))
 
     # with open('UnittestTextReport.txt', 'a') as f:
     # runner = unittest.TextTestRunner(stream=f, verbosity=2)
@@ -0,0 +1,2 @@
+from .test_checkpoint import TestCheckpoint
+from .test_data import TestData
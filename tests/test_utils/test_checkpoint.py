@@ -0,0 +1,66 @@
+from unittest import TestCase
+
+import numpy as np
+
+import minitorch
+import minitorch.nn as nn
+from minitorch.autograd.memory import saved_tensors_report
+from minitorch.utils import checkpoint, checkpoint_sequential
+
+
+def build_model(depth=6, width=4):
+    layers = []
+    for _ in range(depth):
+        layers.append(nn.Linear(width, width))
+        layers.append(nn.ReLU())
+    return nn.Sequential(*layers)
+
+
+def grads(model):
+    return [p.grad.data.copy() for p in model.parameters()]
+
+
+class TestCheckpoint(TestCase):
+
+    def test_checkpoint_module(self):
+        model = build_model()
+        input = minitorch.rand(3, 4, requires_grad=True)
+        model(input).sum().backward()
+        expected, expected_input = grads(model), input.grad.data.copy()
+
+        model.zero_grad()
+        input.zero_grad()
+        output = checkpoint(model, input)
+        report = saved_tensors_report(output)
+        self.assertEqual(report['CheckpointBackward'], input.data.nbytes)
+        self.assertEqual(sum(report.values()), input.data.nbytes)
+        output.sum().backward()
+        for grad, expected_grad in zip(grads(model), expected):
+            np.testing.assert_allclose(grad, expected_grad)
+        np.testing.assert_allclose(input.grad.data, expected_input)
+
+    def test_checkpoint_sequential(self):
+        model = build_model()
+        input = minitorch.rand(3, 4)
+        output = model(input).sum()
+        full = sum(saved_tensors_report(output).values())
+        output.backward()
+        expected = grads(model)
+
+        model.zero_grad()
+        output = checkpoint_sequential(model, 3, input).sum()
+        self.assertLess(sum(saved_tensors_report(output).values()), full)
+        output.backward()
+        for grad, expected_grad in zip(grads(model), expected):
+            np.testing.assert_allclose(grad, expected_grad)
+
+        input = minitorch.rand(3, 4)
+        self.assertIs(checkpoint_sequential(nn.Sequential(), 2, input), input)
+        with self.assertRaises(ValueError):
+            checkpoint_sequential(model, 0, input)
+
+    def test_no_grad(self):
+        model = build_model()
+        with minitorch.no_grad():
+            output = checkpoint(model, minitorch.rand(3, 4))
+        self.assertIsNone(output.grad_fn)
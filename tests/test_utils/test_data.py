@@ -0,0 +1,154 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+from minitorch import Tensor
+from minitorch.utils.data import (BatchSampler, BlockShuffleSampler, DataLoader, Dataset, MemmapDataset,
+                                  SequentialSampler, TensorDataset)
+
+
+class SquareDataset(Dataset):
+
+    def __init__(self, size):
+        self.size = size
+
+    def __getitem__(self, index):
+        return np.array([index, index ** 2], dtype=np.float32), index
+
+    def __len__(self):
+        return self.size
+
+
+class TestData(TestCase):
+
+    def test_tensor_dataset(self):
+        x = Tensor(np.arange(12.0).reshape(6, 2))
+        dataset = TensorDataset(x, np.arange(6))
+        self.assertEqual(len(dataset), 6)
+        sample = dataset[2]
+        self.assertEqual(sample[0].data.tolist(), [4.0, 5.0])
+        self.assertEqual(sample[1].data.tolist(), 2)
+        with self.assertRaises(ValueError):
+            TensorDataset(np.ones(3), np.ones(4))
+        out = (np.empty((2, 2)), np.empty(2, dtype=np.int64))
+        batch = dataset.gather([5, 0], out=out)
+        self.assertIs(batch[0], out[0])
+        self.assertEqual(out[0].tolist(), [[10.0, 11.0], [0.0, 1.0]])
+        with self.assertRaises(IndexError):
+            dataset.gather([6, 0], out=out)
+
+    def test_batch_sampler(self):
+        sampler = SequentialSampler(range(7))
+        self.assertEqual(list(BatchSampler(sampler, 3)), [[0, 1, 2], [3, 4, 5], [6]])
+        self.assertEqual(list(BatchSampler(sampler, 3, drop_last=True)), [[0, 1, 2], [3, 4, 5]])
+        self.assertEqual(len(BatchSampler(sampler, 3)), 3)
+        self.assertEqual(len(BatchSampler(sampler, 3, drop_last=True)), 2)
+
+    def test_dataloader(self):
+        x = np.random.randn(10, 3)
+        y = np.arange(10)
+        dataset = TensorDataset(x, y)
+        for num_workers in (0, 2):
+            for reuse_buffers in (False, True):
+                loader = DataLoader(dataset, batch_size=4, num_workers=num_workers, reuse_buffers=reuse_buffers)
+                self.assertEqual(len(loader), 3)
+                batches = [(bx.data.copy(), by.data.copy()) for bx, by in loader]
+                self.assertEqual([len(by) for _, by in batches], [4, 4, 2])
+                np.testing.assert_array_equal(np.concatenate([bx for bx, _ in batches]), x)
+                np.testing.assert_array_equal(np.concatenate([by for _, by in batches]), y)
+
+    def test_dataloader_shuffle(self):
+        dataset = TensorDataset(np.arange(100))
+        generator = np.random.default_rng(0)
+        loader = DataLoader(dataset, batch_size=16, shuffle=True, drop_last=True, num_workers=3,
+                            reuse_buffers=True, generator=generator)
+        epochs = []
+        for _ in range(2):
+            epoch = np.concatenate([batch.data.copy() for batch, in loader])
+            self.assertEqual(len(epoch), 96)
+            self.assertEqual(len(set(epoch.tolist())), 96)
+            epochs.append(epoch)
+        self.assertFalse(np.array_equal(epochs[0], epochs[1]))
+        with self.assertRaises(ValueError):
+            DataLoader(dataset, shuffle=True, sampler=SequentialSampler(dataset))
+
+    def test_dataloader_collate(self):
+        dataset = SquareDataset(5)
+        for num_workers in (0, 1):
+            for reuse_buffers in (False, True):
+                loader = DataLoader(dataset, batch_size=2, num_workers=num_workers, reuse_buffers=reuse_buffers)
+                features, index = next(iter(loader))
+                self.assertEqual(features.dtype, np.float32)
+                self.assertEqual(features.data.tolist(), [[0.0, 0.0], [1.0, 1.0]])
+                self.assertEqual(index.data.tolist(), [0, 1])
+                self.assertEqual(sum(len(index.data) for _, index in loader), 5)
+        loader = DataLoader(dataset, batch_size=2, collate_fn=lambda samples: [i for _, i in samples])
+        self.assertEqual(list(loader), [[0, 1], [2, 3], [4]])
+
+    def test_dataloader_reuse_buffers(self):
+        loader = DataLoader(TensorDataset(np.arange(8.0)), batch_size=2, reuse_buffers=True)
+        first, second = [batch.data for batch, in loader][:2]
+        # a single buffer is recycled without workers
+        self.assertTrue(np.shares_memory(first, second))
+
+    def test_dataloader_worker_error(self):
+        class BrokenDataset(SquareDataset):
+            def __getitem__(self, index):
+                if index == 3:
+                    raise KeyError(index)
+                return super().__getitem__(index)
+
+        with self.assertRaises(KeyError):
+            list(DataLoader(BrokenDataset(6), batch_size=2, num_workers=2))
+
+    def test_block_shuffle_sampler(self):
+        sampler = BlockShuffleSampler(range(10), block_size=4, generator=np.random.default_rng(0))
+        indices = list(sampler)
+        self.assertEqual(sorted(indices), list(range(10)))
+        self.assertEqual(len(sampler), 10)
+        for previous, index in zip(indices, indices[1:]):
+            if index % 4:
+                self.assertEqual(index, previous + 1)
+        with self.assertRaises(ValueError):
+            BlockShuffleSampler(range(10), block_size=0)
+
+    def test_memmap_dataset(self):
+        x = np.random.randn(50, 3, 2).astype(np.float32)
+        y = np.arange(50)
+        with tempfile.TemporaryDirectory() as path:
+            dataset = MemmapDataset.from_arrays(path, chunk_size=16, x=x, y=y)
+            self.assertTrue(os.path.exists(os.path.join(path, 'header.json')))
+            self.assertEqual(len(dataset), 50)
+            self.assertEqual(dataset.names, ('x', 'y'))
+            self.assertIsInstance(dataset.arrays[0], np.memmap)
+            np.testing.assert_array_equal(dataset[7][0].data, x[7])
+            for indices in ([3, 4, 5, 9, 10, 0], np.random.permutation(50)[:20], []):
+                batch_x, batch_y = dataset.gather(indices)
+                np.testing.assert_array_equal(batch_x, x[indices])
+                np.testing.assert_array_equal(batch_y, y[indices])
+            with self.assertRaises(IndexError):
+                dataset.gather([50])
+
+            sampler = BlockShuffleSampler(dataset, block_size=10)
+            loader = DataLoader(dataset, batch_size=5, sampler=sampler, num_workers=2, reuse_buffers=True)
+            seen = []
+            for batch_x, batch_y in loader:
+                np.testing.assert_array_equal(batch_x.data, x[batch_y.data])
+                seen.extend(batch_y.data.tolist())
+            self.assertEqual(sorted(seen), list(range(50)))
+            del dataset, loader
+
+    def test_memmap_dataset_create(self):
+        with tempfile.TemporaryDirectory() as path:
+            dataset = MemmapDataset.create(path, 4, image=((2, 2), np.uint8), label=((), np.int64))
+            dataset.fields()['image'][:] = 7
+            dataset.fields()['label'][:] = [3, 2, 1, 0]
+            dataset.flush()
+            del dataset
+            dataset = MemmapDataset(path)
+            self.assertEqual(dataset.arrays[0].dtype, np.uint8)
+            self.assertEqual(dataset[1][0].data.tolist(), [[7, 7], [7, 7]])
+            self.assertEqual(dataset[1][1].data.tolist(), 2)
+            del dataset